@@ -0,0 +1,99 @@
+"""Persistent content-addressed cache for Gemini frame analyses.
+
+Results are stored in a local SQLite database keyed by a hash of the
+image content, the formatted prompt and the model name, so rerunning
+the pipeline on unchanged frames does not spend API calls. The least
+recently used entries are evicted once the cache exceeds max_entries.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisCache:
+    """SQLite-backed LRU cache of analysis dicts.
+
+    Safe to share between threads. Tracks hit and miss counts for the
+    lifetime of the instance.
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 50_000) -> None:
+        """Open (or create) the cache database.
+
+        Args:
+            db_path: Path to the SQLite database file.
+            max_entries: Maximum number of cached analyses to keep.
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            " key TEXT PRIMARY KEY,"
+            " result TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_analyses_accessed_at"
+            " ON analyses(accessed_at)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> dict | None:
+        """Return the cached analysis for a key, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM analyses WHERE key = ?", (key,),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE analyses SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._conn.commit()
+
+        return json.loads(row[0])
+
+    def put(self, key: str, analysis: dict) -> None:
+        """Store an analysis and evict least recently used entries."""
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analyses (key, result, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, json.dumps(analysis, ensure_ascii=False), now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM analyses WHERE key IN ("
+                " SELECT key FROM analyses ORDER BY accessed_at DESC"
+                " LIMIT -1 OFFSET ?)",
+                (self._max_entries,),
+            )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current number of entries."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
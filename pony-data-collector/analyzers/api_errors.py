@@ -0,0 +1,115 @@
+"""Typed errors for Gemini analysis calls.
+
+Everything the analyzer raises for a failed call derives from
+AnalysisError, which is a RuntimeError so existing handlers keep
+working. classify_api_error maps SDK exceptions onto these classes and
+extracts any retry-after hint, so callers can tell transient failures
+(worth retrying) from quota exhaustion (retry, but slow down) and from
+permanent ones.
+"""
+
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# HTTP status codes worth retrying besides 429
+TRANSIENT_STATUS_CODES = {408, 500, 502, 503, 504}
+
+# Exception class names used by google.api_core and the HTTP clients
+# underneath it, for errors that carry no status code
+TRANSIENT_ERROR_NAMES = {
+    "DeadlineExceeded", "ServiceUnavailable", "InternalServerError",
+    "GatewayTimeout", "BadGateway", "ConnectionError", "Timeout",
+    "TimeoutError", "ReadTimeout", "ConnectTimeout",
+}
+QUOTA_ERROR_NAMES = {"ResourceExhausted", "TooManyRequests"}
+
+_RETRY_IN = re.compile(r"retry (?:in|after) ([\d.]+)\s*s", re.IGNORECASE)
+_RETRY_DELAY_SECONDS = re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+)")
+
+
+class AnalysisError(RuntimeError):
+    """Base class for failed frame analyses."""
+
+
+class ResponseFormatError(AnalysisError):
+    """The model replied, but the reply is not a valid analysis."""
+
+
+class PermanentAPIError(AnalysisError):
+    """The API call failed in a way retrying will not fix."""
+
+
+class TransientAPIError(AnalysisError):
+    """The API call failed in a way that may succeed on retry.
+
+    Attributes:
+        retry_after: Seconds the server asked to wait before retrying,
+            or None if it gave no hint.
+    """
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class QuotaExceededError(TransientAPIError):
+    """The API rejected the call for exceeding a rate limit or quota (429)."""
+
+
+def classify_api_error(exc: Exception, label: str) -> AnalysisError:
+    """Map an exception from the model client to a typed AnalysisError.
+
+    Args:
+        exc: Exception raised by generate_content(_async).
+        label: Description of the request, used in the error message.
+
+    Returns:
+        QuotaExceededError, TransientAPIError or PermanentAPIError.
+    """
+    message = f"Gemini API call failed for {label}: {exc}"
+    status = _status_code(exc)
+    names = {cls.__name__ for cls in type(exc).__mro__}
+
+    if status == 429 or names & QUOTA_ERROR_NAMES:
+        return QuotaExceededError(message, _retry_after(exc))
+    if status in TRANSIENT_STATUS_CODES or names & TRANSIENT_ERROR_NAMES:
+        return TransientAPIError(message, _retry_after(exc))
+    return PermanentAPIError(message)
+
+
+def _status_code(exc: Exception) -> int | None:
+    """Return the HTTP status code carried by an exception, if any."""
+    for attr in ("code", "status_code", "status"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def _retry_after(exc: Exception) -> float | None:
+    """Extract a retry-after hint in seconds from an exception.
+
+    Looks at RetryInfo entries in the error details, a Retry-After
+    response header, and finally the message text.
+    """
+    for detail in getattr(exc, "details", None) or []:
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None and hasattr(delay, "seconds"):
+            return delay.seconds + getattr(delay, "nanos", 0) / 1e9
+
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    header = headers.get("Retry-After") if hasattr(headers, "get") else None
+    if header is not None:
+        try:
+            return float(header)
+        except ValueError:
+            logger.debug("Ignoring non-numeric Retry-After header: %s", header)
+
+    text = str(exc)
+    match = _RETRY_IN.search(text) or _RETRY_DELAY_SECONDS.search(text)
+    return float(match.group(1)) if match else None
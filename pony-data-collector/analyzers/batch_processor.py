@@ -1,85 +1,425 @@
 """Batch processor for analyzing multiple frames per celebrity.
 
-Handles rate limiting for Gemini API calls, processes all frames for
-a celebrity, and merges the individual analyses into a single Makeup
-DNA record by averaging metrics and picking dominant patterns.
+Handles rate limiting and retries for Gemini API calls, processes all
+frames for a celebrity, and merges the individual analyses into a single Makeup
+DNA record by averaging metrics and picking dominant patterns. Analyses are
+folded into a DnaAggregator as they arrive rather than kept in memory.
 """
 
+import asyncio
 import logging
+import math
 import os
+import random
 import time
-from collections import Counter
-
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+import numpy as np
+
+from analyzers.api_errors import QuotaExceededError, ResponseFormatError, TransientAPIError
+from analyzers.dna_aggregator import DnaAggregator, weighted_stats
+from analyzers.early_stopping import ConvergenceMonitor, ConvergencePolicy, order_frames
+from analyzers.face_filter import FaceFilter
+from analyzers.face_geometry import FaceGeometry
+from analyzers.frame_analysis import FrameAnalysis
+from analyzers.frame_checkpoint import FrameCheckpoint
+from analyzers.frame_dedup import FrameDeduplicator
 from analyzers.gemini_analyzer import GeminiAnalyzer
+from analyzers.rate_control import AimdRateController
+from analyzers.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class CelebJob:
+    """Analysis state of one celebrity, from start_celeb to finish_celeb.
+
+    Batches are taken from pending in order with next_batch, so several
+    workers (or a scheduler interleaving celebrities) can share a job.
+    """
+
+    celeb_id: str
+    celeb_name: str
+    total_frames: int
+    work: list[tuple[str, int]]
+    pending: list[tuple[str, int]]
+    aggregator: DnaAggregator
+    measurements: dict[str, dict]
+    batch_size: int
+    checkpoint: FrameCheckpoint | None = None
+    keys: dict[str, str] = field(default_factory=dict)
+    monitor: ConvergenceMonitor | None = None
+    started: float = field(default_factory=time.monotonic)
+    position: int = 0
+    in_flight: int = 0
+    recorded: int = 0
+
+    @property
+    def converged(self) -> bool:
+        """Whether early stopping has ended the job."""
+        return self.monitor is not None and self.monitor.converged
+
+    @property
+    def has_pending(self) -> bool:
+        """Whether next_batch would return a batch."""
+        return not self.converged and self.position < len(self.pending)
+
+    @property
+    def done(self) -> bool:
+        """Whether no batch is left to start and none is in flight."""
+        return not self.has_pending and self.in_flight == 0
+
+    @property
+    def complete(self) -> bool:
+        """Whether every pending frame was analyzed or the job converged.
+
+        An incomplete job still has frames to analyze, so its
+        checkpoint should be kept for the next run.
+        """
+        return self.converged or self.recorded == len(self.pending)
+
+    def next_batch(self) -> list[tuple[str, int]] | None:
+        """Take the next batch and count it as in flight.
+
+        Returns:
+            (frame_path, weight) tuples, or None if nothing is left to
+            analyze or the job has converged.
+        """
+        if not self.has_pending:
+            return None
+
+        batch = self.pending[self.position:self.position + self.batch_size]
+        self.position += len(batch)
+        self.in_flight += 1
+
+        logger.info(
+            "Analyzing frames %d-%d/%d for %s (batch of %d)",
+            self.position - len(batch) + 1, self.position, len(self.pending),
+            self.celeb_name, len(batch),
+        )
+        return batch
+
+    def record(self, frame_path: str, analysis: FrameAnalysis, weight: int) -> None:
+        """Merge a fresh API result and checkpoint it."""
+        self.aggregator.add(analysis, weight)
+        self.recorded += 1
+        if self.checkpoint is not None:
+            self.checkpoint.append(self.keys[frame_path], frame_path, analysis)
+        if self.monitor is not None:
+            self.monitor.update(self.aggregator)
+
+    def close(self) -> None:
+        """Sync and close the checkpoint, if any."""
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+
 
 class BatchProcessor:
     """Processes all frames for a celebrity and merges analysis results.
 
     Applies rate limiting to stay within Gemini API quotas and
     produces a single consolidated Makeup DNA dict per celebrity.
+    Several frames can share one API request to raise the number of
+    frames analyzed per minute. Transient API errors are retried with
+    jittered exponential backoff, within a retry budget for the run.
     """
 
+    MAX_BATCH_SIZE = 8
+    BACKOFF_BASE_SECONDS = 2.0
+    BACKOFF_MAX_SECONDS = 60.0
+
     def __init__(
         self,
         analyzer: GeminiAnalyzer,
         rate_limit_per_minute: int = 15,
+        deduplicator: FrameDeduplicator | None = None,
+        face_filter: FaceFilter | None = None,
+        batch_size: int | None = None,
+        max_in_flight: int = 1,
+        max_retries: int = 4,
+        retry_budget: int = 100,
+        geometry: FaceGeometry | None = None,
+        rate_limiter: RateLimiter | None = None,
+        rate_controller: AimdRateController | None = None,
+        metric_aggregate: str | None = None,
+        trim_fraction: float = 0.1,
+        checkpoint_fsync_every: int = 16,
+        early_stopping: ConvergencePolicy | None = None,
+        frame_order: str = "sorted",
     ) -> None:
         """Initialize the batch processor.
 
         Args:
             analyzer: GeminiAnalyzer instance for frame analysis.
-            rate_limit_per_minute: Maximum API calls per minute.
+            rate_limit_per_minute: Maximum API calls per minute. Ignored
+                if rate_limiter is given.
+            deduplicator: Optional FrameDeduplicator. When set, only one
+                representative per near-duplicate cluster is analyzed
+                and the cluster size weights its merge contribution.
+            face_filter: Optional FaceFilter. When set, frames without a
+                reasonably sized frontal face are dropped before they
+                reach the rate limiter.
+            batch_size: Frames sent per API request. None picks the
+                size automatically per celebrity, 1 disables batching.
+            max_in_flight: Maximum concurrent API requests. Values above
+                1 switch to the asyncio analysis path, which keeps
+                several requests in flight within the per-minute quota.
+            max_retries: Maximum retries of a single API request after
+                transient errors (429, 5xx, timeouts).
+            retry_budget: Maximum retries over the lifetime of this
+                processor, so a long outage fails fast instead of
+                backing off on every frame.
+            geometry: Optional FaceGeometry. When set, canthal tilt,
+                midface ratio and symmetry are measured locally on every
+                frame and replace the model's estimates in the merged
+                metrics, so they are available even when API calls fail.
+            rate_limiter: Optional RateLimiter, e.g. one backed by a
+                database shared with other pipeline processes using the
+                same API key. If None, a private in-memory limiter with
+                rate_limit_per_minute is used.
+            rate_controller: Optional AimdRateController adjusting the
+                limiter's rate from call outcomes. It must wrap the same
+                limiter.
+            metric_aggregate: How numeric metrics are merged across
+                frames: "mean", "median" or "trimmed_mean". None keeps
+                the rule of each field in the DnaAggregator schema.
+            trim_fraction: Share of the frame weight cut from each end
+                for trimmed means.
+            checkpoint_fsync_every: Checkpointed analyses written between
+                two fsyncs of the checkpoint file.
+            early_stopping: Optional ConvergencePolicy. When set, API
+                requests for a celebrity stop once the merged metrics
+                have converged, and the remaining frames are skipped.
+            frame_order: Order in which frames are analyzed: "sorted",
+                "shuffled" or "stratified" (see order_frames). Only
+                matters for early stopping and the order of results.
         """
+        if rate_limiter is None:
+            rate_limiter = RateLimiter(":memory:", "default", rate_limit_per_minute)
+
         self._analyzer = analyzer
-        self._rate_limit = rate_limit_per_minute
-        self._call_timestamps: list[float] = []
+        self._rate_limiter = rate_limiter
+        self._rate_controller = rate_controller
+        self._deduplicator = deduplicator
+        self._face_filter = face_filter
+        self._batch_size = batch_size
+        self._max_in_flight = max(1, max_in_flight)
+        self._max_retries = max(0, max_retries)
+        self._retry_budget = max(0, retry_budget)
+        self._geometry = geometry
+        self._metric_aggregate = metric_aggregate
+        self._trim_fraction = trim_fraction
+        self._checkpoint_fsync_every = checkpoint_fsync_every
+        self._early_stopping = early_stopping
+        self._frame_order = frame_order
+        self.retries_used = 0
+
+    def _rate_limit_delay(self) -> float:
+        """Reserve a call slot and return how long to wait for it."""
+        sleep_time = self._rate_limiter.reserve()
+        if sleep_time > 0:
+            # Evenly spaced requests wait a little almost every time
+            logger.log(
+                logging.INFO if sleep_time >= 1.0 else logging.DEBUG,
+                "Rate limit reached (%g/min). Sleeping %.1f seconds...",
+                self._rate_limiter.rate_per_minute, sleep_time,
+            )
+        return sleep_time
 
     def _wait_for_rate_limit(self) -> None:
         """Sleep if necessary to respect the per-minute rate limit."""
-        now = time.time()
-        window_start = now - 60.0
+        sleep_time = self._rate_limit_delay()
+        if sleep_time > 0:
+            time.sleep(sleep_time)
 
-        # Remove timestamps older than 60 seconds
-        self._call_timestamps = [
-            ts for ts in self._call_timestamps if ts > window_start
-        ]
+    async def _wait_for_rate_limit_async(self) -> None:
+        """Async variant of _wait_for_rate_limit.
 
-        if len(self._call_timestamps) >= self._rate_limit:
-            oldest_in_window = self._call_timestamps[0]
-            sleep_time = 60.0 - (now - oldest_in_window) + 0.5
-            if sleep_time > 0:
-                logger.info(
-                    "Rate limit reached (%d/%d). Sleeping %.1f seconds...",
-                    len(self._call_timestamps), self._rate_limit, sleep_time,
-                )
-                time.sleep(sleep_time)
+        The reservation runs in a worker thread, since the shared
+        limiter may wait on another process's database lock.
+        """
+        sleep_time = await asyncio.to_thread(self._rate_limit_delay)
+        if sleep_time > 0:
+            await asyncio.sleep(sleep_time)
+
+    def _retry_delay(self, exc: TransientAPIError, attempt: int) -> float | None:
+        """Decide whether to retry a failed call and how long to wait.
 
-        self._call_timestamps.append(time.time())
+        Uses full-jitter exponential backoff, but never less than the
+        server's retry-after hint. A quota error also pauses the rate
+        limiter for that long, so other in-flight requests (and other
+        processes sharing the limiter) slow down instead of hitting the
+        same 429.
+
+        Args:
+            exc: The transient error raised by the call.
+            attempt: Number of retries already made for this call.
+
+        Returns:
+            Seconds to wait before retrying, or None if the per-call
+            retries or the run's retry budget are used up.
+        """
+        if attempt >= self._max_retries:
+            return None
+        if self.retries_used >= self._retry_budget:
+            logger.warning("Retry budget of %d exhausted, not retrying", self._retry_budget)
+            return None
+
+        self.retries_used += 1
+        ceiling = min(self.BACKOFF_MAX_SECONDS, self.BACKOFF_BASE_SECONDS * 2 ** attempt)
+        delay = random.uniform(0, ceiling)
+        if exc.retry_after is not None:
+            delay = max(delay, exc.retry_after)
+
+        if isinstance(exc, QuotaExceededError):
+            self._rate_limiter.pause(delay)
+
+        logger.warning(
+            "Retrying in %.1f seconds (attempt %d/%d, %d/%d retries used): %s",
+            delay, attempt + 1, self._max_retries,
+            self.retries_used, self._retry_budget, exc,
+        )
+        return delay
+
+    def _report_outcome(
+        self,
+        started: float,
+        exc: TransientAPIError | None = None,
+    ) -> None:
+        """Feed a call's outcome to the rate controller, if any.
+
+        Args:
+            started: time.monotonic() when the call was sent.
+            exc: The transient error the call failed with, or None if
+                it succeeded. Other failures say nothing about load and
+                are not reported.
+        """
+        if self._rate_controller is None:
+            return
+        if exc is None:
+            self._rate_controller.on_success()
+        elif isinstance(exc, QuotaExceededError):
+            self._rate_controller.on_error("429", started)
+        else:
+            self._rate_controller.on_error("transient error", started)
+
+    def _call_with_retries(self, call: Callable[[], T]) -> T:
+        """Run an API call under the rate limiter, retrying transient errors.
+
+        Every attempt waits for its own rate-limit slot.
+
+        Raises:
+            TransientAPIError: If retries are exhausted.
+            AnalysisError: Any non-transient error from the call.
+        """
+        attempt = 0
+        while True:
+            self._wait_for_rate_limit()
+            started = time.monotonic()
+            try:
+                result = call()
+            except TransientAPIError as exc:
+                self._report_outcome(started, exc)
+                delay = self._retry_delay(exc, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                time.sleep(delay)
+            else:
+                self._report_outcome(started)
+                return result
+
+    async def _call_with_retries_async(
+        self,
+        call: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Async variant of _call_with_retries."""
+        attempt = 0
+        while True:
+            await self._wait_for_rate_limit_async()
+            started = time.monotonic()
+            try:
+                result = await call()
+            except TransientAPIError as exc:
+                self._report_outcome(started, exc)
+                delay = self._retry_delay(exc, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+            else:
+                self._report_outcome(started)
+                return result
 
     def process_celeb(
         self,
         celeb_id: str,
         celeb_name: str,
         frames_dir: str,
+        checkpoint_path: str | None = None,
     ) -> dict:
         """Process all frames for a single celebrity.
 
         Analyzes each frame, averages numerical metrics, picks the
         most common categorical values, and builds the final Makeup
-        DNA record.
+        DNA record. To share the request budget between several
+        celebrities, use CelebScheduler instead.
 
         Args:
             celeb_id: Unique identifier for the celebrity.
             celeb_name: Display name of the celebrity.
             frames_dir: Directory containing extracted frame images.
+            checkpoint_path: Optional JSONL checkpoint file. Every API
+                result is appended to it as soon as it returns, and
+                frames already recorded there are not analyzed again.
 
         Returns:
             Merged Makeup DNA dict with averaged metrics and
             dominant patterns.
         """
+        job = self.start_celeb(celeb_id, celeb_name, frames_dir, checkpoint_path)
+        if job is None:
+            return {}
+
+        try:
+            if self._max_in_flight > 1:
+                asyncio.run(self._run_job_async(job))
+            else:
+                while (batch := job.next_batch()) is not None:
+                    self.run_batch(job, batch)
+        finally:
+            job.close()
+
+        return self.finish_celeb(job)
+
+    def start_celeb(
+        self,
+        celeb_id: str,
+        celeb_name: str,
+        frames_dir: str,
+        checkpoint_path: str | None = None,
+    ) -> CelebJob | None:
+        """Prepare a celebrity's frames for analysis.
+
+        Lists, deduplicates, filters and orders the frames, measures
+        local geometry, and merges checkpointed and cached results, so
+        only frames that need an API call are left pending.
+
+        Args:
+            celeb_id: Unique identifier for the celebrity.
+            celeb_name: Display name of the celebrity.
+            frames_dir: Directory containing extracted frame images.
+            checkpoint_path: Optional JSONL checkpoint file (see
+                process_celeb).
+
+        Returns:
+            The CelebJob, or None if there are no usable frames.
+        """
         frame_files = sorted([
             os.path.join(frames_dir, f)
             for f in os.listdir(frames_dir)
@@ -88,290 +428,357 @@ class BatchProcessor:
 
         if not frame_files:
             logger.warning("No frames found in %s for %s", frames_dir, celeb_name)
-            return {}
+            return None
 
         logger.info(
             "Processing %d frames for %s (%s)",
             len(frame_files), celeb_name, celeb_id,
         )
+        started = time.monotonic()
 
-        analyses: list[dict] = []
-
-        for i, frame_path in enumerate(frame_files):
+        if self._deduplicator is not None:
+            clusters = self._deduplicator.deduplicate(frame_files)
+            work = [(c["representative"], c["weight"]) for c in clusters]
             logger.info(
-                "Analyzing frame %d/%d for %s: %s",
-                i + 1, len(frame_files), celeb_name, os.path.basename(frame_path),
+                "Skipping %d duplicate frames for %s",
+                len(frame_files) - len(work), celeb_name,
             )
+        else:
+            work = [(frame_path, 1) for frame_path in frame_files]
+
+        if self._face_filter is not None:
+            with_face = set(self._face_filter.filter_frames([p for p, _ in work]))
+            work = [(p, w) for p, w in work if p in with_face]
+            if not work:
+                logger.warning("No frames with a face found for %s", celeb_name)
+                return None
+
+        work = order_frames(work, self._frame_order)
+
+        # Local measurements cost no API call and survive quota exhaustion
+        measurements: dict[str, dict] = {}
+        if self._geometry is not None:
+            measurements = self._geometry.measure_frames([p for p, _ in work])
+
+        checkpoint: FrameCheckpoint | None = None
+        completed: dict[str, FrameAnalysis] = {}
+        keys: dict[str, str] = {}
+        if checkpoint_path is not None:
+            checkpoint = FrameCheckpoint(
+                checkpoint_path, fsync_every=self._checkpoint_fsync_every,
+            )
+            completed = checkpoint.load()
+            keys = {p: self._analyzer.cache_key(p, celeb_name) for p, _ in work}
+
+        # Results are folded in as they arrive instead of being buffered
+        aggregator = DnaAggregator(self._metric_aggregate, self._trim_fraction)
+        pending: list[tuple[str, int]] = []
+        resumed = 0
+
+        # Checkpointed and cached results cost no API call, so they
+        # bypass the rate limiter
+        for frame_path, weight in work:
+            analysis = completed.get(keys[frame_path]) if keys else None
+            if analysis is not None:
+                resumed += 1
+            else:
+                analysis = self._analyzer.get_cached(frame_path, celeb_name)
 
-            self._wait_for_rate_limit()
-
-            try:
-                analysis = self._analyzer.analyze_frame(frame_path, celeb_name)
-                analyses.append(analysis)
-            except (RuntimeError, FileNotFoundError) as exc:
-                logger.error(
-                    "Failed to analyze frame %s: %s", frame_path, exc,
-                )
-                continue
+            if analysis is not None:
+                aggregator.add(analysis, weight)
+            else:
+                pending.append((frame_path, weight))
 
-        if not analyses:
-            logger.warning("No successful analyses for %s", celeb_name)
-            return {}
+        if resumed:
+            logger.info(
+                "Resumed %d analyses from checkpoint %s", resumed, checkpoint_path,
+            )
+        if aggregator.frames > resumed:
+            logger.info(
+                "Reused %d cached analyses for %s",
+                aggregator.frames - resumed, celeb_name,
+            )
 
-        merged_metrics = self._average_metrics(analyses)
-        merged_patterns = self._merge_patterns(analyses)
+        monitor = self._early_stopping.monitor() if self._early_stopping else None
+        if monitor is not None:
+            monitor.update(aggregator)
+
+        return CelebJob(
+            celeb_id=celeb_id,
+            celeb_name=celeb_name,
+            total_frames=len(frame_files),
+            work=work,
+            pending=pending,
+            aggregator=aggregator,
+            measurements=measurements,
+            batch_size=self._choose_batch_size(len(pending)),
+            checkpoint=checkpoint,
+            keys=keys,
+            monitor=monitor,
+            started=started,
+        )
 
-        # Merge adaptation rules (pick the longest/most detailed for each level)
-        adaptation_rules = self._merge_adaptation_rules(analyses)
+    def run_batch(self, job: CelebJob, batch: list[tuple[str, int]]) -> None:
+        """Analyze one batch of a job, falling back to single frames.
 
-        celeb_dna = {
-            "celeb_id": celeb_id,
-            "celeb_name": celeb_name,
-            "makeup_analysis": merged_patterns,
-            "five_metrics": merged_metrics,
-            "adaptation_rules": adaptation_rules,
-            "frames_analyzed": len(analyses),
-            "total_frames": len(frame_files),
-        }
+        A batch whose response is unusable is retried frame by frame and
+        halves the job's batch size for later batches. Quota and
+        permanent API errors fail the batch's frames without further
+        calls.
 
-        logger.info(
-            "Completed DNA extraction for %s: %d/%d frames analyzed",
-            celeb_name, len(analyses), len(frame_files),
-        )
-        return celeb_dna
+        Args:
+            job: The celebrity's job.
+            batch: (frame_path, weight) tuples from job.next_batch().
+        """
+        try:
+            if len(batch) > 1:
+                try:
+                    results = self._call_with_retries(
+                        lambda: self._analyzer.analyze_batch(
+                            [p for p, _ in batch], job.celeb_name,
+                        ),
+                    )
+                except (ResponseFormatError, FileNotFoundError) as exc:
+                    # Retry these frames one by one and use smaller batches
+                    job.batch_size = max(1, job.batch_size // 2)
+                    logger.warning(
+                        "Batch analysis failed, falling back to single frames "
+                        "(next batch size %d): %s", job.batch_size, exc,
+                    )
+                except RuntimeError as exc:
+                    # Per-frame calls would hit the same quota or error
+                    logger.error(
+                        "Failed to analyze %d frames for %s: %s",
+                        len(batch), job.celeb_name, exc,
+                    )
+                    return
+                else:
+                    for analysis, (frame_path, weight) in zip(results, batch):
+                        job.record(frame_path, analysis, weight)
+                    return
+
+            for frame_path, weight in batch:
+                try:
+                    analysis = self._call_with_retries(
+                        lambda: self._analyzer.analyze_frame(
+                            frame_path, job.celeb_name, check_cache=False,
+                        ),
+                    )
+                    job.record(frame_path, analysis, weight)
+                except (RuntimeError, FileNotFoundError) as exc:
+                    logger.error(
+                        "Failed to analyze frame %s: %s", frame_path, exc,
+                    )
+                    continue
+        finally:
+            job.in_flight -= 1
+
+    async def run_batch_async(
+        self,
+        job: CelebJob,
+        batch: list[tuple[str, int]],
+    ) -> None:
+        """Async variant of run_batch.
 
-    def _average_metrics(self, analyses: list[dict]) -> dict:
-        """Average numerical metrics across multiple frame analyses.
+        Does not change the batch size on failure, since other batches
+        of the job may already be in flight.
+        """
+        try:
+            for frame_path, analysis, weight in await self._analyze_batch_async(
+                batch, job.celeb_name,
+            ):
+                job.record(frame_path, analysis, weight)
+        finally:
+            job.in_flight -= 1
 
-        For categorical values (classification, grade, etc.), picks the
-        most common value. For numerical values, computes the mean.
+    def finish_celeb(self, job: CelebJob) -> dict:
+        """Build the Makeup DNA record of a finished job.
 
         Args:
-            analyses: List of individual frame analysis dicts.
+            job: A job with no batches left or in flight.
 
         Returns:
-            Averaged five_metrics dict.
+            Merged Makeup DNA dict, or an empty dict if neither API
+            results nor local measurements are available.
         """
-        metrics_list = [
-            a["five_metrics"] for a in analyses
-            if "five_metrics" in a
-        ]
+        job.close()
+        aggregator = job.aggregator
 
-        if not metrics_list:
-            return {}
+        if job.converged:
+            name, ratio = job.monitor.widest
+            logger.info(
+                "Metrics converged for %s after %d/%d frames (widest interval: "
+                "%s at %.0f%% of tolerance); skipped the remaining frames",
+                job.celeb_name, aggregator.frames, len(job.work), name, ratio * 100,
+            )
+
+        if not aggregator.frames:
+            logger.warning("No successful analyses for %s", job.celeb_name)
+            if not job.measurements:
+                return {}
+
+        merged = aggregator.snapshot()
+        for name, stats in aggregator.numeric_stats().items():
+            logger.debug(
+                "%s for %s: mean %.2f, median %.2f, trimmed mean %.2f, std %.2f",
+                name, job.celeb_name, stats["mean"], stats["median"],
+                stats["trimmed_mean"], stats["std"],
+            )
+        if self._geometry is not None:
+            self._apply_geometry(merged["five_metrics"], job.measurements, dict(job.work))
 
-        count = len(metrics_list)
+        celeb_dna = {
+            "celeb_id": job.celeb_id,
+            "celeb_name": job.celeb_name,
+            "makeup_analysis": merged["makeup_analysis"],
+            "five_metrics": merged["five_metrics"],
+            "adaptation_rules": merged["adaptation_rules"],
+            "frames_analyzed": aggregator.frames,
+            "total_frames": job.total_frames,
+        }
 
-        # Average visual_weight_score
-        visual_weight = round(
-            sum(m.get("visual_weight_score", 0) for m in metrics_list) / count
+        elapsed = time.monotonic() - job.started
+        logger.info(
+            "Completed DNA extraction for %s: %d/%d frames analyzed "
+            "in %.1fs (%.1f frames/min)",
+            job.celeb_name, aggregator.frames, job.total_frames,
+            elapsed, aggregator.frames * 60.0 / max(elapsed, 1e-6),
         )
+        return celeb_dna
 
-        # Average canthal_tilt
-        canthal_angles = [
-            m.get("canthal_tilt", {}).get("angle_degrees", 0.0)
-            for m in metrics_list
-        ]
-        avg_canthal_angle = round(sum(canthal_angles) / count, 1)
-        canthal_classifications = [
-            m.get("canthal_tilt", {}).get("classification", "neutral")
-            for m in metrics_list
-        ]
-        canthal_class = self._most_common(canthal_classifications)
+    async def _run_job_async(self, job: CelebJob) -> None:
+        """Analyze a job's batches with up to max_in_flight requests at once.
 
-        # Average midface_ratio
-        midface_ratios = [
-            m.get("midface_ratio", {}).get("ratio_percent", 0.0)
-            for m in metrics_list
-        ]
-        avg_midface = round(sum(midface_ratios) / count, 1)
-        philtrum_values = [
-            m.get("midface_ratio", {}).get("philtrum_relative", "average")
-            for m in metrics_list
-        ]
-        youth_scores = [
-            m.get("midface_ratio", {}).get("youth_score", 0)
-            for m in metrics_list
-        ]
-        avg_youth = round(sum(youth_scores) / count)
+        Every request still waits for a rate-limit slot, so the number
+        of calls per minute is unchanged; what changes is that per-call
+        latency overlaps instead of adding up. Each worker takes the
+        next batch when its previous one completes, so nothing is queued
+        once the job has converged.
+        """
 
-        # Average luminosity_score
-        luminosity_current = [
-            m.get("luminosity_score", {}).get("current", 0)
-            for m in metrics_list
-        ]
-        luminosity_potential = [
-            m.get("luminosity_score", {}).get("potential_with_kglow", 0)
-            for m in metrics_list
-        ]
-        texture_grades = [
-            m.get("luminosity_score", {}).get("texture_grade", "B")
-            for m in metrics_list
-        ]
+        async def worker() -> None:
+            while (batch := job.next_batch()) is not None:
+                await self.run_batch_async(job, batch)
 
-        # Average harmony_index
-        harmony_overall = [
-            m.get("harmony_index", {}).get("overall", 0)
-            for m in metrics_list
-        ]
-        symmetry_scores = [
-            m.get("harmony_index", {}).get("symmetry_score", 0)
-            for m in metrics_list
-        ]
-        balance_descriptions = [
-            m.get("harmony_index", {}).get("optimal_balance", "")
-            for m in metrics_list
-        ]
-
-        return {
-            "visual_weight_score": visual_weight,
-            "canthal_tilt": {
-                "angle_degrees": avg_canthal_angle,
-                "classification": canthal_class,
-            },
-            "midface_ratio": {
-                "ratio_percent": avg_midface,
-                "philtrum_relative": self._most_common(philtrum_values),
-                "youth_score": avg_youth,
-            },
-            "luminosity_score": {
-                "current": round(sum(luminosity_current) / count),
-                "potential_with_kglow": round(sum(luminosity_potential) / count),
-                "texture_grade": self._most_common(texture_grades),
-            },
-            "harmony_index": {
-                "overall": round(sum(harmony_overall) / count),
-                "symmetry_score": round(sum(symmetry_scores) / count),
-                "optimal_balance": self._most_common(
-                    [b for b in balance_descriptions if b]
-                ) or "",
-            },
-        }
+        await asyncio.gather(*(worker() for _ in range(self._max_in_flight)))
 
-    def _merge_patterns(self, analyses: list[dict]) -> dict:
-        """Merge makeup patterns from multiple analyses.
+    async def _analyze_batch_async(
+        self,
+        batch: list[tuple[str, int]],
+        celeb_name: str,
+    ) -> list[tuple[str, FrameAnalysis, int]]:
+        """Analyze one batch asynchronously, falling back to single frames.
 
-        Uses the most common value for each categorical pattern field.
+        As in run_batch, only an unusable response triggers the
+        per-frame fallback.
 
         Args:
-            analyses: List of individual frame analysis dicts.
+            batch: (frame_path, weight) tuples to send in one request.
+            celeb_name: Display name of the celebrity.
 
         Returns:
-            Merged makeup_analysis dict with dominant patterns.
+            (frame_path, analysis, weight) tuples for the frames that
+            succeeded.
         """
-        pattern_list = [
-            a["makeup_analysis"] for a in analyses
-            if "makeup_analysis" in a
-        ]
-
-        if not pattern_list:
-            return {}
-
-        # Merge eye_pattern
-        eye_pattern = self._merge_subdict(
-            [p.get("eye_pattern", {}) for p in pattern_list],
-            string_keys=["shape", "liner_style", "shadow_placement", "lash_emphasis"],
-            list_keys=["shadow_tones"],
-        )
-
-        # Merge lip_pattern
-        lip_pattern = self._merge_subdict(
-            [p.get("lip_pattern", {}) for p in pattern_list],
-            string_keys=["technique", "color_family", "finish", "inner_color_intensity"],
-        )
-
-        # Merge base_pattern
-        base_pattern = self._merge_subdict(
-            [p.get("base_pattern", {}) for p in pattern_list],
-            string_keys=["coverage", "finish", "contour_intensity", "blush_style"],
-            list_keys=["highlight_placement"],
-        )
-
-        # Balance rule: pick the most common
-        balance_rules = [
-            p.get("balance_rule", "") for p in pattern_list if p.get("balance_rule")
-        ]
-        balance_rule = self._most_common(balance_rules) if balance_rules else ""
+        if len(batch) > 1:
+            try:
+                results = await self._call_with_retries_async(
+                    lambda: self._analyzer.analyze_batch_async(
+                        [p for p, _ in batch], celeb_name,
+                    ),
+                )
+            except (ResponseFormatError, FileNotFoundError) as exc:
+                logger.warning(
+                    "Batch analysis failed, falling back to single frames: %s",
+                    exc,
+                )
+            except RuntimeError as exc:
+                # Per-frame calls would hit the same quota or error
+                logger.error(
+                    "Failed to analyze %d frames for %s: %s",
+                    len(batch), celeb_name, exc,
+                )
+                return []
+            else:
+                return [(p, a, w) for a, (p, w) in zip(results, batch)]
 
-        return {
-            "eye_pattern": eye_pattern,
-            "lip_pattern": lip_pattern,
-            "base_pattern": base_pattern,
-            "balance_rule": balance_rule,
-        }
+        analyzed: list[tuple[str, FrameAnalysis, int]] = []
 
-    def _merge_subdict(
-        self,
-        dicts: list[dict],
-        string_keys: list[str] | None = None,
-        list_keys: list[str] | None = None,
-    ) -> dict:
-        """Merge a list of sub-dicts by picking most common values.
+        for frame_path, weight in batch:
+            try:
+                analysis = await self._call_with_retries_async(
+                    lambda: self._analyzer.analyze_frame_async(
+                        frame_path, celeb_name, check_cache=False,
+                    ),
+                )
+            except (RuntimeError, FileNotFoundError) as exc:
+                logger.error("Failed to analyze frame %s: %s", frame_path, exc)
+                continue
 
-        Args:
-            dicts: List of dicts to merge.
-            string_keys: Keys with string values (pick most common).
-            list_keys: Keys with list values (flatten and pick most common items).
+            analyzed.append((frame_path, analysis, weight))
 
-        Returns:
-            Merged dict.
-        """
-        result: dict = {}
-
-        for key in (string_keys or []):
-            values = [d.get(key, "") for d in dicts if d.get(key)]
-            result[key] = self._most_common(values) if values else ""
-
-        for key in (list_keys or []):
-            all_items: list[str] = []
-            for d in dicts:
-                items = d.get(key, [])
-                if isinstance(items, list):
-                    all_items.extend(items)
-            # Return the most common items (up to 5)
-            if all_items:
-                counter = Counter(all_items)
-                result[key] = [item for item, _ in counter.most_common(5)]
-            else:
-                result[key] = []
+        return analyzed
 
-        return result
+    def _choose_batch_size(self, frame_count: int) -> int:
+        """Pick how many frames to send per API request.
 
-    def _merge_adaptation_rules(self, analyses: list[dict]) -> dict:
-        """Merge adaptation rules by picking the longest description per level.
+        Uses the configured batch size if set. Otherwise picks the
+        smallest batch that lets all frames fit into one minute of the
+        rate limit, capped at MAX_BATCH_SIZE to keep responses within
+        the model's output limit. A celebrity with no more frames than
+        the per-minute rate is therefore analyzed one frame per request:
+        batching would save at most a minute, and single-frame answers
+        are more reliable than long JSON arrays. Set batch_size to batch
+        regardless, e.g. to save daily quota.
 
         Args:
-            analyses: List of individual frame analysis dicts.
+            frame_count: Number of frames still to analyze.
 
         Returns:
-            Dict with L1_L2, L3_L4, L5_L6 adaptation rules.
+            Batch size of at least 1.
         """
-        rules: dict[str, str] = {"L1_L2": "", "L3_L4": "", "L5_L6": ""}
+        if self._batch_size is not None:
+            return max(1, self._batch_size)
 
-        for level in rules:
-            candidates = [
-                a.get("adaptation_rules", {}).get(level, "")
-                for a in analyses
-                if a.get("adaptation_rules", {}).get(level)
-            ]
-            if candidates:
-                # Pick the longest (most detailed) description
-                rules[level] = max(candidates, key=len)
+        size = math.ceil(frame_count / max(1, self._rate_limiter.rate_per_minute))
+        return max(1, min(self.MAX_BATCH_SIZE, size))
 
-        return rules
+    def _apply_geometry(
+        self,
+        merged_metrics: dict,
+        measurements: dict[str, dict],
+        frame_weights: dict[str, int],
+    ) -> None:
+        """Overwrite the geometric metrics with local measurements.
 
-    @staticmethod
-    def _most_common(values: list[str]) -> str:
-        """Return the most common value from a list of strings.
+        The measurements are merged with the same rule as the other
+        numeric metrics (metric_aggregate, default mean).
 
         Args:
-            values: List of string values.
-
-        Returns:
-            The most frequently occurring string, or empty string if
-            the input list is empty.
+            merged_metrics: five_metrics dict of a DnaAggregator snapshot,
+                updated in place.
+            measurements: Per-frame results of FaceGeometry.measure_frames.
+            frame_weights: Merge weight of every analyzed frame path.
         """
-        if not values:
-            return ""
-        counter = Counter(values)
-        return counter.most_common(1)[0][0]
+        if not measurements:
+            logger.warning(
+                "No facial landmarks found; geometric metrics come from "
+                "the model and may be 0",
+            )
+            return
+
+        names = ("angle_degrees", "ratio_percent", "symmetry_score")
+        values = np.array([[m[name] for name in names] for m in measurements.values()])
+        weights = np.array([frame_weights.get(p, 1) for p in measurements], dtype=float)
+        merged = weighted_stats(values, weights, self._trim_fraction)[
+            self._metric_aggregate or "mean"
+        ]
+        angle, ratio, symmetry = (float(value) for value in merged)
+
+        angle = round(angle, 1)
+        merged_metrics.setdefault("canthal_tilt", {}).update({
+            "angle_degrees": angle,
+            "classification": FaceGeometry.classify_tilt(angle),
+        })
+        merged_metrics.setdefault("midface_ratio", {})["ratio_percent"] = round(ratio, 1)
+        merged_metrics.setdefault("harmony_index", {})["symmetry_score"] = round(symmetry)
@@ -0,0 +1,246 @@
+"""Cross-celebrity scheduling of the frame analysis stage.
+
+Instead of finishing one celebrity before starting the next, a
+CelebScheduler takes batches from every celebrity whose frames are
+ready and shares the request budget between them by smooth weighted
+round-robin. Jobs are prepared (BatchProcessor.start_celeb) and
+submitted from another thread as their downloads finish, so analysis
+never waits for a download or for frame preparation while other frames
+are ready, and a celebrity with few frames or failing requests does not
+leave the quota unused. Each celebrity's DNA is finalized and reported
+on a separate thread as soon as its last batch completes, so saving and
+uploading it does not hold up requests either.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from analyzers.batch_processor import BatchProcessor, CelebJob
+
+logger = logging.getLogger(__name__)
+
+
+class CelebScheduler:
+    """Interleaves the analysis batches of several celebrities.
+
+    submit and close may be called from any thread; run must be called
+    from a single thread and returns once every submitted celebrity is
+    finished and reported, and close was called.
+    """
+
+    def __init__(
+        self,
+        processor: BatchProcessor,
+        on_finished: Callable[[str, dict, bool], None],
+        max_in_flight: int = 1,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            processor: BatchProcessor that analyzes and finalizes each
+                celebrity.
+            on_finished: Called with (celeb_id, dna, complete) as soon
+                as a celebrity is finished, on a separate thread, one
+                call at a time. dna is empty if nothing could be
+                analyzed; complete is False if some frames failed and
+                are left for a later run (see CelebJob.complete).
+            max_in_flight: Maximum concurrent API requests over all
+                celebrities. Values above 1 use asyncio.
+        """
+        self._processor = processor
+        self._on_finished = on_finished
+        self._max_in_flight = max(1, max_in_flight)
+        self._submissions: queue.Queue[tuple[CelebJob, float] | None] = queue.Queue()
+        self._active: list[CelebJob] = []
+        self._weights: dict[str, float] = {}
+        self._credit: dict[str, float] = {}
+        self._reports: list[Future] = []
+        self._stopped = False
+        self._lock = threading.Lock()
+        # Wakes the asyncio admission loop while run is in async mode
+        self._wake: Callable[[], object] | None = None
+
+    def submit(self, job: CelebJob, weight: float = 1.0) -> None:
+        """Add a prepared celebrity to the rotation.
+
+        A job submitted after run has returned is closed instead.
+
+        Args:
+            job: The celebrity's job from BatchProcessor.start_celeb.
+            weight: Relative share of the request budget while other
+                celebrities have frames pending.
+        """
+        with self._lock:
+            if not self._stopped:
+                self._submissions.put((job, weight))
+                if self._wake is not None:
+                    self._wake()
+                return
+        job.close()
+
+    def close(self) -> None:
+        """Signal that no more celebrities will be submitted."""
+        with self._lock:
+            self._submissions.put(None)
+            if self._wake is not None:
+                self._wake()
+
+    def run(self) -> None:
+        """Analyze submitted celebrities until all are finished.
+
+        Raises:
+            Exception: The first error raised by on_finished, after all
+                celebrities are done.
+        """
+        reporter = ThreadPoolExecutor(max_workers=1, thread_name_prefix="celeb-report")
+        try:
+            if self._max_in_flight > 1:
+                asyncio.run(self._run_async(reporter))
+            else:
+                self._run_sync(reporter)
+        finally:
+            self._stop(reporter)
+
+        for report in self._reports:
+            report.result()
+
+    def _run_sync(self, reporter: ThreadPoolExecutor) -> None:
+        """Issue one request at a time, picking the celebrity per request."""
+        open_ = True
+        while open_ or self._active:
+            # Block for new celebrities only when nothing else is ready
+            while open_:
+                try:
+                    submission = self._submissions.get(block=not self._active)
+                except queue.Empty:
+                    break
+                if submission is None:
+                    open_ = False
+                else:
+                    self._admit(reporter, *submission)
+
+            job = self._pick()
+            if job is None:
+                continue
+
+            self._processor.run_batch(job, job.next_batch())
+            if job.done:
+                self._finish(reporter, job)
+
+    async def _run_async(self, reporter: ThreadPoolExecutor) -> None:
+        """Keep up to max_in_flight requests running over all celebrities."""
+        ready = asyncio.Condition()
+        # Set by submit and close; starts set for earlier submissions
+        arrived = asyncio.Event()
+        arrived.set()
+        open_ = True
+
+        async def admit() -> None:
+            nonlocal open_
+            while open_:
+                await arrived.wait()
+                arrived.clear()
+                async with ready:
+                    while open_:
+                        try:
+                            submission = self._submissions.get_nowait()
+                        except queue.Empty:
+                            break
+                        if submission is None:
+                            open_ = False
+                        else:
+                            self._admit(reporter, *submission)
+                    ready.notify_all()
+
+        async def worker() -> None:
+            while True:
+                async with ready:
+                    await ready.wait_for(
+                        lambda: self._has_pending() or not (open_ or self._active),
+                    )
+                    job = self._pick()
+                    if job is None:
+                        return
+                    batch = job.next_batch()
+
+                await self._processor.run_batch_async(job, batch)
+
+                async with ready:
+                    if job.done and job in self._active:
+                        self._finish(reporter, job)
+                    ready.notify_all()
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._wake = lambda: loop.call_soon_threadsafe(arrived.set)
+        try:
+            await asyncio.gather(admit(), *(worker() for _ in range(self._max_in_flight)))
+        finally:
+            with self._lock:
+                self._wake = None
+
+    def _admit(self, reporter: ThreadPoolExecutor, job: CelebJob, weight: float) -> None:
+        """Add a submitted celebrity to the rotation."""
+        self._active.append(job)
+        self._weights[job.celeb_id] = max(weight, 1e-6)
+        self._credit[job.celeb_id] = 0.0
+        logger.info(
+            "Scheduling %d frames for %s (%d celebs active)",
+            len(job.pending), job.celeb_name, len(self._active),
+        )
+        if job.done:
+            self._finish(reporter, job)
+
+    def _has_pending(self) -> bool:
+        return any(job.has_pending for job in self._active)
+
+    def _pick(self) -> CelebJob | None:
+        """Pick the celebrity for the next request.
+
+        Smooth weighted round-robin: every candidate gains its weight in
+        credit, the one with the most credit is picked and pays the
+        total weight, so picks are interleaved in proportion to weight.
+        """
+        candidates = [job for job in self._active if job.has_pending]
+        if not candidates:
+            return None
+
+        for job in candidates:
+            self._credit[job.celeb_id] += self._weights[job.celeb_id]
+        picked = max(candidates, key=lambda job: self._credit[job.celeb_id])
+        self._credit[picked.celeb_id] -= sum(
+            self._weights[job.celeb_id] for job in candidates
+        )
+        return picked
+
+    def _finish(self, reporter: ThreadPoolExecutor, job: CelebJob) -> None:
+        """Hand a finished celebrity to the reporter thread."""
+        self._active.remove(job)
+        logger.info(
+            "Finished %s; %d celebs still active", job.celeb_name, len(self._active),
+        )
+        self._reports.append(reporter.submit(self._report, job))
+
+    def _report(self, job: CelebJob) -> None:
+        """Finalize a celebrity's DNA and pass it to on_finished."""
+        dna = self._processor.finish_celeb(job)
+        self._on_finished(job.celeb_id, dna, job.complete)
+
+    def _stop(self, reporter: ThreadPoolExecutor) -> None:
+        """Close unfinished jobs and wait for outstanding reports."""
+        with self._lock:
+            self._stopped = True
+        for job in self._active:
+            job.close()
+        while True:
+            try:
+                submission = self._submissions.get_nowait()
+            except queue.Empty:
+                break
+            if submission is not None:
+                submission[0].close()
+        reporter.shutdown(wait=True)
@@ -0,0 +1,323 @@
+"""Streaming aggregation of frame analyses into a Makeup DNA record.
+
+Each FrameAnalysis is folded in as soon as it arrives: numeric metrics
+are appended as one row of a NumPy matrix (and to running weighted
+sums), categorical fields and list items to weighted Counters, and
+adaptation rules keep the longest text seen so far. Memory per frame is
+a handful of floats, and the merged DNA can be read at any point.
+
+What is merged, and how, is declared by the FieldSpec schema below.
+Numeric statistics (mean, median, trimmed mean, standard deviation) are
+computed for all numeric fields at once over the matrix.
+"""
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from operator import attrgetter
+
+import numpy as np
+
+from analyzers.frame_analysis import FrameAnalysis
+
+NUMERIC_RULES = ("mean", "median", "trimmed_mean")
+
+
+@dataclass(frozen=True, slots=True)
+class FieldSpec:
+    """How one DNA field is merged across frames.
+
+    Attributes:
+        path: Dotted attribute path below the section, e.g.
+            "canthal_tilt.angle_degrees".
+        kind: "numeric", "categorical", "list" or "text".
+        rule: Aggregation rule for the kind:
+            numeric      "mean", "median" or "trimmed_mean" (weighted)
+            categorical  "mode" (most common value by total weight) or
+                         "mode_nonempty" (ignores empty values)
+            list         "top" (up to TOP_ITEMS most common items)
+            text         "longest" (longest non-empty text)
+        digits: Decimals numeric results are rounded to; None rounds to
+            an int.
+    """
+
+    path: str
+    kind: str
+    rule: str
+    digits: int | None = None
+
+
+FIVE_METRICS_FIELDS = [
+    FieldSpec("visual_weight_score", "numeric", "mean"),
+    FieldSpec("canthal_tilt.angle_degrees", "numeric", "mean", 1),
+    FieldSpec("canthal_tilt.classification", "categorical", "mode"),
+    FieldSpec("midface_ratio.ratio_percent", "numeric", "mean", 1),
+    FieldSpec("midface_ratio.philtrum_relative", "categorical", "mode"),
+    FieldSpec("midface_ratio.youth_score", "numeric", "mean"),
+    FieldSpec("luminosity_score.current", "numeric", "mean"),
+    FieldSpec("luminosity_score.potential_with_kglow", "numeric", "mean"),
+    FieldSpec("luminosity_score.texture_grade", "categorical", "mode"),
+    FieldSpec("harmony_index.overall", "numeric", "mean"),
+    FieldSpec("harmony_index.symmetry_score", "numeric", "mean"),
+    FieldSpec("harmony_index.optimal_balance", "categorical", "mode_nonempty"),
+]
+
+MAKEUP_ANALYSIS_FIELDS = [
+    FieldSpec("eye_pattern.shape", "categorical", "mode_nonempty"),
+    FieldSpec("eye_pattern.liner_style", "categorical", "mode_nonempty"),
+    FieldSpec("eye_pattern.shadow_placement", "categorical", "mode_nonempty"),
+    FieldSpec("eye_pattern.lash_emphasis", "categorical", "mode_nonempty"),
+    FieldSpec("eye_pattern.shadow_tones", "list", "top"),
+    FieldSpec("lip_pattern.technique", "categorical", "mode_nonempty"),
+    FieldSpec("lip_pattern.color_family", "categorical", "mode_nonempty"),
+    FieldSpec("lip_pattern.finish", "categorical", "mode_nonempty"),
+    FieldSpec("lip_pattern.inner_color_intensity", "categorical", "mode_nonempty"),
+    FieldSpec("base_pattern.coverage", "categorical", "mode_nonempty"),
+    FieldSpec("base_pattern.finish", "categorical", "mode_nonempty"),
+    FieldSpec("base_pattern.contour_intensity", "categorical", "mode_nonempty"),
+    FieldSpec("base_pattern.blush_style", "categorical", "mode_nonempty"),
+    FieldSpec("base_pattern.highlight_placement", "list", "top"),
+    FieldSpec("balance_rule", "categorical", "mode_nonempty"),
+]
+
+ADAPTATION_RULES_FIELDS = [
+    FieldSpec("L1_L2", "text", "longest"),
+    FieldSpec("L3_L4", "text", "longest"),
+    FieldSpec("L5_L6", "text", "longest"),
+]
+
+SECTIONS = {
+    "makeup_analysis": MAKEUP_ANALYSIS_FIELDS,
+    "five_metrics": FIVE_METRICS_FIELDS,
+    "adaptation_rules": ADAPTATION_RULES_FIELDS,
+}
+
+TOP_ITEMS = 5
+
+
+class DnaAggregator:
+    """Incrementally merges weighted frame analyses.
+
+    With the default schema, folding frames in one at a time gives the
+    same result as merging the full list, including tie-breaking:
+    equally weighted values are resolved in favour of the one seen
+    first, and means are summed in arrival order.
+    """
+
+    def __init__(
+        self,
+        numeric_rule: str | None = None,
+        trim_fraction: float = 0.1,
+    ) -> None:
+        """Create an empty aggregator.
+
+        Args:
+            numeric_rule: Aggregation rule applied to every numeric field
+                instead of the one in its FieldSpec: "mean", "median" or
+                "trimmed_mean".
+            trim_fraction: Share of the total weight cut from each end
+                for trimmed means.
+
+        Raises:
+            ValueError: If the rule or trim fraction is invalid.
+        """
+        if numeric_rule is not None and numeric_rule not in NUMERIC_RULES:
+            raise ValueError(f"Unknown numeric aggregation rule: {numeric_rule}")
+        if not 0 <= trim_fraction < 0.5:
+            raise ValueError("trim_fraction must be in [0, 0.5)")
+
+        self._numeric_rule = numeric_rule
+        self._trim_fraction = trim_fraction
+
+        self._fields = [
+            (f"{section}.{spec.path}", spec)
+            for section, specs in SECTIONS.items()
+            for spec in specs
+        ]
+        self._getters = {name: attrgetter(name) for name, _ in self._fields}
+        self.numeric_fields = [
+            name for name, spec in self._fields if spec.kind == "numeric"
+        ]
+        self._column = {name: i for i, name in enumerate(self.numeric_fields)}
+
+        self.frames = 0
+        self._total_weight = 0
+        self._values = np.empty((64, len(self.numeric_fields)))
+        self._weights = np.empty(64)
+        self._sums = np.zeros(len(self.numeric_fields))
+        self._counters: dict[str, Counter] = defaultdict(Counter)
+        self._longest: dict[str, str] = {}
+
+    def add(self, analysis: FrameAnalysis, weight: int = 1) -> None:
+        """Fold one frame analysis into the running aggregates.
+
+        Args:
+            analysis: Validated analysis of one frame.
+            weight: Merge weight, e.g. the frame's duplicate cluster size.
+        """
+        if self.frames == len(self._values):
+            self._values = np.concatenate([self._values, np.empty_like(self._values)])
+            self._weights = np.concatenate([self._weights, np.empty_like(self._weights)])
+
+        row = self._values[self.frames]
+        for name, spec in self._fields:
+            value = self._getters[name](analysis)
+
+            if spec.kind == "numeric":
+                row[self._column[name]] = value
+            elif spec.kind == "categorical":
+                if value or spec.rule == "mode":
+                    self._counters[name][value] += weight
+            elif spec.kind == "list":
+                for item in value:
+                    self._counters[name][item] += weight
+            elif spec.kind == "text":
+                if len(value) > len(self._longest.get(name, "")):
+                    self._longest[name] = value
+
+        # Summed row by row so means match a sequential sum exactly
+        self._sums += row * weight
+        self._weights[self.frames] = weight
+        self.frames += 1
+        self._total_weight += weight
+
+    def snapshot(self) -> dict:
+        """Return the merged DNA fields for the frames added so far.
+
+        Returns:
+            Dict with makeup_analysis, five_metrics and adaptation_rules.
+            makeup_analysis and five_metrics are empty until the first
+            frame is added.
+        """
+        stats = self.numeric_stats() if self.frames else {}
+        result: dict = {section: {} for section in SECTIONS}
+
+        for name, spec in self._fields:
+            section, path = name.split(".", 1)
+            if not self.frames and section != "adaptation_rules":
+                continue
+
+            if spec.kind == "numeric":
+                rule = self._numeric_rule or spec.rule
+                value = round(float(stats[name][rule]), spec.digits)
+            elif spec.kind == "categorical":
+                counter = self._counters.get(name)
+                value = counter.most_common(1)[0][0] if counter else ""
+            elif spec.kind == "list":
+                counter = self._counters.get(name) or Counter()
+                value = [item for item, _ in counter.most_common(TOP_ITEMS)]
+            else:
+                value = self._longest.get(name, "")
+
+            self._set(result[section], path, value)
+
+        return result
+
+    def numeric_stats(self) -> dict[str, dict[str, float]]:
+        """Compute weighted statistics for every numeric field at once.
+
+        Returns:
+            Dict mapping each numeric field's dotted name (e.g.
+            "five_metrics.visual_weight_score") to its mean, median,
+            trimmed_mean and std (population, weighted). Empty if no
+            frame has been added.
+        """
+        if not self.frames:
+            return {}
+
+        stats = weighted_stats(
+            self._values[:self.frames],
+            self._weights[:self.frames],
+            self._trim_fraction,
+            mean=self._sums / self._total_weight,
+        )
+
+        return {
+            name: {
+                "mean": float(stats["mean"][i]),
+                "median": float(stats["median"][i]),
+                "trimmed_mean": float(stats["trimmed_mean"][i]),
+                "std": float(stats["std"][i]),
+            }
+            for i, name in enumerate(self.numeric_fields)
+        }
+
+    def numeric_std(self) -> dict[str, float]:
+        """Return the weighted standard deviation of every numeric field.
+
+        Cheaper than numeric_stats, for callers that check the spread
+        after every frame.
+        """
+        if not self.frames:
+            return {}
+        std = _weighted_std(
+            self._values[:self.frames],
+            self._weights[:self.frames],
+            self._sums / self._total_weight,
+        )
+        return {name: float(std[i]) for i, name in enumerate(self.numeric_fields)}
+
+    def dominant_values(self) -> dict[str, str]:
+        """Return the current most common value of every categorical field."""
+        return {
+            name: self._counters[name].most_common(1)[0][0]
+            for name, spec in self._fields
+            if spec.kind == "categorical" and self._counters.get(name)
+        }
+
+    @staticmethod
+    def _set(target: dict, path: str, value) -> None:
+        """Set a dotted path in a nested dict, creating parents."""
+        *parents, key = path.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[key] = value
+
+
+def weighted_stats(
+    values: np.ndarray,
+    weights: np.ndarray,
+    trim_fraction: float = 0.1,
+    mean: np.ndarray | None = None,
+) -> dict[str, np.ndarray]:
+    """Compute weighted statistics for every column of a matrix at once.
+
+    Args:
+        values: Matrix with one row per frame and one column per metric.
+        weights: Weight of each row.
+        trim_fraction: Share of the total weight cut from each end for
+            the trimmed mean.
+        mean: Weighted mean per column if already known, e.g. from
+            running sums.
+
+    Returns:
+        Dict with arrays of the per-column mean, median, trimmed_mean
+        and std (population, weighted).
+    """
+    total = float(weights.sum())
+    if mean is None:
+        mean = weights @ values / total
+    std = _weighted_std(values, weights, mean)
+
+    # Sort each column once; cumulative weights give each value's
+    # share [start, end) of the total weight
+    order = np.argsort(values, axis=0, kind="stable")
+    sorted_values = np.take_along_axis(values, order, axis=0)
+    end = np.cumsum(weights[order], axis=0)
+    start = end - weights[order]
+
+    half = total / 2
+    lower = np.argmax(end >= half, axis=0)
+    upper = np.argmax(end > half, axis=0)
+    columns = np.arange(values.shape[1])
+    median = (sorted_values[lower, columns] + sorted_values[upper, columns]) / 2
+
+    cut = trim_fraction * total
+    kept = np.clip(np.minimum(end, total - cut) - np.maximum(start, cut), 0, None)
+    trimmed_mean = (kept * sorted_values).sum(axis=0) / kept.sum(axis=0)
+
+    return {"mean": mean, "median": median, "trimmed_mean": trimmed_mean, "std": std}
+
+
+def _weighted_std(values: np.ndarray, weights: np.ndarray, mean: np.ndarray) -> np.ndarray:
+    """Weighted population std of each column around mean."""
+    return np.sqrt(weights @ (values - mean) ** 2 / weights.sum())
@@ -0,0 +1,186 @@
+"""Convergence-based early stopping of frame analysis.
+
+The merged DNA of a celebrity usually stops moving long before every
+frame is analyzed. A ConvergenceMonitor watches the DnaAggregator after
+each result and reports convergence once the confidence interval of
+every numeric metric is narrower than its tolerance and the dominant
+value of every categorical field has held for a number of frames.
+BatchProcessor then stops sending API requests for that celebrity.
+
+Early results are only representative if frames are not analyzed in
+file order (one video after another), so order_frames can shuffle them
+or interleave them across source videos and spread them over time.
+"""
+
+import itertools
+import math
+import os
+import random
+from collections import defaultdict
+from statistics import NormalDist
+
+from analyzers.dna_aggregator import DnaAggregator
+
+FRAME_ORDERS = ("sorted", "shuffled", "stratified")
+
+# Tolerated confidence interval half-width per numeric field, in the
+# field's own unit. Fields not listed are 0-100 scores.
+DEFAULT_TOLERANCES = {
+    "five_metrics.canthal_tilt.angle_degrees": 0.5,
+    "five_metrics.midface_ratio.ratio_percent": 0.5,
+}
+DEFAULT_SCORE_TOLERANCE = 2.0
+
+
+class ConvergencePolicy:
+    """Settings deciding when a celebrity's DNA has converged."""
+
+    def __init__(
+        self,
+        min_frames: int = 12,
+        confidence: float = 0.95,
+        tolerance_scale: float = 1.0,
+        stable_frames: int = 8,
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            min_frames: Frames to analyze before convergence is checked.
+            confidence: Confidence level of the intervals, e.g. 0.95.
+            tolerance_scale: Factor applied to every default tolerance;
+                larger values stop earlier.
+            stable_frames: Frames over which every dominant categorical
+                value must stay unchanged.
+
+        Raises:
+            ValueError: If a setting is out of range.
+        """
+        if min_frames < 2:
+            raise ValueError("min_frames must be at least 2")
+        if not 0 < confidence < 1:
+            raise ValueError("confidence must be between 0 and 1")
+        if tolerance_scale <= 0:
+            raise ValueError("tolerance_scale must be positive")
+
+        self.min_frames = min_frames
+        self.stable_frames = max(0, stable_frames)
+        self.z = NormalDist().inv_cdf((1 + confidence) / 2)
+        self._tolerance_scale = tolerance_scale
+
+    def tolerance(self, field: str) -> float:
+        """Return the tolerated CI half-width for a numeric field."""
+        return DEFAULT_TOLERANCES.get(field, DEFAULT_SCORE_TOLERANCE) * self._tolerance_scale
+
+    def monitor(self) -> "ConvergenceMonitor":
+        """Create a monitor for one celebrity."""
+        return ConvergenceMonitor(self)
+
+
+class ConvergenceMonitor:
+    """Tracks convergence of one celebrity's aggregated DNA."""
+
+    def __init__(self, policy: ConvergencePolicy) -> None:
+        """Initialize the monitor.
+
+        Args:
+            policy: Settings to check against.
+        """
+        self._policy = policy
+        self._dominant: dict[str, str] = {}
+        self._dominant_since = 0
+        self.converged = False
+        self.widest: tuple[str, float] | None = None
+
+    def update(self, aggregator: DnaAggregator) -> bool:
+        """Check convergence after new results were added.
+
+        Args:
+            aggregator: The celebrity's aggregator.
+
+        Returns:
+            True once the DNA has converged. Stays True afterwards.
+        """
+        if self.converged:
+            return True
+
+        dominant = aggregator.dominant_values()
+        if dominant != self._dominant:
+            self._dominant = dominant
+            self._dominant_since = aggregator.frames
+
+        if aggregator.frames < self._policy.min_frames:
+            return False
+
+        # Duplicate-cluster weights do not add independent samples, so
+        # the interval uses the number of analyzed frames
+        scale = self._policy.z / math.sqrt(aggregator.frames)
+        self.widest = max(
+            (
+                (name, std * scale / self._policy.tolerance(name))
+                for name, std in aggregator.numeric_std().items()
+            ),
+            key=lambda item: item[1],
+        )
+
+        self.converged = (
+            self.widest[1] <= 1.0
+            and aggregator.frames - self._dominant_since >= self._policy.stable_frames
+        )
+        return self.converged
+
+
+def order_frames(
+    work: list[tuple[str, int]],
+    order: str,
+    seed: int = 0,
+) -> list[tuple[str, int]]:
+    """Order frames so that any prefix is representative.
+
+    Args:
+        work: (frame_path, weight) tuples in file order.
+        order: "sorted" keeps file order, "shuffled" shuffles with a
+            fixed seed, "stratified" takes frames from each source video
+            in turn, spread evenly over each video's duration.
+        seed: Seed for "shuffled".
+
+    Returns:
+        The reordered list.
+
+    Raises:
+        ValueError: If the order is unknown.
+    """
+    if order not in FRAME_ORDERS:
+        raise ValueError(f"Unknown frame order: {order}")
+    if order == "sorted":
+        return list(work)
+    if order == "shuffled":
+        shuffled = list(work)
+        random.Random(seed).shuffle(shuffled)
+        return shuffled
+
+    # Frames are named <video_id>_frame_<number>.jpg
+    by_video: dict[str, list[tuple[str, int]]] = defaultdict(list)
+    for item in work:
+        by_video[os.path.basename(item[0]).rsplit("_frame_", 1)[0]].append(item)
+
+    spread = [_spread_over_time(by_video[video]) for video in sorted(by_video)]
+    return [
+        item
+        for group in itertools.zip_longest(*spread)
+        for item in group
+        if item is not None
+    ]
+
+
+def _spread_over_time(frames: list) -> list:
+    """Reorder a video's frames by bit-reversed index.
+
+    Every prefix of the result is spread roughly evenly over the video:
+    start, middle, quarters, eighths, and so on.
+    """
+    bits = max(1, (len(frames) - 1).bit_length())
+
+    def bit_reversed(index: int) -> int:
+        return int(format(index, f"0{bits}b")[::-1], 2)
+
+    return [frames[i] for i in sorted(range(len(frames)), key=bit_reversed)]
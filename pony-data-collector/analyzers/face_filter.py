@@ -0,0 +1,138 @@
+"""Local face-presence prefilter for extracted video frames.
+
+Runs OpenCV's bundled Haar cascade frontal-face detector on the CPU and
+drops frames without a reasonably sized face (product close-ups, title
+cards, hands) before they are sent to Gemini.
+"""
+
+import logging
+import os
+from collections import Counter, defaultdict
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CASCADE_FILENAME = "haarcascade_frontalface_default.xml"
+
+
+class FaceFilter:
+    """Detects frontal faces and filters out frames without one.
+
+    A frame passes when its largest detected face is at least
+    min_face_fraction of the frame height. Detection runs on a
+    grayscale copy downscaled to DETECTION_WIDTH pixels wide.
+    """
+
+    DETECTION_WIDTH = 640
+
+    def __init__(self, min_face_fraction: float = 0.12) -> None:
+        """Initialize the face filter.
+
+        Args:
+            min_face_fraction: Minimum face height as a fraction of the
+                frame height for a frame to pass.
+
+        Raises:
+            RuntimeError: If the bundled cascade cannot be loaded.
+        """
+        cascade_path = os.path.join(cv2.data.haarcascades, CASCADE_FILENAME)
+        self._cascade = cv2.CascadeClassifier(cascade_path)
+        if self._cascade.empty():
+            raise RuntimeError(f"Cannot load face cascade: {cascade_path}")
+        self._min_face_fraction = min_face_fraction
+
+    def detect_faces(self, image: np.ndarray) -> list[tuple[int, int, int, int]]:
+        """Detect frontal faces in a BGR image.
+
+        Args:
+            image: BGR image as loaded by cv2.imread.
+
+        Returns:
+            List of (x, y, w, h) face boxes in original image
+            coordinates, largest first.
+        """
+        height, width = image.shape[:2]
+        scale = min(1.0, self.DETECTION_WIDTH / width)
+
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        if scale < 1.0:
+            gray = cv2.resize(
+                gray, (int(width * scale), int(height * scale)),
+                interpolation=cv2.INTER_AREA,
+            )
+        gray = cv2.equalizeHist(gray)
+
+        boxes = self._cascade.detectMultiScale(
+            gray, scaleFactor=1.1, minNeighbors=5, minSize=(24, 24),
+        )
+
+        faces = [
+            (int(x / scale), int(y / scale), int(w / scale), int(h / scale))
+            for x, y, w, h in boxes
+        ]
+        faces.sort(key=lambda box: box[2] * box[3], reverse=True)
+        return faces
+
+    def check_frame(self, image_path: str) -> str | None:
+        """Check whether a frame shows a reasonably sized frontal face.
+
+        Args:
+            image_path: Path to the frame image.
+
+        Returns:
+            None if the frame passes, otherwise the rejection reason:
+            "unreadable", "no_face" or "face_too_small".
+        """
+        image = cv2.imread(image_path)
+        if image is None:
+            return "unreadable"
+
+        faces = self.detect_faces(image)
+        if not faces:
+            return "no_face"
+
+        face_height = faces[0][3]
+        if face_height < self._min_face_fraction * image.shape[0]:
+            return "face_too_small"
+
+        return None
+
+    def filter_frames(self, frame_paths: list[str]) -> list[str]:
+        """Drop frames without a reasonably sized frontal face.
+
+        Rejections are logged per source video, grouped by reason.
+
+        Args:
+            frame_paths: Frame image paths named
+                "<video_id>_frame_<n>.jpg".
+
+        Returns:
+            The frame paths that passed, in their original order.
+        """
+        kept: list[str] = []
+        rejected: dict[str, Counter] = defaultdict(Counter)
+
+        for frame_path in frame_paths:
+            reason = self.check_frame(frame_path)
+            if reason is None:
+                kept.append(frame_path)
+                continue
+
+            video_id = os.path.basename(frame_path).rsplit("_frame_", 1)[0]
+            rejected[video_id][reason] += 1
+            logger.debug("Rejected frame %s: %s", frame_path, reason)
+
+        for video_id, reasons in rejected.items():
+            logger.info(
+                "Face filter rejected %d frames from %s (%s)",
+                sum(reasons.values()),
+                video_id,
+                ", ".join(f"{r}={n}" for r, n in sorted(reasons.items())),
+            )
+
+        logger.info(
+            "Face filter kept %d/%d frames", len(kept), len(frame_paths),
+        )
+        return kept
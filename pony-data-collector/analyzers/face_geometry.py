@@ -0,0 +1,241 @@
+"""Local landmark-based measurement of the geometric facial metrics.
+
+canthal_tilt.angle_degrees, midface_ratio.ratio_percent and
+harmony_index.symmetry_score are geometric quantities, so they are
+measured on the CPU from 68-point facial landmarks instead of being
+estimated by Gemini. Landmarks come from OpenCV's Facemark LBF model,
+which needs opencv-contrib-python and the pretrained lbfmodel.yaml.
+Faces are located with the Haar cascade from FaceFilter.
+
+Landmarks of all frames are stacked and the metrics are computed for
+every frame at once with NumPy.
+"""
+
+import logging
+
+import cv2
+import numpy as np
+
+from analyzers.face_filter import FaceFilter
+
+logger = logging.getLogger(__name__)
+
+# 68-point (iBUG 300-W) landmark indices, "right"/"left" from the
+# subject's point of view
+RIGHT_EYE_OUTER, RIGHT_EYE_INNER = 36, 39
+LEFT_EYE_INNER, LEFT_EYE_OUTER = 42, 45
+RIGHT_EYE = slice(36, 42)
+LEFT_EYE = slice(42, 48)
+BROWS = slice(17, 27)
+NOSE_BASE = 33
+CHIN = 8
+
+# Index of each landmark's mirror counterpart across the facial midline
+MIRROR_INDEX = np.array(
+    list(range(16, -1, -1))              # jaw
+    + list(range(26, 16, -1))            # brows
+    + [27, 28, 29, 30]                   # nose bridge
+    + [35, 34, 33, 32, 31]               # nose base
+    + [45, 44, 43, 42, 47, 46]           # right eye <-> left eye
+    + [39, 38, 37, 36, 41, 40]
+    + [54, 53, 52, 51, 50, 49, 48]       # outer lip
+    + [59, 58, 57, 56, 55]
+    + [64, 63, 62, 61, 60]               # inner lip
+    + [67, 66, 65]
+)
+
+
+class FaceGeometry:
+    """Measures canthal tilt, midface ratio and symmetry from landmarks.
+
+    Angles are measured after removing head roll (the tilt of the line
+    between the eye centers), so a tilted head does not read as a
+    canthal tilt.
+    """
+
+    # Canthal tilt beyond this many degrees is classified positive/negative
+    NEUTRAL_TILT_DEGREES = 2.0
+
+    # Symmetry score lost per unit of mean mirror error, relative to the
+    # inter-ocular distance
+    SYMMETRY_PENALTY = 250.0
+
+    def __init__(
+        self,
+        landmark_model_path: str,
+        face_filter: FaceFilter | None = None,
+    ) -> None:
+        """Load the landmark model.
+
+        Args:
+            landmark_model_path: Path to the Facemark LBF model
+                (lbfmodel.yaml).
+            face_filter: FaceFilter used for face detection. A default
+                one is created if None.
+
+        Raises:
+            RuntimeError: If opencv-contrib is not installed or the
+                model cannot be loaded.
+        """
+        if not hasattr(cv2, "face"):
+            raise RuntimeError(
+                "Facial landmarks need the cv2.face module from "
+                "opencv-contrib-python"
+            )
+
+        self._facemark = cv2.face.createFacemarkLBF()
+        try:
+            self._facemark.loadModel(landmark_model_path)
+        except cv2.error as exc:
+            raise RuntimeError(
+                f"Cannot load landmark model {landmark_model_path}: {exc}"
+            ) from exc
+
+        self._face_filter = face_filter or FaceFilter()
+
+    def landmarks(self, image_path: str) -> np.ndarray | None:
+        """Fit 68 landmarks to the largest face in a frame.
+
+        Args:
+            image_path: Path to the frame image.
+
+        Returns:
+            (68, 2) float array of landmark coordinates, or None if the
+            frame is unreadable or no face is found.
+        """
+        image = cv2.imread(image_path)
+        if image is None:
+            return None
+
+        faces = self._face_filter.detect_faces(image)
+        if not faces:
+            return None
+
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        ok, fitted = self._facemark.fit(gray, np.array([faces[0]], dtype=np.int32))
+        if not ok or not len(fitted):
+            return None
+
+        return fitted[0].reshape(68, 2).astype(np.float64)
+
+    def measure_frames(self, frame_paths: list[str]) -> dict[str, dict]:
+        """Measure the geometric metrics for a list of frames.
+
+        Args:
+            frame_paths: Frame image paths.
+
+        Returns:
+            Dict mapping each frame with a detected face to a dict with
+            angle_degrees, ratio_percent and symmetry_score.
+        """
+        measured_paths: list[str] = []
+        points: list[np.ndarray] = []
+
+        for frame_path in frame_paths:
+            landmarks = self.landmarks(frame_path)
+            if landmarks is not None:
+                measured_paths.append(frame_path)
+                points.append(landmarks)
+
+        logger.info(
+            "Measured face geometry locally in %d/%d frames",
+            len(points), len(frame_paths),
+        )
+        if not points:
+            return {}
+
+        metrics = self.compute_metrics(np.stack(points))
+        return {
+            path: {name: float(values[i]) for name, values in metrics.items()}
+            for i, path in enumerate(measured_paths)
+        }
+
+    @classmethod
+    def compute_metrics(cls, landmarks: np.ndarray) -> dict[str, np.ndarray]:
+        """Compute the geometric metrics for a stack of landmark sets.
+
+        The midface ratio follows the prompt's definition (eye line to
+        base of nose, relative to hairline-to-chin). The hairline is not
+        a landmark, so it is placed one brow-to-nose-base distance above
+        the brows, following the facial thirds.
+
+        Args:
+            landmarks: (N, 68, 2) array of landmark coordinates.
+
+        Returns:
+            Dict of (N,) arrays: angle_degrees, ratio_percent and
+            symmetry_score.
+        """
+        pts = cls._remove_roll(landmarks)
+        x, y = pts[..., 0], pts[..., 1]
+
+        # Canthal tilt: inner-to-outer canthus angle, averaged over both
+        # eyes. Image y grows downwards, so a higher outer corner is positive.
+        right_tilt = np.arctan2(
+            y[:, RIGHT_EYE_INNER] - y[:, RIGHT_EYE_OUTER],
+            np.abs(x[:, RIGHT_EYE_INNER] - x[:, RIGHT_EYE_OUTER]),
+        )
+        left_tilt = np.arctan2(
+            y[:, LEFT_EYE_INNER] - y[:, LEFT_EYE_OUTER],
+            np.abs(x[:, LEFT_EYE_OUTER] - x[:, LEFT_EYE_INNER]),
+        )
+        angle = np.degrees((right_tilt + left_tilt) / 2)
+
+        eye_line = (y[:, RIGHT_EYE].mean(axis=1) + y[:, LEFT_EYE].mean(axis=1)) / 2
+        brow_line = y[:, BROWS].mean(axis=1)
+        nose_base = y[:, NOSE_BASE]
+        chin = y[:, CHIN]
+        face_height = (chin - brow_line) + (nose_base - brow_line)
+        ratio = 100.0 * (nose_base - eye_line) / np.maximum(face_height, 1e-6)
+
+        symmetry = cls._symmetry_scores(pts)
+
+        return {
+            "angle_degrees": angle,
+            "ratio_percent": ratio,
+            "symmetry_score": symmetry,
+        }
+
+    @classmethod
+    def classify_tilt(cls, angle_degrees: float) -> str:
+        """Classify a canthal tilt angle as positive, neutral or negative."""
+        if angle_degrees > cls.NEUTRAL_TILT_DEGREES:
+            return "positive"
+        if angle_degrees < -cls.NEUTRAL_TILT_DEGREES:
+            return "negative"
+        return "neutral"
+
+    @staticmethod
+    def _remove_roll(landmarks: np.ndarray) -> np.ndarray:
+        """Rotate each landmark set so the eye centers are level."""
+        right_center = landmarks[:, RIGHT_EYE].mean(axis=1)
+        left_center = landmarks[:, LEFT_EYE].mean(axis=1)
+        delta = left_center - right_center
+        roll = np.arctan2(delta[:, 1], delta[:, 0])
+
+        cos, sin = np.cos(-roll), np.sin(-roll)
+        rotation = np.stack(
+            [np.stack([cos, -sin], axis=1), np.stack([sin, cos], axis=1)], axis=1,
+        )
+        center = (right_center + left_center)[:, None, :] / 2
+        return np.einsum("nij,nkj->nki", rotation, landmarks - center)
+
+    @classmethod
+    def _symmetry_scores(cls, pts: np.ndarray) -> np.ndarray:
+        """Score left/right symmetry of roll-free landmarks from 0 to 100.
+
+        Each set is mirrored across its vertical midline, and the mean
+        distance between every landmark and its mirrored counterpart is
+        taken relative to the inter-ocular distance.
+        """
+        midline = pts[:, [27, 28, 29, 30, 33, 51, 57, 8], 0].mean(axis=1)
+        mirrored = pts[:, MIRROR_INDEX].copy()
+        mirrored[..., 0] = 2 * midline[:, None] - mirrored[..., 0]
+
+        interocular = np.linalg.norm(
+            pts[:, LEFT_EYE].mean(axis=1) - pts[:, RIGHT_EYE].mean(axis=1), axis=1,
+        )
+        error = np.linalg.norm(pts - mirrored, axis=2).mean(axis=1)
+        error /= np.maximum(interocular, 1e-6)
+
+        return np.clip(100.0 - cls.SYMMETRY_PENALTY * error, 0.0, 100.0)
@@ -0,0 +1,233 @@
+"""Typed records for a single-frame Makeup DNA analysis.
+
+The dataclasses below mirror the JSON structure requested in
+MAKEUP_DNA_PROMPT. They serve as the response schema sent to Gemini and
+as the target of a single validation pass over each reply, so the rest
+of the pipeline works with attributes instead of nested dict lookups.
+
+Missing leaf fields take the same defaults the merge step used to
+substitute. A reply without one of the three top-level sections is
+rejected, since it would otherwise pull the averages towards zero.
+"""
+
+import dataclasses
+import math
+import typing
+from dataclasses import dataclass, field
+
+_SCHEMA_TYPES = {str: "STRING", int: "INTEGER", float: "NUMBER"}
+
+
+@dataclass(slots=True)
+class EyePattern:
+    """Eye makeup style."""
+
+    shape: str = ""
+    liner_style: str = ""
+    shadow_placement: str = ""
+    shadow_tones: list[str] = field(default_factory=list)
+    lash_emphasis: str = ""
+
+
+@dataclass(slots=True)
+class LipPattern:
+    """Lip makeup style."""
+
+    technique: str = ""
+    color_family: str = ""
+    finish: str = ""
+    inner_color_intensity: str = ""
+
+
+@dataclass(slots=True)
+class BasePattern:
+    """Skin and base makeup style."""
+
+    coverage: str = ""
+    finish: str = ""
+    highlight_placement: list[str] = field(default_factory=list)
+    contour_intensity: str = ""
+    blush_style: str = ""
+
+
+@dataclass(slots=True)
+class MakeupAnalysis:
+    """Makeup patterns visible in the frame."""
+
+    eye_pattern: EyePattern = field(default_factory=EyePattern)
+    lip_pattern: LipPattern = field(default_factory=LipPattern)
+    base_pattern: BasePattern = field(default_factory=BasePattern)
+    balance_rule: str = ""
+
+
+@dataclass(slots=True)
+class CanthalTilt:
+    """Eye axis tilt from horizontal."""
+
+    angle_degrees: float = 0.0
+    classification: str = "neutral"
+
+
+@dataclass(slots=True)
+class MidfaceRatio:
+    """Midface length relative to face height."""
+
+    ratio_percent: float = 0.0
+    philtrum_relative: str = "average"
+    youth_score: int = 0
+
+
+@dataclass(slots=True)
+class LuminosityScore:
+    """Skin luminosity and texture."""
+
+    current: int = 0
+    potential_with_kglow: int = 0
+    texture_grade: str = "B"
+
+
+@dataclass(slots=True)
+class HarmonyIndex:
+    """Overall harmony and symmetry of the look."""
+
+    overall: int = 0
+    symmetry_score: int = 0
+    optimal_balance: str = ""
+
+
+@dataclass(slots=True)
+class FiveMetrics:
+    """The five facial metrics estimated from the frame."""
+
+    visual_weight_score: int = 0
+    canthal_tilt: CanthalTilt = field(default_factory=CanthalTilt)
+    midface_ratio: MidfaceRatio = field(default_factory=MidfaceRatio)
+    luminosity_score: LuminosityScore = field(default_factory=LuminosityScore)
+    harmony_index: HarmonyIndex = field(default_factory=HarmonyIndex)
+
+
+@dataclass(slots=True)
+class AdaptationRules:
+    """Melanin-aware adaptation notes per Fitzpatrick range."""
+
+    L1_L2: str = ""
+    L3_L4: str = ""
+    L5_L6: str = ""
+
+
+@dataclass(slots=True)
+class FrameAnalysis:
+    """Complete Makeup DNA analysis of one frame."""
+
+    makeup_analysis: MakeupAnalysis = field(metadata={"required": True})
+    five_metrics: FiveMetrics = field(metadata={"required": True})
+    adaptation_rules: AdaptationRules = field(metadata={"required": True})
+
+    @classmethod
+    def from_dict(cls, data: object) -> "FrameAnalysis":
+        """Validate a parsed JSON object and build the record.
+
+        Numbers given as strings and floats given for integer fields
+        are coerced; values that cannot be coerced are rejected.
+
+        Args:
+            data: Parsed JSON value for one frame.
+
+        Returns:
+            The validated FrameAnalysis.
+
+        Raises:
+            ValueError: If the value does not match the schema.
+        """
+        return _build(cls, data, "analysis")
+
+    def to_dict(self) -> dict:
+        """Return the analysis as plain JSON-serializable dicts."""
+        return dataclasses.asdict(self)
+
+
+def response_schema(frame_count: int = 1) -> dict:
+    """Return the Gemini response schema for one frame or a batch.
+
+    Args:
+        frame_count: Number of frames in the request. Batches use an
+            array of frame objects.
+
+    Returns:
+        Schema dict for the generation config's response_schema.
+    """
+    schema = _schema_for(FrameAnalysis)
+    if frame_count > 1:
+        return {"type": "ARRAY", "items": schema}
+    return schema
+
+
+def _schema_for(tp: type) -> dict:
+    """Build the schema dict for a record class or field type."""
+    if dataclasses.is_dataclass(tp):
+        fields = dataclasses.fields(tp)
+        return {
+            "type": "OBJECT",
+            "properties": {f.name: _schema_for(f.type) for f in fields},
+            "required": [f.name for f in fields],
+        }
+    if typing.get_origin(tp) is list:
+        return {"type": "ARRAY", "items": _schema_for(typing.get_args(tp)[0])}
+    return {"type": _SCHEMA_TYPES[tp]}
+
+
+def _build(cls: type, data: object, path: str):
+    """Validate a dict against a record class, recursing into fields."""
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected an object, got {type(data).__name__}")
+
+    values = {}
+    for f in dataclasses.fields(cls):
+        field_path = f"{path}.{f.name}"
+        value = data.get(f.name)
+
+        if value is None:
+            if f.metadata.get("required"):
+                raise ValueError(f"{field_path}: missing")
+            continue
+
+        values[f.name] = _coerce(f.type, value, field_path)
+
+    return cls(**values)
+
+
+def _coerce(tp: type, value: object, path: str):
+    """Coerce a JSON value to a field type."""
+    if dataclasses.is_dataclass(tp):
+        return _build(tp, value, path)
+
+    if typing.get_origin(tp) is list:
+        # A lone string is treated as a one-item list
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list):
+            raise ValueError(f"{path}: expected a list, got {type(value).__name__}")
+        item_type = typing.get_args(tp)[0]
+        return [
+            _coerce(item_type, item, f"{path}[{i}]")
+            for i, item in enumerate(value)
+            if item is not None
+        ]
+
+    if tp is str:
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+            return str(value)
+        raise ValueError(f"{path}: expected a string, got {type(value).__name__}")
+
+    # int and float fields
+    if isinstance(value, str):
+        try:
+            value = float(value.strip().rstrip("%"))
+        except ValueError:
+            raise ValueError(f"{path}: expected a number, got {value!r}") from None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{path}: expected a number, got {type(value).__name__}")
+    if not math.isfinite(value):
+        raise ValueError(f"{path}: expected a finite number, got {value!r}")
+
+    return round(value) if tp is int else float(value)
@@ -0,0 +1,131 @@
+"""Append-only per-celebrity checkpoint of completed frame analyses.
+
+Every analysis is appended to a JSONL file in the celeb's analyzed
+directory as soon as its API call returns, so a run that dies halfway
+through a celebrity can resume without paying for those calls again.
+Records are keyed by GeminiAnalyzer.cache_key, so a checkpoint is only
+reused for frames whose content, prompt, model and preprocessing are
+unchanged.
+
+Each line is flushed to the OS immediately, which survives a crash of
+the process. fsync, which also survives an OS crash or power loss, is
+batched over several records so it does not slow down analysis.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from analyzers.frame_analysis import FrameAnalysis
+
+logger = logging.getLogger(__name__)
+
+
+class FrameCheckpoint:
+    """JSONL checkpoint of analyses for one celebrity.
+
+    Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fsync_every: int = 16,
+        fsync_interval_seconds: float = 5.0,
+    ) -> None:
+        """Open (or create) the checkpoint file for appending.
+
+        Args:
+            path: Path to the JSONL checkpoint file.
+            fsync_every: Records appended between two fsyncs.
+            fsync_interval_seconds: Maximum time an appended record may
+                go without an fsync, checked on every append.
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._fsync_every = max(1, fsync_every)
+        self._fsync_interval = fsync_interval_seconds
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        # Binary, since a crash mid-write can cut a multibyte character
+        self._file = open(path, "ab+")
+        # A crash mid-write leaves a partial last line; start a new one
+        # so the next record is not glued to it
+        if self._file.tell() > 0:
+            self._file.seek(-1, os.SEEK_END)
+            if self._file.read(1) != b"\n":
+                self._file.write(b"\n")
+                self._file.flush()
+
+    def load(self) -> dict[str, FrameAnalysis]:
+        """Read the analyses recorded so far.
+
+        Lines that cannot be parsed or validated (e.g. a partial line
+        from a crash) are skipped.
+
+        Returns:
+            Dict mapping each record's cache key to its analysis.
+        """
+        completed: dict[str, FrameAnalysis] = {}
+        skipped = 0
+
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line.decode("utf-8"))
+                    completed[record["key"]] = FrameAnalysis.from_dict(record["analysis"])
+                except (ValueError, KeyError, TypeError):
+                    skipped += 1
+
+        if skipped:
+            logger.warning("Skipped %d unreadable checkpoint records in %s", skipped, self.path)
+        return completed
+
+    def append(self, key: str, frame_path: str, analysis: FrameAnalysis) -> None:
+        """Record one completed analysis.
+
+        Args:
+            key: GeminiAnalyzer.cache_key of the frame.
+            frame_path: Path to the frame image, stored for reference.
+            analysis: The frame's analysis.
+        """
+        line = json.dumps(
+            {
+                "key": key,
+                "frame": os.path.basename(frame_path),
+                "analysis": analysis.to_dict(),
+            },
+            ensure_ascii=False,
+        )
+
+        with self._lock:
+            self._file.write((line + "\n").encode("utf-8"))
+            self._file.flush()
+            self._unsynced += 1
+            if (
+                self._unsynced >= self._fsync_every
+                or time.monotonic() - self._last_sync >= self._fsync_interval
+            ):
+                self._sync()
+
+    def close(self) -> None:
+        """Sync outstanding records and close the file."""
+        with self._lock:
+            if self._file.closed:
+                return
+            if self._unsynced:
+                self._sync()
+            self._file.close()
+
+    def _sync(self) -> None:
+        """fsync the file. Caller must hold the lock."""
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
@@ -0,0 +1,180 @@
+"""Perceptual-hash deduplication for extracted video frames.
+
+Computes a 64-bit perceptual hash (aHash, dHash or pHash) for every
+frame and clusters near-duplicates with a BK-tree Hamming-distance
+index. Only one representative per cluster needs to be sent to Gemini;
+the cluster size is kept as a weight for merging the analyses.
+"""
+
+import logging
+import os
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class _BKTree:
+    """BK-tree over integer hashes using Hamming distance.
+
+    Each node stores a hash, the cluster index it represents, and its
+    children keyed by distance to the node hash.
+    """
+
+    def __init__(self) -> None:
+        self._root: tuple[int, int, dict] | None = None
+
+    @staticmethod
+    def distance(a: int, b: int) -> int:
+        """Return the Hamming distance between two hashes."""
+        return (a ^ b).bit_count()
+
+    def add(self, value: int, index: int) -> None:
+        """Insert a hash with its cluster index."""
+        if self._root is None:
+            self._root = (value, index, {})
+            return
+
+        node = self._root
+        while True:
+            dist = self.distance(value, node[0])
+            child = node[2].get(dist)
+            if child is None:
+                node[2][dist] = (value, index, {})
+                return
+            node = child
+
+    def nearest(self, value: int, max_distance: int) -> tuple[int, int] | None:
+        """Find the closest stored hash within max_distance.
+
+        Returns:
+            Tuple of (cluster index, distance), or None if no stored
+            hash is within max_distance.
+        """
+        if self._root is None:
+            return None
+
+        best: tuple[int, int] | None = None
+        stack = [self._root]
+
+        while stack:
+            node_value, node_index, children = stack.pop()
+            dist = self.distance(value, node_value)
+
+            if dist <= max_distance and (best is None or dist < best[1]):
+                best = (node_index, dist)
+
+            low, high = dist - max_distance, dist + max_distance
+            stack.extend(
+                child for d, child in children.items() if low <= d <= high
+            )
+
+        return best
+
+
+class FrameDeduplicator:
+    """Clusters near-duplicate frames by perceptual hash.
+
+    Frames whose hashes lie within max_distance bits of an existing
+    cluster representative join that cluster; otherwise they start a new
+    cluster. Frames are visited in the given order, so the first frame
+    of each cluster becomes its representative.
+    """
+
+    HASH_METHODS = ("ahash", "dhash", "phash")
+
+    def __init__(self, method: str = "dhash", max_distance: int = 6) -> None:
+        """Initialize the deduplicator.
+
+        Args:
+            method: Hash algorithm, one of "ahash", "dhash" or "phash".
+            max_distance: Maximum Hamming distance (out of 64 bits) for
+                two frames to count as duplicates.
+
+        Raises:
+            ValueError: If method is not a supported hash algorithm.
+        """
+        if method not in self.HASH_METHODS:
+            raise ValueError(
+                f"Unknown hash method '{method}', "
+                f"expected one of {self.HASH_METHODS}"
+            )
+        self._method = method
+        self._max_distance = max_distance
+
+    def compute_hash(self, image_path: str) -> int | None:
+        """Compute the 64-bit perceptual hash of an image.
+
+        Args:
+            image_path: Path to the image file.
+
+        Returns:
+            The hash as an integer, or None if the image cannot be read.
+        """
+        image = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            return None
+
+        if self._method == "ahash":
+            small = cv2.resize(image, (8, 8), interpolation=cv2.INTER_AREA)
+            bits = small > small.mean()
+        elif self._method == "dhash":
+            small = cv2.resize(image, (9, 8), interpolation=cv2.INTER_AREA)
+            bits = small[:, 1:] > small[:, :-1]
+        else:
+            small = cv2.resize(image, (32, 32), interpolation=cv2.INTER_AREA)
+            dct = cv2.dct(small.astype(np.float32))[:8, :8]
+            # Skip the DC term so overall brightness does not dominate
+            bits = dct > np.median(dct.flatten()[1:])
+
+        return int.from_bytes(np.packbits(bits.flatten()).tobytes(), "big")
+
+    def deduplicate(self, frame_paths: list[str]) -> list[dict]:
+        """Group frames into clusters of near-duplicates.
+
+        Frames that cannot be read are kept as their own single-frame
+        cluster so the analyzer can still report them.
+
+        Args:
+            frame_paths: Frame image paths, in processing order.
+
+        Returns:
+            List of dicts with keys: representative (path), members
+            (list of paths), weight (number of members).
+        """
+        clusters: list[dict] = []
+        index = _BKTree()
+
+        for frame_path in frame_paths:
+            frame_hash = self.compute_hash(frame_path)
+
+            match = None
+            if frame_hash is not None:
+                match = index.nearest(frame_hash, self._max_distance)
+
+            if match is not None:
+                cluster = clusters[match[0]]
+                cluster["members"].append(frame_path)
+                cluster["weight"] += 1
+                logger.debug(
+                    "Duplicate frame %s -> %s (distance %d)",
+                    os.path.basename(frame_path),
+                    os.path.basename(cluster["representative"]),
+                    match[1],
+                )
+                continue
+
+            if frame_hash is not None:
+                index.add(frame_hash, len(clusters))
+            clusters.append({
+                "representative": frame_path,
+                "members": [frame_path],
+                "weight": 1,
+            })
+
+        logger.info(
+            "Deduplicated %d frames into %d clusters (%s, max distance %d)",
+            len(frame_paths), len(clusters), self._method, self._max_distance,
+        )
+        return clusters
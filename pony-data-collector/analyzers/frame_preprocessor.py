@@ -0,0 +1,114 @@
+"""Frame preprocessing before images are sent to Gemini.
+
+Crops each frame to the detected face region (plus padding) and caps
+the long edge, so the model receives a smaller image with the same
+facial detail. The original frame on disk is never modified.
+"""
+
+import io
+import logging
+
+import numpy as np
+from PIL import Image
+
+from analyzers.face_filter import FaceFilter
+
+logger = logging.getLogger(__name__)
+
+
+class FramePreprocessor:
+    """Crops frames to the face region and caps their resolution.
+
+    If no face is detected, the full frame is used and only the
+    resolution cap is applied.
+    """
+
+    def __init__(
+        self,
+        face_filter: FaceFilter | None = None,
+        padding: float = 0.5,
+        max_long_edge: int = 768,
+    ) -> None:
+        """Initialize the preprocessor.
+
+        Args:
+            face_filter: FaceFilter used for face detection. If None,
+                frames are not cropped, only resized.
+            padding: Padding added on each side of the face box, as a
+                fraction of the box size. Keeps hairline and chin in
+                frame for the proportion metrics.
+            max_long_edge: Maximum width or height in pixels of the
+                image sent to the model.
+        """
+        self._face_filter = face_filter
+        self._padding = padding
+        self._max_long_edge = max_long_edge
+
+    @property
+    def fingerprint(self) -> str:
+        """Short description of the settings that shape the model input.
+
+        Used in analysis cache keys, since different settings send
+        different images for the same frame.
+        """
+        crop = f"face{self._padding}" if self._face_filter is not None else "full"
+        return f"{crop}:{self._max_long_edge}"
+
+    def prepare(self, image_path: str, data: bytes | None = None) -> Image.Image:
+        """Load a frame and return the cropped, resized model input.
+
+        Args:
+            image_path: Path to the frame image.
+            data: Encoded image bytes if already read; otherwise the
+                file at image_path is opened.
+
+        Returns:
+            RGB PIL image ready to send to the model.
+        """
+        with Image.open(io.BytesIO(data) if data is not None else image_path) as source:
+            image = source.convert("RGB")
+
+        original_size = image.size
+
+        if self._face_filter is not None:
+            # FaceFilter expects BGR arrays as produced by cv2.imread
+            bgr = np.ascontiguousarray(np.asarray(image)[:, :, ::-1])
+            faces = self._face_filter.detect_faces(bgr)
+            if faces:
+                image = image.crop(self._crop_box(faces[0], image.size))
+
+        image.thumbnail(
+            (self._max_long_edge, self._max_long_edge), Image.Resampling.LANCZOS,
+        )
+
+        logger.debug(
+            "Prepared %s: %dx%d -> %dx%d",
+            image_path, *original_size, *image.size,
+        )
+        return image
+
+    def _crop_box(
+        self,
+        face: tuple[int, int, int, int],
+        image_size: tuple[int, int],
+    ) -> tuple[int, int, int, int]:
+        """Expand a face box by the padding and clamp it to the image.
+
+        Args:
+            face: (x, y, w, h) face box.
+            image_size: (width, height) of the image.
+
+        Returns:
+            (left, top, right, bottom) crop box.
+        """
+        x, y, w, h = face
+        width, height = image_size
+        pad_x = int(w * self._padding)
+        pad_y = int(h * self._padding)
+
+        return (
+            max(0, x - pad_x),
+            max(0, y - pad_y),
+            min(width, x + w + pad_x),
+            min(height, y + h + pad_y),
+        )
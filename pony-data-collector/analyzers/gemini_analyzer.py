@@ -1,17 +1,27 @@
 """Gemini AI analyzer for extracting Makeup DNA from video frames.
 
 Sends frame images to the Gemini 2.0 Flash model with a comprehensive
-K-beauty analysis prompt. Returns structured JSON with makeup patterns,
-five facial metrics, and melanin-aware adaptation rules.
+K-beauty analysis prompt. Responses are constrained to a JSON schema and
+validated into FrameAnalysis records with makeup patterns, five facial
+metrics, and melanin-aware adaptation rules.
 """
 
+import asyncio
+import hashlib
 import json
 import logging
+import mimetypes
 from pathlib import Path
 
 import google.generativeai as genai
 from PIL import Image
 
+from analyzers.analysis_cache import AnalysisCache
+from analyzers.api_errors import ResponseFormatError, classify_api_error
+from analyzers.frame_analysis import FrameAnalysis, response_schema
+from analyzers.frame_preprocessor import FramePreprocessor
+from analyzers.json_repair import repair_json, strip_fences
+
 logger = logging.getLogger(__name__)
 
 MAKEUP_DNA_PROMPT = """You are a world-class K-beauty makeup analyst and facial metrics expert.
@@ -155,6 +165,26 @@ Return ONLY valid JSON with this exact structure (no markdown code blocks, no ex
 """
 
 
+MAKEUP_DNA_BATCH_PROMPT = MAKEUP_DNA_PROMPT + """
+## Multiple Frames
+
+You are given {frame_count} images, each preceded by a label "Frame 1",
+"Frame 2", and so on. Analyze every frame independently.
+
+Return ONLY a JSON array with exactly {frame_count} objects, one per frame
+in the given order, each with the exact structure shown above.
+"""
+
+
+LOCAL_GEOMETRY_NOTE = """
+## Locally Measured Metrics
+
+canthal_tilt.angle_degrees, midface_ratio.ratio_percent and
+harmony_index.symmetry_score are measured separately from facial landmarks.
+Set them to 0 and spend no effort estimating them.
+"""
+
+
 class GeminiAnalyzer:
     """Analyzes makeup tutorial frames using Google Gemini 2.0 Flash.
 
@@ -165,68 +195,483 @@ class GeminiAnalyzer:
 
     MODEL_NAME = "gemini-2.0-flash"
 
-    def __init__(self, api_key: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        preprocessor: FramePreprocessor | None = None,
+        cache: AnalysisCache | None = None,
+        model=None,
+        local_geometry: bool = False,
+    ) -> None:
         """Initialize the Gemini analyzer.
 
         Args:
             api_key: Google Gemini API key.
+            preprocessor: Optional FramePreprocessor that crops and
+                resizes each frame before it is sent to the model.
+            cache: Optional AnalysisCache. Results are looked up and
+                stored by image content, prompt and model name.
+            model: Optional model client with the same generate_content /
+                generate_content_async interface as
+                genai.GenerativeModel, e.g. a backend from
+                analyzers.model_backends for offline runs. If None, a
+                Gemini client is created from api_key.
+            local_geometry: If True, the prompt tells the model to skip
+                the geometric metrics because they are measured locally
+                (see analyzers.face_geometry).
         """
-        genai.configure(api_key=api_key)
-        self._model = genai.GenerativeModel(self.MODEL_NAME)
+        self._preprocessor = preprocessor
+        self._cache = cache
+        self._prompt_suffix = LOCAL_GEOMETRY_NOTE if local_geometry else ""
+        if model is None:
+            model = self.create_model(api_key)
+        self._model = model
         logger.info("Gemini analyzer initialized with model: %s", self.MODEL_NAME)
 
-    def analyze_frame(self, image_path: str, celeb_name: str) -> dict:
+    @classmethod
+    def create_model(cls, api_key: str) -> "genai.GenerativeModel":
+        """Create the Gemini client used when no model is injected.
+
+        Args:
+            api_key: Google Gemini API key.
+        """
+        genai.configure(api_key=api_key)
+        return genai.GenerativeModel(cls.MODEL_NAME)
+
+    def cache_key(
+        self,
+        image_path: str,
+        celeb_name: str,
+        data: bytes | None = None,
+    ) -> str:
+        """Build the analysis cache key for a frame.
+
+        Hashes the image bytes, the formatted prompt, the model name and
+        the preprocessing settings, so any change to what would be sent
+        to the model produces a different key. Offline backends add
+        their cache_namespace so their results are kept apart.
+
+        The key always uses the single-frame prompt, including for
+        results of analyze_batch. A frame's result therefore does not
+        depend on whether it was analyzed alone or in a batch, or on the
+        other frames of the batch, even though the model saw a different
+        request. This is deliberate: the batch prompt is the single-frame
+        prompt plus instructions for the JSON array, and keying by the
+        whole batch would make cached and checkpointed results unusable
+        whenever batch size or frame order changes.
+
+        Args:
+            image_path: Path to the frame image.
+            celeb_name: Name of the celebrity in the frame.
+            data: Image bytes if already read, to avoid reading the
+                file again.
+
+        Returns:
+            Hex SHA-256 digest.
+        """
+        if data is None:
+            data = Path(image_path).read_bytes()
+
+        digest = hashlib.sha256()
+        digest.update(data)
+        digest.update(b"\0")
+        digest.update(self._prompt(celeb_name).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(self.MODEL_NAME.encode("utf-8"))
+        namespace = getattr(self._model, "cache_namespace", None)
+        if namespace:
+            digest.update(b"\0")
+            digest.update(namespace.encode("utf-8"))
+        if self._preprocessor is not None:
+            digest.update(b"\0")
+            digest.update(self._preprocessor.fingerprint.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_cached(self, image_path: str, celeb_name: str) -> FrameAnalysis | None:
+        """Return the cached analysis for a frame without calling the API.
+
+        Args:
+            image_path: Path to the frame image.
+            celeb_name: Name of the celebrity in the frame.
+
+        Returns:
+            The cached analysis, or None if there is no cache, the frame
+            is missing, or the frame was not analyzed before.
+        """
+        if self._cache is None or not Path(image_path).exists():
+            return None
+
+        cached = self._cache.get(self.cache_key(image_path, celeb_name))
+        if cached is None:
+            return None
+
+        try:
+            analysis = FrameAnalysis.from_dict(cached)
+        except ValueError as exc:
+            logger.warning("Ignoring invalid cached analysis for %s: %s", image_path, exc)
+            return None
+
+        logger.info("Cache hit for frame: %s", image_path)
+        return analysis
+
+    def analyze_frame(
+        self,
+        image_path: str,
+        celeb_name: str,
+        check_cache: bool = True,
+    ) -> FrameAnalysis:
         """Analyze a single frame image for Makeup DNA.
 
+        Successful results are stored in the analysis cache, if any.
+
         Args:
             image_path: Path to the JPEG frame image.
             celeb_name: Name of the celebrity in the frame.
+            check_cache: If False, skip the cache lookup (e.g. because
+                the caller already checked with get_cached).
 
         Returns:
-            Parsed JSON dict with makeup_analysis, five_metrics,
+            Validated FrameAnalysis with makeup_analysis, five_metrics,
             and adaptation_rules.
 
         Raises:
             FileNotFoundError: If the image file does not exist.
-            RuntimeError: If Gemini API call or JSON parsing fails.
+            TransientAPIError: If the call failed in a retryable way;
+                QuotaExceededError for rate-limit and quota errors.
+            PermanentAPIError: If the call failed in any other way.
+            ResponseFormatError: If the response cannot be parsed and
+                validated.
         """
         if not Path(image_path).exists():
             raise FileNotFoundError(f"Image not found: {image_path}")
 
+        if check_cache:
+            cached = self.get_cached(image_path, celeb_name)
+            if cached is not None:
+                return cached
+
+        logger.info("Analyzing frame: %s (celeb: %s)", image_path, celeb_name)
+
+        contents, cache_key = self._frame_contents(image_path, celeb_name)
+
+        try:
+            response = self._model.generate_content(
+                contents, generation_config=self._generation_config(1),
+            )
+        except Exception as exc:
+            raise classify_api_error(exc, image_path) from exc
+
+        return self._finish_frame(image_path, cache_key, response.text)
+
+    async def analyze_frame_async(
+        self,
+        image_path: str,
+        celeb_name: str,
+        check_cache: bool = True,
+    ) -> FrameAnalysis:
+        """Async variant of analyze_frame using generate_content_async.
+
+        Image loading runs in a worker thread so it does not block the
+        event loop while other requests are in flight.
+
+        Raises:
+            FileNotFoundError: If the image file does not exist.
+            TransientAPIError: If the call failed in a retryable way;
+                QuotaExceededError for rate-limit and quota errors.
+            PermanentAPIError: If the call failed in any other way.
+            ResponseFormatError: If the response cannot be parsed and
+                validated.
+        """
+        if not Path(image_path).exists():
+            raise FileNotFoundError(f"Image not found: {image_path}")
+
+        if check_cache:
+            cached = self.get_cached(image_path, celeb_name)
+            if cached is not None:
+                return cached
+
         logger.info("Analyzing frame: %s (celeb: %s)", image_path, celeb_name)
 
-        image = Image.open(image_path)
-        prompt = MAKEUP_DNA_PROMPT.format(celeb_name=celeb_name)
+        contents, cache_key = await asyncio.to_thread(
+            self._frame_contents, image_path, celeb_name,
+        )
 
         try:
-            response = self._model.generate_content([prompt, image])
+            response = await self._model.generate_content_async(
+                contents, generation_config=self._generation_config(1),
+            )
         except Exception as exc:
-            raise RuntimeError(
-                f"Gemini API call failed for {image_path}: {exc}"
-            ) from exc
-
-        raw_text = response.text.strip()
-
-        # Strip markdown code fences if present
-        if raw_text.startswith("```"):
-            lines = raw_text.split("\n")
-            # Remove first line (```json) and last line (```)
-            lines = [
-                line for line in lines
-                if not line.strip().startswith("```")
-            ]
-            raw_text = "\n".join(lines)
+            raise classify_api_error(exc, image_path) from exc
+
+        return self._finish_frame(image_path, cache_key, response.text)
+
+    def analyze_batch(
+        self,
+        image_paths: list[str],
+        celeb_name: str,
+    ) -> list[FrameAnalysis]:
+        """Analyze several frames with a single Gemini request.
+
+        Sends all images, each labelled with its position, together with
+        one copy of the prompt and asks for a JSON array of per-frame
+        results. Each result is stored in the analysis cache under the
+        same key analyze_frame would use (see cache_key for why). Callers
+        should fall back to analyze_frame per image when this raises
+        ResponseFormatError.
+
+        Args:
+            image_paths: Paths to the JPEG frame images.
+            celeb_name: Name of the celebrity in the frames.
+
+        Returns:
+            One FrameAnalysis per image, in the order of image_paths.
+
+        Raises:
+            FileNotFoundError: If an image file does not exist.
+            TransientAPIError: If the call failed in a retryable way;
+                QuotaExceededError for rate-limit and quota errors.
+            PermanentAPIError: If the call failed in any other way.
+            ResponseFormatError: If the response is not a JSON array of
+                one valid analysis per image.
+        """
+        label = self._batch_label(image_paths)
+        logger.info("Analyzing %s (celeb: %s)", label, celeb_name)
+
+        contents, cache_keys = self._batch_contents(image_paths, celeb_name)
 
         try:
-            analysis = json.loads(raw_text)
+            response = self._model.generate_content(
+                contents, generation_config=self._generation_config(len(image_paths)),
+            )
+        except Exception as exc:
+            raise classify_api_error(exc, label) from exc
+
+        return self._finish_batch(image_paths, cache_keys, response.text)
+
+    async def analyze_batch_async(
+        self,
+        image_paths: list[str],
+        celeb_name: str,
+    ) -> list[FrameAnalysis]:
+        """Async variant of analyze_batch using generate_content_async.
+
+        Raises:
+            FileNotFoundError: If an image file does not exist.
+            TransientAPIError: If the call failed in a retryable way;
+                QuotaExceededError for rate-limit and quota errors.
+            PermanentAPIError: If the call failed in any other way.
+            ResponseFormatError: If the response is not a JSON array of
+                one valid analysis per image.
+        """
+        label = self._batch_label(image_paths)
+        logger.info("Analyzing %s (celeb: %s)", label, celeb_name)
+
+        contents, cache_keys = await asyncio.to_thread(
+            self._batch_contents, image_paths, celeb_name,
+        )
+
+        try:
+            response = await self._model.generate_content_async(
+                contents, generation_config=self._generation_config(len(image_paths)),
+            )
+        except Exception as exc:
+            raise classify_api_error(exc, label) from exc
+
+        return self._finish_batch(image_paths, cache_keys, response.text)
+
+    def _prompt(self, celeb_name: str, frame_count: int = 1) -> str:
+        """Format the single-frame or batch prompt for a celebrity."""
+        if frame_count > 1:
+            prompt = MAKEUP_DNA_BATCH_PROMPT.format(
+                celeb_name=celeb_name, frame_count=frame_count,
+            )
+        else:
+            prompt = MAKEUP_DNA_PROMPT.format(celeb_name=celeb_name)
+        return prompt + self._prompt_suffix
+
+    def _frame_contents(
+        self,
+        image_path: str,
+        celeb_name: str,
+    ) -> tuple[list, str | None]:
+        """Build the request contents for a single frame.
+
+        Returns:
+            The request contents and the frame's cache key (None when
+            no cache is configured).
+        """
+        image_part, cache_key = self._image_part(image_path, celeb_name)
+        return [self._prompt(celeb_name), image_part], cache_key
+
+    def _finish_frame(
+        self,
+        image_path: str,
+        cache_key: str | None,
+        raw_text: str,
+    ) -> FrameAnalysis:
+        """Parse and validate a single-frame response and cache it.
+
+        Raises:
+            ResponseFormatError: If the response is not a valid analysis.
+        """
+        analysis = self._validate(self._parse_json(raw_text, image_path), image_path)
+
+        if self._cache is not None and cache_key is not None:
+            self._cache.put(cache_key, analysis.to_dict())
+
+        logger.info("Successfully analyzed frame: %s", image_path)
+        return analysis
+
+    @staticmethod
+    def _batch_label(image_paths: list[str]) -> str:
+        """Describe a batch request for logs and errors."""
+        return f"batch of {len(image_paths)} frames from {image_paths[0]}"
+
+    def _batch_contents(
+        self,
+        image_paths: list[str],
+        celeb_name: str,
+    ) -> tuple[list, list[str | None]]:
+        """Build the request contents for a batch of labelled frames.
+
+        Returns:
+            The request contents and one cache key per frame.
+
+        Raises:
+            FileNotFoundError: If an image file does not exist.
+        """
+        for image_path in image_paths:
+            if not Path(image_path).exists():
+                raise FileNotFoundError(f"Image not found: {image_path}")
+
+        contents: list = [self._prompt(celeb_name, frame_count=len(image_paths))]
+        cache_keys: list[str | None] = []
+        for i, image_path in enumerate(image_paths):
+            image_part, cache_key = self._image_part(image_path, celeb_name)
+            contents.append(f"Frame {i + 1}:")
+            contents.append(image_part)
+            cache_keys.append(cache_key)
+        return contents, cache_keys
+
+    def _finish_batch(
+        self,
+        image_paths: list[str],
+        cache_keys: list[str | None],
+        raw_text: str,
+    ) -> list[FrameAnalysis]:
+        """Parse and validate a batch response and cache each result.
+
+        Raises:
+            ResponseFormatError: If the response is not a JSON array of one
+                valid analysis per image.
+        """
+        label = self._batch_label(image_paths)
+        parsed = self._parse_json(raw_text, label)
+
+        if not isinstance(parsed, list) or len(parsed) != len(image_paths):
+            raise ResponseFormatError(
+                f"Expected a JSON array of {len(image_paths)} objects for {label}"
+            )
+
+        analyses = [
+            self._validate(item, image_path)
+            for item, image_path in zip(parsed, image_paths)
+        ]
+
+        if self._cache is not None:
+            for cache_key, analysis in zip(cache_keys, analyses):
+                if cache_key is not None:
+                    self._cache.put(cache_key, analysis.to_dict())
+
+        logger.info("Successfully analyzed %s", label)
+        return analyses
+
+    def _image_part(
+        self,
+        image_path: str,
+        celeb_name: str,
+    ) -> tuple[dict | Image.Image, str | None]:
+        """Read a frame once and turn it into a request part.
+
+        Without a preprocessor the encoded file bytes are passed through
+        as an inline blob, so the image is never decoded and re-encoded
+        on our side. PIL is only used when the preprocessor has to crop
+        or resize.
+
+        Returns:
+            The image part and the frame's cache key (None when no cache
+            is configured), both derived from the same read.
+        """
+        data = Path(image_path).read_bytes()
+        cache_key = (
+            self.cache_key(image_path, celeb_name, data)
+            if self._cache is not None else None
+        )
+
+        if self._preprocessor is not None:
+            return self._preprocessor.prepare(image_path, data), cache_key
+
+        mime_type = mimetypes.guess_type(image_path)[0] or "image/jpeg"
+        return {"mime_type": mime_type, "data": data}, cache_key
+
+    @staticmethod
+    def _generation_config(frame_count: int) -> dict:
+        """Return the generation config constraining the response format.
+
+        Args:
+            frame_count: Number of frames in the request.
+        """
+        return {
+            "response_mime_type": "application/json",
+            "response_schema": response_schema(frame_count),
+        }
+
+    @staticmethod
+    def _parse_json(raw_text: str, label: str):
+        """Parse a model response as JSON, repairing it if necessary.
+
+        Schema-constrained responses normally parse directly. If not,
+        the text goes through repair_json once (fences, trailing commas,
+        truncation, ...) before the response is given up on.
+
+        Args:
+            raw_text: Response text from the model.
+            label: Description of the request, used in errors and logs.
+
+        Returns:
+            The parsed JSON value.
+
+        Raises:
+            ResponseFormatError: If the text is not valid JSON even after
+                repair.
+        """
+        try:
+            return json.loads(strip_fences(raw_text))
         except json.JSONDecodeError as exc:
+            error = exc
+
+        try:
+            parsed = json.loads(repair_json(raw_text))
+        except Exception:
+            # Repair is best effort; any failure in it means the
+            # response is unusable, not that the run should stop
             logger.error(
                 "Failed to parse Gemini response as JSON for %s: %s\nRaw: %s",
-                image_path, exc, raw_text[:500],
+                label, error, raw_text[:500],
             )
-            raise RuntimeError(
-                f"JSON parse error for {image_path}: {exc}"
-            ) from exc
+            raise ResponseFormatError(f"JSON parse error for {label}: {error}") from error
 
-        logger.info("Successfully analyzed frame: %s", image_path)
-        return analysis
+        logger.warning("Repaired malformed JSON response for %s (%s)", label, error)
+        return parsed
+
+    @staticmethod
+    def _validate(data: object, label: str) -> FrameAnalysis:
+        """Validate parsed JSON into a FrameAnalysis.
+
+        Raises:
+            ResponseFormatError: If the value does not match the schema.
+        """
+        try:
+            return FrameAnalysis.from_dict(data)
+        except ValueError as exc:
+            raise ResponseFormatError(f"Invalid analysis for {label}: {exc}") from exc
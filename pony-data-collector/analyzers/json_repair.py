@@ -0,0 +1,187 @@
+"""Best-effort repair of near-valid JSON in model responses.
+
+Covers the usual ways an otherwise good reply fails json.loads:
+markdown fences or prose around the JSON, trailing or missing commas
+between members and elements, typographic quotes used as delimiters,
+Python literals (True/False/None), raw newlines inside strings, and
+output truncated before the closing brackets. Truncated output keeps a cut-off string value but drops a
+trailing member or element that is otherwise incomplete (a dangling
+key, a partial number or literal). Anything beyond that is left for
+the caller to reject.
+"""
+
+import json
+import re
+
+_FENCE_LINE = re.compile(r"^\s*```.*$", re.MULTILINE)
+
+_OPEN_QUOTES = {'"': '"', "“": "”", "”": "”"}
+
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+# Bare words (any script) and number-like tokens outside strings
+_WORD = re.compile(r"\w+")
+_NUMBER = re.compile(r"[-+0-9.eE]+")
+
+
+def strip_fences(text: str) -> str:
+    """Remove markdown code fence lines from a response."""
+    return _FENCE_LINE.sub("", text).strip()
+
+
+def repair_json(text: str) -> str:
+    """Rewrite near-valid JSON text so that json.loads can parse it.
+
+    Only the first top-level object or array is kept; text before and
+    after it is dropped.
+
+    Args:
+        text: Raw model response.
+
+    Returns:
+        The repaired JSON text. It is not guaranteed to parse.
+    """
+    text = strip_fences(text)
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        return text
+    text = text[min(starts):]
+
+    out: list[str] = []
+    closers: list[str] = []
+    # (len(out) after the token, token) for the structural tokens of the
+    # open containers; a closed container collapses to its closer
+    marks: list[tuple[int, str]] = []
+    close_quote = ""
+    escaped = False
+    # Whether the last token completed a value, so that a new value
+    # starting next is missing its separating comma
+    value_done = False
+    i = 0
+
+    def start_value() -> None:
+        nonlocal value_done
+        if value_done and closers:
+            out.append(",")
+            marks.append((len(out), ","))
+        value_done = False
+
+    while i < len(text):
+        ch = text[i]
+
+        if close_quote:
+            if escaped:
+                escaped = False
+                out.append(ch)
+            elif ch == "\\":
+                escaped = True
+                out.append(ch)
+            elif ch == close_quote or (ch == '"' and close_quote != '"'):
+                close_quote = ""
+                value_done = True
+                out.append('"')
+            elif ch == '"':
+                out.append('\\"')
+            elif ch == "\n":
+                out.append("\\n")
+            else:
+                out.append(ch)
+            i += 1
+            continue
+
+        if ch in _OPEN_QUOTES:
+            start_value()
+            close_quote = _OPEN_QUOTES[ch]
+            out.append('"')
+        elif ch in "{[":
+            start_value()
+            closers.append("}" if ch == "{" else "]")
+            out.append(ch)
+            marks.append((len(out), ch))
+        elif ch in "}]":
+            # Stray closers that do not match the open bracket are dropped
+            if closers and closers[-1] == ch:
+                _drop_trailing_comma(out)
+                closers.pop()
+                out.append(ch)
+                while marks.pop()[1] not in "{[":
+                    pass
+                marks.append((len(out), ch))
+                value_done = True
+                if not closers:
+                    break
+        elif ch in ",:" and closers:
+            out.append(ch)
+            marks.append((len(out), ch))
+            value_done = False
+        elif ch.isalpha() or ch in "-0123456789":
+            token = (_WORD if ch.isalpha() else _NUMBER).match(text, i).group(0)
+            start_value()
+            out.append(_PYTHON_LITERALS.get(token, token))
+            value_done = True
+            i += len(token)
+            continue
+        else:
+            out.append(ch)
+        i += 1
+
+    if closers:
+        # Truncated output: close the open string and brackets
+        if close_quote:
+            if escaped:
+                out.pop()
+            out.append('"')
+        _drop_incomplete_tail(out, marks, closers[-1])
+        _drop_trailing_comma(out)
+        if "".join(out).rstrip().endswith(":"):
+            out.append(" null")
+        out.extend(reversed(closers))
+
+    return "".join(out)
+
+
+def _drop_trailing_comma(out: list[str]) -> None:
+    """Remove a trailing comma (and whitespace after it) from the output."""
+    j = len(out) - 1
+    while j >= 0 and out[j].isspace():
+        j -= 1
+    if j >= 0 and out[j] == ",":
+        del out[j:]
+
+
+def _drop_incomplete_tail(
+    out: list[str],
+    marks: list[tuple[int, str]],
+    closer: str,
+) -> None:
+    """Roll truncated output back to its last complete member or element.
+
+    Args:
+        out: Output tokens, ending inside the innermost open container.
+        marks: Structural marks of the open containers (see repair_json).
+        closer: Closer of the innermost open container.
+    """
+    end, token = marks[-1]
+    tail = "".join(out[end:]).strip()
+    if not tail:
+        return
+
+    if token in "}]":
+        # Junk after a complete nested value
+        del out[end:]
+        return
+
+    # After "{" or "," in an object the tail is a key without its value
+    is_value = token == ":" or closer == "]"
+    if is_value:
+        try:
+            json.loads(tail)
+            return
+        except json.JSONDecodeError:
+            pass
+
+    if token == ":":
+        # Drop the key along with its value
+        marks.pop()
+        end = marks[-1][0]
+    del out[end:]
@@ -0,0 +1,340 @@
+"""Offline model backends for GeminiAnalyzer.
+
+GeminiAnalyzer talks to any object with generate_content and
+generate_content_async methods (the genai.GenerativeModel interface).
+This module provides drop-in backends that need no network or quota:
+
+- FakeGeminiModel returns schema-valid synthetic analyses and can
+  inject latency, 429 quota errors and malformed JSON, deterministically
+  per request, for benchmarking rate limiting, concurrency and caching.
+- RecordingModel wraps a real model and saves every response to disk.
+- ReplayModel serves those recorded responses again.
+
+Requests are identified by a digest of their contents (prompt text and
+image bytes), so recordings stay valid across runs with the same frames
+and settings. The fake and replay backends set a cache_namespace, which
+GeminiAnalyzer adds to its cache keys so offline results never mix with
+real analyses in the cache.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+class FakeResponse:
+    """Minimal stand-in for a genai response; only .text is used."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class FakeQuotaError(Exception):
+    """Simulated 429 RESOURCE_EXHAUSTED error."""
+
+    code = 429
+
+
+def request_digest(contents: list) -> str:
+    """Return a stable hex digest identifying a request.
+
+    Args:
+        contents: Request contents as built by GeminiAnalyzer: prompt
+            strings, inline image blobs and/or PIL images.
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    for part in contents:
+        if isinstance(part, str):
+            digest.update(part.encode("utf-8"))
+        elif isinstance(part, dict):
+            digest.update(part["data"])
+        elif isinstance(part, Image.Image):
+            digest.update(part.tobytes())
+        else:
+            digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _image_count(contents: list) -> int:
+    """Count the image parts of a request."""
+    return sum(1 for part in contents if not isinstance(part, str))
+
+
+class FakeGeminiModel:
+    """Deterministic local fake of genai.GenerativeModel.
+
+    Every response, error and delay is derived from the seed, the
+    request digest and how often that request was seen before, so a run
+    behaves the same regardless of the order in which concurrent
+    requests arrive, and a retried request can succeed after a 429.
+    """
+
+    CHOICES = {
+        "shape": ["cat_eye", "puppy_eye", "smoky", "gradient", "natural"],
+        "liner_style": ["sharp_wing", "soft_wing", "tight_line", "none"],
+        "shadow_placement": ["lid_only", "crease_blend", "outer_v", "halo"],
+        "shadow_tones": ["warm brown", "copper shimmer", "peach", "taupe", "rose"],
+        "lash_emphasis": ["natural", "dramatic", "wispy", "volumized"],
+        "technique": ["gradient_lip", "full_lip", "blotted", "ombre"],
+        "color_family": ["MLBB", "red", "coral", "berry", "nude", "pink"],
+        "lip_finish": ["matte", "glossy", "velvet", "satin"],
+        "intensity": ["soft", "medium", "bold"],
+        "coverage": ["sheer", "light", "medium", "full"],
+        "base_finish": ["matte", "dewy", "glass_skin", "satin"],
+        "highlight_placement": ["cheekbone", "nose_bridge", "brow_bone", "cupids_bow"],
+        "contour_intensity": ["none", "subtle", "moderate", "sculpted"],
+        "blush_style": ["apple_cheek", "draping", "sunkissed", "igari", "none"],
+        "classification": ["positive", "neutral", "negative"],
+        "philtrum_relative": ["short", "average", "long"],
+        "texture_grade": ["A+", "A", "B+", "B", "C+"],
+    }
+
+    def __init__(
+        self,
+        seed: int = 0,
+        latency_seconds: float = 0.0,
+        latency_jitter: float = 0.2,
+        quota_error_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        retry_after_seconds: float = 2.0,
+    ) -> None:
+        """Initialize the fake model.
+
+        Args:
+            seed: Seed for all generated values.
+            latency_seconds: Mean simulated latency per request.
+            latency_jitter: Latency varies uniformly by this fraction
+                around the mean.
+            quota_error_rate: Probability that an attempt raises a
+                simulated 429 error.
+            malformed_rate: Probability that a response is truncated
+                JSON.
+            retry_after_seconds: Retry hint included in 429 messages.
+        """
+        self._seed = seed
+        self.cache_namespace = f"fake:{seed}"
+        self._latency = latency_seconds
+        self._jitter = latency_jitter
+        self._quota_error_rate = quota_error_rate
+        self._malformed_rate = malformed_rate
+        self._retry_after = retry_after_seconds
+        self._attempts: Counter = Counter()
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def generate_content(self, contents: list, **kwargs) -> FakeResponse:
+        """Return a synthetic response after the simulated latency.
+
+        Raises:
+            FakeQuotaError: For the configured share of attempts.
+        """
+        rng, delay = self._start(contents)
+        time.sleep(delay)
+        return self._respond(rng, contents)
+
+    async def generate_content_async(self, contents: list, **kwargs) -> FakeResponse:
+        """Async variant of generate_content."""
+        rng, delay = self._start(contents)
+        await asyncio.sleep(delay)
+        return self._respond(rng, contents)
+
+    def _start(self, contents: list) -> tuple[random.Random, float]:
+        """Derive the RNG for this attempt and its simulated latency."""
+        digest = request_digest(contents)
+        with self._lock:
+            attempt = self._attempts[digest]
+            self._attempts[digest] += 1
+            self.calls += 1
+
+        rng = random.Random(f"{self._seed}:{digest}:{attempt}")
+        delay = self._latency * (1 + rng.uniform(-self._jitter, self._jitter))
+        return rng, max(0.0, delay)
+
+    def _respond(self, rng: random.Random, contents: list) -> FakeResponse:
+        """Build the response, or raise a simulated quota error."""
+        if rng.random() < self._quota_error_rate:
+            raise FakeQuotaError(
+                "429 Resource has been exhausted (e.g. check quota). "
+                f"Please retry in {self._retry_after:.1f}s."
+            )
+
+        frame_count = _image_count(contents)
+        analyses = [self._analysis(rng) for _ in range(frame_count)]
+        text = json.dumps(analyses if frame_count > 1 else analyses[0])
+
+        if rng.random() < self._malformed_rate:
+            text = text[:rng.randint(len(text) // 2, len(text) - 1)]
+
+        return FakeResponse(text)
+
+    def _analysis(self, rng: random.Random) -> dict:
+        """Generate one schema-valid frame analysis."""
+
+        def pick(key: str) -> str:
+            return rng.choice(self.CHOICES[key])
+
+        def sample(key: str, k: int) -> list[str]:
+            return rng.sample(self.CHOICES[key], k)
+
+        return {
+            "makeup_analysis": {
+                "eye_pattern": {
+                    "shape": pick("shape"),
+                    "liner_style": pick("liner_style"),
+                    "shadow_placement": pick("shadow_placement"),
+                    "shadow_tones": sample("shadow_tones", 2),
+                    "lash_emphasis": pick("lash_emphasis"),
+                },
+                "lip_pattern": {
+                    "technique": pick("technique"),
+                    "color_family": pick("color_family"),
+                    "finish": pick("lip_finish"),
+                    "inner_color_intensity": pick("intensity"),
+                },
+                "base_pattern": {
+                    "coverage": pick("coverage"),
+                    "finish": pick("base_finish"),
+                    "highlight_placement": sample("highlight_placement", 2),
+                    "contour_intensity": pick("contour_intensity"),
+                    "blush_style": pick("blush_style"),
+                },
+                "balance_rule": f"{pick('shape')} eye balanced with {pick('technique')}",
+            },
+            "five_metrics": {
+                "visual_weight_score": rng.randint(20, 90),
+                "canthal_tilt": {
+                    "angle_degrees": round(rng.uniform(-4.0, 9.0), 1),
+                    "classification": pick("classification"),
+                },
+                "midface_ratio": {
+                    "ratio_percent": round(rng.uniform(28.0, 38.0), 1),
+                    "philtrum_relative": pick("philtrum_relative"),
+                    "youth_score": rng.randint(50, 95),
+                },
+                "luminosity_score": {
+                    "current": rng.randint(40, 90),
+                    "potential_with_kglow": rng.randint(70, 98),
+                    "texture_grade": pick("texture_grade"),
+                },
+                "harmony_index": {
+                    "overall": rng.randint(50, 95),
+                    "symmetry_score": rng.randint(60, 98),
+                    "optimal_balance": "Soft gradient balances the eye",
+                },
+            },
+            "adaptation_rules": {
+                "L1_L2": "Use sheerer pigments and cool-toned highlight.",
+                "L3_L4": "Deepen shadow one shade and blend wider.",
+                "L5_L6": "Increase pigment payoff and use golden highlight.",
+            },
+        }
+
+
+class RecordingModel:
+    """Wraps a model and saves every response text to a directory."""
+
+    def __init__(self, model, record_dir: str) -> None:
+        """Initialize the recorder.
+
+        Args:
+            model: Model client to forward requests to.
+            record_dir: Directory for recorded responses, one JSON file
+                per request digest.
+        """
+        self._model = model
+        self._record_dir = record_dir
+        os.makedirs(record_dir, exist_ok=True)
+
+    def generate_content(self, contents: list, **kwargs):
+        """Forward the request and record the response."""
+        response = self._model.generate_content(contents, **kwargs)
+        self._save(contents, response.text)
+        return response
+
+    async def generate_content_async(self, contents: list, **kwargs):
+        """Async variant of generate_content."""
+        response = await self._model.generate_content_async(contents, **kwargs)
+        self._save(contents, response.text)
+        return response
+
+    def _save(self, contents: list, text: str) -> None:
+        """Write a response to <record_dir>/<digest>.json."""
+        path = os.path.join(self._record_dir, f"{request_digest(contents)}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"frame_count": _image_count(contents), "text": text},
+                f, ensure_ascii=False,
+            )
+        os.replace(tmp_path, path)
+        logger.debug("Recorded response %s", path)
+
+
+class ReplayModel:
+    """Serves responses recorded by RecordingModel."""
+
+    def __init__(
+        self,
+        record_dir: str,
+        latency_seconds: float = 0.0,
+        fallback=None,
+    ) -> None:
+        """Initialize the replayer.
+
+        Args:
+            record_dir: Directory written by RecordingModel.
+            latency_seconds: Simulated latency per request.
+            fallback: Optional model used for requests that were not
+                recorded, e.g. a FakeGeminiModel.
+        """
+        self._record_dir = record_dir
+        self._latency = latency_seconds
+        self._fallback = fallback
+        self.cache_namespace = f"replay:{os.path.abspath(record_dir)}"
+
+    def generate_content(self, contents: list, **kwargs):
+        """Return the recorded response for a request.
+
+        Raises:
+            FileNotFoundError: If the request was not recorded and no
+                fallback is configured.
+        """
+        time.sleep(self._latency)
+        response = self._load(contents)
+        if response is None:
+            return self._fallback.generate_content(contents, **kwargs)
+        return response
+
+    async def generate_content_async(self, contents: list, **kwargs):
+        """Async variant of generate_content."""
+        await asyncio.sleep(self._latency)
+        response = self._load(contents)
+        if response is None:
+            return await self._fallback.generate_content_async(contents, **kwargs)
+        return response
+
+    def _load(self, contents: list) -> FakeResponse | None:
+        """Read a recorded response, or None if it may use the fallback."""
+        path = os.path.join(self._record_dir, f"{request_digest(contents)}.json")
+        if not os.path.exists(path):
+            if self._fallback is None:
+                raise FileNotFoundError(f"No recorded response at {path}")
+            logger.debug("No recorded response at %s, using fallback", path)
+            return None
+
+        with open(path, encoding="utf-8") as f:
+            return FakeResponse(json.load(f)["text"])
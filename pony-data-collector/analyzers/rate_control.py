@@ -0,0 +1,140 @@
+"""Adaptive AIMD control of the Gemini request rate.
+
+Adjusts a RateLimiter's rate from observed API responses, the way TCP
+congestion control does: the rate grows additively while calls succeed
+and is cut multiplicatively on 429/5xx errors, within fixed bounds.
+The rate is stored in the limiter's bucket, so processes sharing a
+bucket adjust one common rate. Every change is recorded so the
+trajectory can be used to pick the static rate that matches the
+account's quota tier.
+"""
+
+import logging
+import threading
+import time
+
+from analyzers.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Smallest cut, in requests per minute, recorded as a decrease. Near
+# min_rate an error only undoes the last few additive increases.
+MIN_RECORDED_DECREASE = 0.5
+
+
+class AimdRateController:
+    """Additive-increase / multiplicative-decrease rate controller.
+
+    Thread-safe. The rate is written to the limiter's bucket and takes
+    effect from the next reservation of every process sharing it.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: RateLimiter,
+        min_rate: float = 5.0,
+        max_rate: float = 60.0,
+        additive_increase: float = 1.0,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        """Initialize the controller at the limiter's configured rate.
+
+        The bucket's stored rate is reset to it, so a process joining
+        other adaptive processes starts them all from a safe rate.
+
+        Args:
+            rate_limiter: RateLimiter whose bucket rate is adjusted.
+            min_rate: Lowest rate in requests per minute.
+            max_rate: Highest rate in requests per minute.
+            additive_increase: Requests per minute added after one
+                minute's worth of successful calls at the current rate.
+            decrease_factor: Factor applied to the rate on a 429 or 5xx.
+
+        Raises:
+            ValueError: If the bounds or factors are inconsistent.
+        """
+        if not 0 < min_rate <= max_rate:
+            raise ValueError("Rate bounds must satisfy 0 < min_rate <= max_rate")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+
+        self._limiter = rate_limiter
+        self._min_rate = min_rate
+        self._max_rate = max_rate
+        self._increase = additive_increase
+        self._decrease_factor = decrease_factor
+        self._lock = threading.Lock()
+        # Monotonic time of the last cut; calls started before it were
+        # sent at the old rate
+        self._last_cut = float("-inf")
+        self._started = time.monotonic()
+
+        start = min(max_rate, max(min_rate, rate_limiter.rate_per_minute))
+        _, self.rate = self._limiter.adjust_rate(lambda _: start)
+        self.trajectory: list[tuple[float, float, str]] = [(0.0, self.rate, "start")]
+
+    def on_success(self) -> None:
+        """Record a successful call and raise the rate additively.
+
+        Each success adds additive_increase / rate, so the rate grows by
+        additive_increase per minute of calls at the current rate.
+        """
+        with self._lock:
+            previous, self.rate = self._limiter.adjust_rate(self._increased)
+            if int(self.rate) != int(previous):
+                self._record("increase")
+
+    def on_error(self, reason: str, started: float | None = None) -> None:
+        """Record a 429/5xx response and cut the rate multiplicatively.
+
+        Errors from calls started before the rate was last cut are
+        ignored, however long they took, since those calls were sent at
+        the old rate. One overload episode thus causes a single decrease
+        instead of one per concurrent request. Cuts smaller than
+        MIN_RECORDED_DECREASE, which happen just above min_rate, are
+        applied but not recorded or logged.
+
+        Args:
+            reason: Short description for the log, e.g. "429".
+            started: time.monotonic() when the failed call was sent.
+                None counts the call as started now, so the error
+                always cuts the rate.
+        """
+        with self._lock:
+            if started is not None and started < self._last_cut:
+                return
+            previous, self.rate = self._limiter.adjust_rate(self._decreased)
+            if self.rate < previous:
+                self._last_cut = time.monotonic()
+            if previous - self.rate < MIN_RECORDED_DECREASE:
+                return
+            self._record(f"decrease after {reason}")
+
+    def summary(self) -> dict:
+        """Return min, max and final rate over the trajectory."""
+        rates = [rate for _, rate, _ in self.trajectory]
+        return {
+            "min_rate": round(min(rates), 2),
+            "max_rate": round(max(rates), 2),
+            "final_rate": round(self.rate, 2),
+            "changes": len(self.trajectory) - 1,
+        }
+
+    def _increased(self, rate: float) -> float:
+        if rate >= self._max_rate:
+            return rate
+        return min(self._max_rate, rate + self._increase / rate)
+
+    def _decreased(self, rate: float) -> float:
+        if rate <= self._min_rate:
+            return rate
+        return max(self._min_rate, rate * self._decrease_factor)
+
+    def _record(self, reason: str) -> None:
+        """Append the current rate to the trajectory and log it."""
+        elapsed = time.monotonic() - self._started
+        self.trajectory.append((round(elapsed, 1), self.rate, reason))
+        logger.info(
+            "Rate control: %.1f requests/min at %.0fs (%s)",
+            self.rate, elapsed, reason,
+        )
@@ -0,0 +1,269 @@
+"""Token-bucket rate limiter shared between processes through SQLite.
+
+Each API key gets one bucket row in a SQLite database. Every request
+reserves a token inside an immediate (write-locking) transaction, so
+all threads and processes on the host that point at the same database
+and key draw from the same budget. A reservation may take the bucket
+below zero; the caller then waits until its token would have been
+refilled, which keeps requests evenly spaced and first-come,
+first-served.
+
+The bucket row also stores the rate it refills at. A static limiter
+writes its configured rate on every reservation; once adjust_rate is
+used (by an AimdRateController), the limiter follows the stored rate
+instead, so adaptive processes sharing a key change one common rate.
+
+Only a short hash of the key is stored. Run this module to print the
+current state of every bucket:
+
+    python -m analyzers.rate_limiter ~/.cache/pony-data-collector/rate_limits.sqlite
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "pony-data-collector", "rate_limits.sqlite",
+)
+
+
+def key_id(api_key: str) -> str:
+    """Return the bucket id for an API key without storing the key."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class RateLimiter:
+    """Token bucket stored in SQLite, refilled at rate_per_minute.
+
+    Pass ":memory:" as db_path for a limiter private to this process.
+    Tracks how long this process has been told to wait. rate_per_minute
+    is the configured rate, or the last rate read from the bucket once
+    adjust_rate has been called.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        bucket: str,
+        rate_per_minute: float,
+        capacity: float = 1.0,
+    ) -> None:
+        """Open (or create) the bucket.
+
+        Args:
+            db_path: SQLite database shared by all processes, or
+                ":memory:".
+            bucket: Bucket id, normally key_id(api_key).
+            rate_per_minute: Tokens added per minute.
+            capacity: Maximum tokens the bucket holds, i.e. how many
+                requests may start back to back after an idle period.
+                The default of 1 spaces requests evenly, so no rolling
+                60-second window exceeds rate_per_minute.
+        """
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(
+            db_path, timeout=30.0, isolation_level=None, check_same_thread=False,
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            " bucket TEXT PRIMARY KEY,"
+            " tokens REAL NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " rate_per_minute REAL NOT NULL,"
+            " capacity REAL NOT NULL,"
+            " calls INTEGER NOT NULL DEFAULT 0,"
+            " wait_seconds REAL NOT NULL DEFAULT 0)"
+        )
+        self._lock = threading.Lock()
+        self._bucket = bucket
+        self.rate_per_minute = rate_per_minute
+        self._capacity = capacity
+        self._follow_stored_rate = False
+        self.calls = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def reserve(self) -> float:
+        """Take one token and return how long to wait before using it.
+
+        Returns:
+            Seconds the caller must wait before starting its request.
+        """
+        with self._lock, self._transaction() as (tokens, now):
+            tokens -= 1.0
+            wait = max(0.0, -tokens) / self._rate_per_second
+            self._conn.execute(
+                "UPDATE buckets SET tokens = ?, updated_at = ?, rate_per_minute = ?,"
+                " capacity = ?, calls = calls + 1, wait_seconds = wait_seconds + ?"
+                " WHERE bucket = ?",
+                (tokens, now, self.rate_per_minute, self._capacity, wait, self._bucket),
+            )
+
+        self.calls += 1
+        self.wait_seconds += wait
+        self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        return wait
+
+    def adjust_rate(self, adjust: Callable[[float], float]) -> tuple[float, float]:
+        """Change the bucket's rate for every process sharing it.
+
+        The change is made inside one transaction, so concurrent
+        adjustments from other processes are applied one after another.
+        From then on this limiter refills at the stored rate and no
+        longer writes its configured rate.
+
+        Args:
+            adjust: Maps the current stored rate to the new rate.
+
+        Returns:
+            The previous and the new rate in requests per minute.
+        """
+        with self._lock:
+            self._follow_stored_rate = True
+            with self._transaction() as (tokens, now):
+                previous = self.rate_per_minute
+                rate = adjust(previous)
+                # Tokens are settled up to now at the previous rate
+                self._conn.execute(
+                    "UPDATE buckets SET tokens = ?, updated_at = ?, rate_per_minute = ?"
+                    " WHERE bucket = ?",
+                    (tokens, now, rate, self._bucket),
+                )
+                self.rate_per_minute = rate
+
+        return previous, rate
+
+    def pause(self, seconds: float) -> None:
+        """Hold off all users of the bucket for at least this long.
+
+        Implemented as token debt, so waiting requests resume evenly
+        spaced afterwards instead of all at once. Overlapping pauses do
+        not add up.
+
+        Args:
+            seconds: Minimum time before the next request may start.
+        """
+        with self._lock, self._transaction() as (tokens, now):
+            tokens = min(tokens, -seconds * self._rate_per_second)
+            self._conn.execute(
+                "UPDATE buckets SET tokens = ?, updated_at = ? WHERE bucket = ?",
+                (tokens, now, self._bucket),
+            )
+
+        logger.debug("Paused rate limit bucket %s for %.1fs", self._bucket, seconds)
+
+    def state(self) -> dict:
+        """Return the current shared state of this bucket.
+
+        Returns:
+            Dict with tokens (refilled to now), ready_in_seconds,
+            rate_per_minute, capacity, and the calls and total
+            wait_seconds of all processes.
+        """
+        with self._lock, self._transaction() as (tokens, _):
+            row = self._conn.execute(
+                "SELECT rate_per_minute, capacity, calls, wait_seconds"
+                " FROM buckets WHERE bucket = ?",
+                (self._bucket,),
+            ).fetchone()
+
+        return {
+            "bucket": self._bucket,
+            "tokens": round(tokens, 3),
+            "ready_in_seconds": round(max(0.0, -tokens) / self._rate_per_second, 3),
+            "rate_per_minute": row[0],
+            "capacity": row[1],
+            "calls": row[2],
+            "wait_seconds": round(row[3], 3),
+        }
+
+    def stats(self) -> dict:
+        """Return the wait-time metrics of this process."""
+        return {
+            "calls": self.calls,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def _rate_per_second(self) -> float:
+        return self.rate_per_minute / 60.0
+
+    @contextmanager
+    def _transaction(self) -> Iterator[tuple[float, float]]:
+        """Run an immediate transaction on the bucket.
+
+        Yields (tokens, now) with the tokens refilled up to now at the
+        stored rate, which is the rate that applied since the last
+        update. When following the stored rate, rate_per_minute is set
+        to it. Commits on a clean exit and rolls back on errors.
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = self._conn.execute(
+                "SELECT tokens, updated_at, rate_per_minute FROM buckets"
+                " WHERE bucket = ?",
+                (self._bucket,),
+            ).fetchone()
+
+            if row is None:
+                self._conn.execute(
+                    "INSERT INTO buckets"
+                    " (bucket, tokens, updated_at, rate_per_minute, capacity)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (self._bucket, self._capacity, now,
+                     self.rate_per_minute, self._capacity),
+                )
+                tokens = self._capacity
+            else:
+                elapsed = max(0.0, now - row[1])
+                tokens = min(self._capacity, row[0] + elapsed * row[2] / 60.0)
+                if self._follow_stored_rate:
+                    self.rate_per_minute = row[2]
+
+            yield tokens, now
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        else:
+            self._conn.execute("COMMIT")
+
+
+def _print_state(db_path: str) -> None:
+    """Print every bucket in a limiter database."""
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        "SELECT bucket, tokens, updated_at, rate_per_minute, capacity, calls,"
+        " wait_seconds FROM buckets ORDER BY bucket"
+    ).fetchall()
+    conn.close()
+
+    now = time.time()
+    for bucket, tokens, updated_at, rate, capacity, calls, wait_seconds in rows:
+        tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate / 60.0)
+        print(
+            f"{bucket}: {tokens:.2f}/{capacity:g} tokens, {rate:g}/min, "
+            f"ready in {max(0.0, -tokens) * 60.0 / rate:.1f}s, "
+            f"{calls} calls, {wait_seconds:.1f}s waited in total"
+        )
+
+
+if __name__ == "__main__":
+    _print_state(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DB_PATH)
@@ -15,12 +15,25 @@ import json
 import logging
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from dotenv import load_dotenv
 
+from analyzers.analysis_cache import AnalysisCache
 from analyzers.batch_processor import BatchProcessor
+from analyzers.celeb_scheduler import CelebScheduler
+from analyzers.early_stopping import ConvergencePolicy
+from analyzers.face_filter import FaceFilter
+from analyzers.face_geometry import FaceGeometry
+from analyzers.frame_dedup import FrameDeduplicator
+from analyzers.frame_preprocessor import FramePreprocessor
 from analyzers.gemini_analyzer import GeminiAnalyzer
+from analyzers.model_backends import FakeGeminiModel, RecordingModel, ReplayModel
+from analyzers.rate_control import AimdRateController
+from analyzers.rate_limiter import DEFAULT_DB_PATH, RateLimiter, key_id
+from scrapers.search_cache import SearchCache
 from scrapers.youtube_collector import YouTubeCollector
 from uploaders.supabase_uploader import SupabaseUploader
 
@@ -143,17 +156,23 @@ def load_config(env_path: str) -> dict[str, str]:
     return config
 
 
-def validate_config(config: dict[str, str], skip_upload: bool) -> None:
+def validate_config(
+    config: dict[str, str],
+    skip_upload: bool,
+    require_gemini_key: bool = True,
+) -> None:
     """Validate that required config values are present.
 
     Args:
         config: Configuration dict from load_config.
         skip_upload: If True, Supabase keys are not required.
+        require_gemini_key: If False (offline model backends), the
+            Gemini API key is not required.
 
     Raises:
         SystemExit: If required configuration is missing.
     """
-    if not config["GEMINI_API_KEY"]:
+    if require_gemini_key and not config["GEMINI_API_KEY"]:
         logger.error("GEMINI_API_KEY is required. Set it in config.env or environment.")
         sys.exit(1)
 
@@ -185,39 +204,33 @@ def ensure_directories(output_dir: str, celeb_id: str) -> dict[str, str]:
     return {"frames": frames_dir, "analyzed": analyzed_dir}
 
 
-def process_celeb(
+def collect_frames(
     celeb_id: str,
     celeb_info: dict,
     collector: YouTubeCollector | None,
-    processor: BatchProcessor,
-    uploader: SupabaseUploader | None,
     output_dir: str,
     skip_download: bool,
-    skip_upload: bool,
 ) -> dict | None:
-    """Run the full pipeline for a single celebrity.
+    """Collect videos and extract frames for a single celebrity.
 
     Args:
         celeb_id: Celebrity identifier key.
         celeb_info: Dict with name, category, signature_look, queries.
         collector: YouTubeCollector instance (None if skip_download).
-        processor: BatchProcessor instance for analysis.
-        uploader: SupabaseUploader instance (None if skip_upload).
         output_dir: Base output directory.
         skip_download: If True, skip YouTube download step.
-        skip_upload: If True, skip Supabase upload step.
 
     Returns:
-        The final Makeup DNA dict, or None if processing failed.
+        Dict with 'frames' and 'analyzed' directory paths, or None if
+        there are no frames to analyze.
     """
     celeb_name = celeb_info["name"]
     logger.info("=" * 60)
-    logger.info("Processing: %s (%s)", celeb_name, celeb_id)
+    logger.info("Collecting: %s (%s)", celeb_name, celeb_id)
     logger.info("=" * 60)
 
     dirs = ensure_directories(output_dir, celeb_id)
 
-    # Step 1: Collect videos and extract frames
     if not skip_download:
         if collector is None:
             logger.error("YouTubeCollector is required when not skipping download")
@@ -244,9 +257,40 @@ def process_celeb(
         return None
 
     logger.info("Found %d frames for %s", len(frame_files), celeb_name)
+    return dirs
+
+
+def checkpoint_path_for(output_dir: str, celeb_id: str) -> str:
+    """Return the per-frame checkpoint file of a celebrity."""
+    return os.path.join(output_dir, celeb_id, "analyzed", f"{celeb_id}_checkpoint.jsonl")
+
+
+def save_celeb_dna(
+    celeb_id: str,
+    celeb_info: dict,
+    dna: dict,
+    uploader: SupabaseUploader | None,
+    output_dir: str,
+    skip_upload: bool,
+    complete: bool = True,
+) -> dict | None:
+    """Save and upload the analyzed Makeup DNA of a single celebrity.
+
+    Args:
+        celeb_id: Celebrity identifier key.
+        celeb_info: Dict with name, category, signature_look, queries.
+        dna: DNA dict from the analysis stage, empty if it failed.
+        uploader: SupabaseUploader instance (None if skip_upload).
+        output_dir: Base output directory.
+        skip_upload: If True, skip Supabase upload step.
+        complete: Whether every frame was analyzed (or analysis
+            converged). If False, the per-frame checkpoint is kept so
+            the next run only analyzes the remaining frames.
 
-    # Step 2: Analyze frames with Gemini
-    dna = processor.process_celeb(celeb_id, celeb_name, dirs["frames"])
+    Returns:
+        The final Makeup DNA dict, or None if processing failed.
+    """
+    celeb_name = celeb_info["name"]
 
     if not dna:
         logger.warning("No DNA produced for %s", celeb_name)
@@ -257,13 +301,32 @@ def process_celeb(
     dna["signature_look"] = celeb_info["signature_look"]
 
     # Save intermediate JSON result
-    dna_path = os.path.join(dirs["analyzed"], f"{celeb_id}_dna.json")
+    analyzed_dir = os.path.join(output_dir, celeb_id, "analyzed")
+    dna_path = os.path.join(analyzed_dir, f"{celeb_id}_dna.json")
     with open(dna_path, "w", encoding="utf-8") as f:
         json.dump(dna, f, indent=2, ensure_ascii=False)
     logger.info("Saved DNA to %s", dna_path)
 
-    # Step 3: Upload to Supabase
-    if not skip_upload:
+    # A complete DNA supersedes the per-frame checkpoint
+    checkpoint_path = checkpoint_path_for(output_dir, celeb_id)
+    if os.path.exists(checkpoint_path):
+        if complete:
+            os.remove(checkpoint_path)
+        else:
+            logger.info(
+                "Keeping checkpoint %s; the next run analyzes the frames "
+                "that failed", checkpoint_path,
+            )
+
+    # Upload to Supabase
+    if not skip_upload and not dna.get("frames_analyzed"):
+        # Local geometry alone leaves makeup_analysis and most metrics
+        # empty, which would overwrite a full record in the table
+        logger.warning(
+            "Skipping Supabase upload for %s: no frame was analyzed by "
+            "Gemini, only local geometry was saved", celeb_name,
+        )
+    elif not skip_upload:
         if uploader is None:
             logger.error("SupabaseUploader is required when not skipping upload")
             return dna
@@ -322,6 +385,298 @@ Available celebs: %(celebs)s
         action="store_true",
         help="Skip Supabase upload",
     )
+    parser.add_argument(
+        "--decode-mode",
+        choices=list(YouTubeCollector.DECODE_MODES),
+        default="auto",
+        help="Frame decode strategy: seek per sample, stream forward, "
+             "or pick per video (default: auto)",
+    )
+    parser.add_argument(
+        "--refresh-search",
+        action="store_true",
+        help="Ignore cached YouTube search results and search again",
+    )
+    parser.add_argument(
+        "--search-cache-ttl",
+        type=float,
+        default=24,
+        help="Hours a cached YouTube search stays fresh (default: 24)",
+    )
+    parser.add_argument(
+        "--download-workers",
+        type=int,
+        default=1,
+        help="Number of videos to download concurrently (default: 1)",
+    )
+    parser.add_argument(
+        "--sparse",
+        action="store_true",
+        help="Download only short clips around each sampled timestamp "
+             "instead of full videos (interval sampling only)",
+    )
+    parser.add_argument(
+        "--best-frame-window",
+        type=float,
+        default=0.0,
+        help="Score frames in this many seconds around each sample point "
+             "and keep the sharpest, best exposed one (default: off)",
+    )
+    parser.add_argument(
+        "--sampling",
+        choices=list(YouTubeCollector.SAMPLING_MODES),
+        default="interval",
+        help="Frame sampling: fixed 30s interval or on scene changes "
+             "(default: interval)",
+    )
+    parser.add_argument(
+        "--scene-min-gap",
+        type=float,
+        default=YouTubeCollector.SCENE_MIN_GAP_SECONDS,
+        help="Minimum seconds between scene-sampled frames "
+             "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--scene-max-gap",
+        type=float,
+        default=YouTubeCollector.SCENE_MAX_GAP_SECONDS,
+        help="Maximum seconds between scene-sampled frames "
+             "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Analyze only one frame per cluster of near-duplicate frames",
+    )
+    parser.add_argument(
+        "--dedup-method",
+        choices=list(FrameDeduplicator.HASH_METHODS),
+        default="dhash",
+        help="Perceptual hash used by --dedup (default: dhash)",
+    )
+    parser.add_argument(
+        "--dedup-distance",
+        type=int,
+        default=6,
+        help="Max Hamming distance (of 64 bits) for --dedup duplicates "
+             "(default: 6)",
+    )
+    parser.add_argument(
+        "--face-filter",
+        action="store_true",
+        help="Drop frames without a reasonably sized frontal face "
+             "before analysis",
+    )
+    parser.add_argument(
+        "--min-face-fraction",
+        type=float,
+        default=0.12,
+        help="Minimum face height as a fraction of frame height for "
+             "--face-filter (default: 0.12)",
+    )
+    parser.add_argument(
+        "--face-crop",
+        action="store_true",
+        help="Send only the padded face region to Gemini instead of the "
+             "full frame",
+    )
+    parser.add_argument(
+        "--crop-padding",
+        type=float,
+        default=0.5,
+        help="Padding around the face for --face-crop, as a fraction of "
+             "the face size (default: 0.5)",
+    )
+    parser.add_argument(
+        "--max-image-edge",
+        type=int,
+        default=None,
+        help="Cap the long edge (pixels) of images sent to Gemini "
+             "(default: 768 with --face-crop, otherwise no cap)",
+    )
+    parser.add_argument(
+        "--landmark-model",
+        default=None,
+        help="Path to an OpenCV Facemark LBF model (lbfmodel.yaml). Measures "
+             "canthal tilt, midface ratio and symmetry locally instead of "
+             "asking Gemini (needs opencv-contrib-python)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Frames sent per Gemini request (default: the smallest size "
+             "that fits a celeb into one minute of --rate-limit, up to 8; "
+             "1 disables batching)",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=1,
+        help="Concurrent Gemini requests, still bounded by the per-minute "
+             "rate limit (default: 1)",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        default=15,
+        help="Maximum Gemini requests per minute, or the starting rate "
+             "with --adaptive-rate (default: 15)",
+    )
+    parser.add_argument(
+        "--adaptive-rate",
+        action="store_true",
+        help="Raise the request rate while calls succeed and halve it on "
+             "429/5xx errors (AIMD), within --min-rate and --max-rate",
+    )
+    parser.add_argument(
+        "--min-rate",
+        type=float,
+        default=5.0,
+        help="Lowest requests per minute with --adaptive-rate (default: 5)",
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=60.0,
+        help="Highest requests per minute with --adaptive-rate (default: 60)",
+    )
+    parser.add_argument(
+        "--rate-limiter-db",
+        default=DEFAULT_DB_PATH,
+        help="SQLite file holding the rate limit shared by all pipeline "
+             "processes using the same API key, or :memory: for a private "
+             f"limit (default: {DEFAULT_DB_PATH})",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["gemini", "fake", "replay"],
+        default="gemini",
+        help="Model backend: the Gemini API, a deterministic local fake, or "
+             "responses recorded with --record-dir (default: gemini)",
+    )
+    parser.add_argument(
+        "--record-dir",
+        default=None,
+        help="Save every Gemini response to this directory (gemini backend), "
+             "or read them from it (replay backend)",
+    )
+    parser.add_argument(
+        "--fake-latency",
+        type=float,
+        default=1.0,
+        help="Mean simulated latency per request in seconds, for the fake "
+             "backend and replays (default: 1.0)",
+    )
+    parser.add_argument(
+        "--fake-quota-error-rate",
+        type=float,
+        default=0.0,
+        help="Share of fake requests that fail with a 429 (default: 0)",
+    )
+    parser.add_argument(
+        "--fake-malformed-rate",
+        type=float,
+        default=0.0,
+        help="Share of fake responses with truncated JSON (default: 0)",
+    )
+    parser.add_argument(
+        "--fake-seed",
+        type=int,
+        default=0,
+        help="Seed for the fake backend (default: 0)",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=4,
+        help="Retries per Gemini request after 429/5xx/timeout errors, with "
+             "jittered exponential backoff (default: 4)",
+    )
+    parser.add_argument(
+        "--retry-budget",
+        type=int,
+        default=100,
+        help="Maximum Gemini retries over the whole run (default: 100)",
+    )
+    parser.add_argument(
+        "--metric-aggregate",
+        choices=["mean", "median", "trimmed_mean"],
+        default=None,
+        help="How numeric five_metrics are merged across frames; median and "
+             "trimmed_mean resist outlier frames (default: weighted mean)",
+    )
+    parser.add_argument(
+        "--trim-fraction",
+        type=float,
+        default=0.1,
+        help="Share of frame weight cut from each end for --metric-aggregate "
+             "trimmed_mean (default: 0.1)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not reuse or store Gemini analyses in the local cache",
+    )
+    parser.add_argument(
+        "--cache-max-entries",
+        type=int,
+        default=50_000,
+        help="Maximum cached analyses before least recently used ones are "
+             "evicted (default: 50000)",
+    )
+    parser.add_argument(
+        "--early-stop",
+        action="store_true",
+        help="Stop analyzing a celeb's frames once the merged metrics have "
+             "converged",
+    )
+    parser.add_argument(
+        "--early-stop-min-frames",
+        type=int,
+        default=12,
+        help="Frames to analyze before checking convergence (default: 12)",
+    )
+    parser.add_argument(
+        "--early-stop-confidence",
+        type=float,
+        default=0.95,
+        help="Confidence level of the metric intervals (default: 0.95)",
+    )
+    parser.add_argument(
+        "--early-stop-tolerance",
+        type=float,
+        default=1.0,
+        help="Scale of the per-metric interval tolerances (2 score points, "
+             "0.5 degrees/percent); larger stops earlier (default: 1.0)",
+    )
+    parser.add_argument(
+        "--frame-order",
+        choices=["sorted", "shuffled", "stratified"],
+        default=None,
+        help="Order in which frames are analyzed (default: stratified with "
+             "--early-stop, sorted otherwise)",
+    )
+    parser.add_argument(
+        "--celeb-weight",
+        action="append",
+        metavar="ID=WEIGHT",
+        help="Relative share of the Gemini quota for a celeb while other "
+             "celebs are being analyzed too, e.g. jennie=2 (default: 1 each)",
+    )
+    parser.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="Do not checkpoint per-frame analyses for resuming an "
+             "interrupted run",
+    )
+    parser.add_argument(
+        "--checkpoint-fsync-every",
+        type=int,
+        default=16,
+        help="Checkpointed analyses written between two fsyncs "
+             "(default: 16)",
+    )
     parser.add_argument(
         "--output-dir",
         default="./output",
@@ -351,7 +706,11 @@ def main() -> None:
 
     # Load and validate config
     config = load_config(args.config)
-    validate_config(config, skip_upload=args.skip_upload)
+    validate_config(
+        config,
+        skip_upload=args.skip_upload,
+        require_gemini_key=args.backend == "gemini",
+    )
 
     # Determine which celebs to process
     if args.all:
@@ -361,13 +720,166 @@ def main() -> None:
 
     logger.info("Processing %d celebs: %s", len(celeb_ids), ", ".join(celeb_ids))
 
+    if args.sparse and args.sampling != "interval":
+        logger.error("--sparse only works with --sampling interval")
+        sys.exit(1)
+
+    if not 0 <= args.scene_min_gap <= args.scene_max_gap:
+        logger.error("--scene-min-gap must be at least 0 and at most --scene-max-gap")
+        sys.exit(1)
+
+    if args.backend == "replay" and not args.record_dir:
+        logger.error("--backend replay requires --record-dir")
+        sys.exit(1)
+
+    celeb_weights: dict[str, float] = {}
+    for spec in args.celeb_weight or []:
+        celeb_id, _, weight = spec.partition("=")
+        try:
+            celeb_weights[celeb_id] = float(weight)
+        except ValueError:
+            logger.error("Invalid --celeb-weight %r, expected ID=WEIGHT", spec)
+            sys.exit(1)
+        if celeb_id not in celeb_ids:
+            logger.error(
+                "--celeb-weight for %r, which is not a selected celeb (%s)",
+                celeb_id, ", ".join(celeb_ids),
+            )
+            sys.exit(1)
+        if celeb_weights[celeb_id] <= 0:
+            logger.error("--celeb-weight for %s must be positive", celeb_id)
+            sys.exit(1)
+
+    if not 0 <= args.trim_fraction < 0.5:
+        logger.error("--trim-fraction must be at least 0 and below 0.5")
+        sys.exit(1)
+
+    output_dir = os.path.abspath(args.output_dir)
+
     # Initialize components
     collector: YouTubeCollector | None = None
     if not args.skip_download:
-        collector = YouTubeCollector()
+        search_cache = SearchCache(
+            os.path.join(output_dir, "search_cache"),
+            ttl_seconds=args.search_cache_ttl * 3600,
+        )
+        collector = YouTubeCollector(
+            decode_mode=args.decode_mode,
+            sampling=args.sampling,
+            min_gap_seconds=args.scene_min_gap,
+            max_gap_seconds=args.scene_max_gap,
+            download_workers=args.download_workers,
+            sparse=args.sparse,
+            search_cache=search_cache,
+            refresh_search=args.refresh_search,
+            best_frame_window=args.best_frame_window,
+        )
+
+    face_filter: FaceFilter | None = None
+    if args.face_filter or args.face_crop or args.landmark_model:
+        face_filter = FaceFilter(min_face_fraction=args.min_face_fraction)
+
+    geometry: FaceGeometry | None = None
+    if args.landmark_model:
+        try:
+            geometry = FaceGeometry(args.landmark_model, face_filter=face_filter)
+        except RuntimeError as exc:
+            logger.error("Cannot enable local face geometry: %s", exc)
+            sys.exit(1)
+
+    preprocessor: FramePreprocessor | None = None
+    if args.face_crop or args.max_image_edge:
+        preprocessor = FramePreprocessor(
+            face_filter=face_filter if args.face_crop else None,
+            padding=args.crop_padding,
+            max_long_edge=args.max_image_edge or 768,
+        )
+
+    cache: AnalysisCache | None = None
+    if not args.no_cache:
+        cache = AnalysisCache(
+            os.path.join(output_dir, "analysis_cache.sqlite"),
+            max_entries=args.cache_max_entries,
+        )
+
+    model = None
+    if args.backend == "fake":
+        model = FakeGeminiModel(
+            seed=args.fake_seed,
+            latency_seconds=args.fake_latency,
+            quota_error_rate=args.fake_quota_error_rate,
+            malformed_rate=args.fake_malformed_rate,
+        )
+    elif args.backend == "replay":
+        model = ReplayModel(args.record_dir, latency_seconds=args.fake_latency)
+    elif args.record_dir:
+        model = RecordingModel(
+            GeminiAnalyzer.create_model(config["GEMINI_API_KEY"]), args.record_dir,
+        )
 
-    analyzer = GeminiAnalyzer(api_key=config["GEMINI_API_KEY"])
-    processor = BatchProcessor(analyzer, rate_limit_per_minute=15)
+    analyzer = GeminiAnalyzer(
+        api_key=config["GEMINI_API_KEY"],
+        preprocessor=preprocessor,
+        cache=cache,
+        model=model,
+        local_geometry=geometry is not None,
+    )
+
+    deduplicator: FrameDeduplicator | None = None
+    if args.dedup:
+        deduplicator = FrameDeduplicator(
+            method=args.dedup_method,
+            max_distance=args.dedup_distance,
+        )
+
+    # Offline backends never share the real API key's budget
+    if args.backend == "gemini":
+        rate_limiter = RateLimiter(
+            args.rate_limiter_db, key_id(config["GEMINI_API_KEY"]), args.rate_limit,
+        )
+    else:
+        rate_limiter = RateLimiter(":memory:", args.backend, args.rate_limit)
+
+    rate_controller: AimdRateController | None = None
+    if args.adaptive_rate:
+        try:
+            rate_controller = AimdRateController(
+                rate_limiter, min_rate=args.min_rate, max_rate=args.max_rate,
+            )
+        except ValueError as exc:
+            logger.error("Invalid adaptive rate settings: %s", exc)
+            sys.exit(1)
+
+    early_stopping: ConvergencePolicy | None = None
+    if args.early_stop:
+        try:
+            early_stopping = ConvergencePolicy(
+                min_frames=args.early_stop_min_frames,
+                confidence=args.early_stop_confidence,
+                tolerance_scale=args.early_stop_tolerance,
+            )
+        except ValueError as exc:
+            logger.error("Invalid early stopping settings: %s", exc)
+            sys.exit(1)
+    frame_order = args.frame_order or ("stratified" if args.early_stop else "sorted")
+
+    processor = BatchProcessor(
+        analyzer,
+        rate_limiter=rate_limiter,
+        rate_controller=rate_controller,
+        deduplicator=deduplicator,
+        face_filter=face_filter if args.face_filter else None,
+        batch_size=args.batch_size,
+        max_in_flight=args.max_in_flight,
+        max_retries=args.max_retries,
+        retry_budget=args.retry_budget,
+        geometry=geometry,
+        metric_aggregate=args.metric_aggregate,
+        trim_fraction=args.trim_fraction,
+        checkpoint_fsync_every=args.checkpoint_fsync_every,
+        early_stopping=early_stopping,
+        frame_order=frame_order,
+    )
 
     uploader: SupabaseUploader | None = None
     if not args.skip_upload:
@@ -376,24 +888,68 @@ def main() -> None:
             key=config["SUPABASE_KEY"],
         )
 
-    # Process each celeb
+    # Frames are collected in a background thread, one celeb after another,
+    # while the scheduler analyzes every celeb whose frames are ready
     results: list[dict] = []
-    output_dir = os.path.abspath(args.output_dir)
 
-    for celeb_id in celeb_ids:
-        celeb_info = CELEB_QUERIES[celeb_id]
-        dna = process_celeb(
+    def on_finished(celeb_id: str, dna: dict, complete: bool) -> None:
+        saved = save_celeb_dna(
             celeb_id=celeb_id,
-            celeb_info=celeb_info,
-            collector=collector,
-            processor=processor,
+            celeb_info=CELEB_QUERIES[celeb_id],
+            dna=dna,
             uploader=uploader,
             output_dir=output_dir,
-            skip_download=args.skip_download,
             skip_upload=args.skip_upload,
+            complete=complete,
         )
-        if dna:
-            results.append(dna)
+        if saved:
+            results.append(saved)
+
+    scheduler = CelebScheduler(processor, on_finished, max_in_flight=args.max_in_flight)
+    stop_collecting = threading.Event()
+
+    def collect_all() -> None:
+        try:
+            for celeb_id in celeb_ids:
+                if stop_collecting.is_set():
+                    break
+                celeb_info = CELEB_QUERIES[celeb_id]
+                dirs = collect_frames(
+                    celeb_id=celeb_id,
+                    celeb_info=celeb_info,
+                    collector=collector,
+                    output_dir=output_dir,
+                    skip_download=args.skip_download,
+                )
+                if dirs is None or stop_collecting.is_set():
+                    continue
+                # Prepared here so dedup, face filtering and hashing do
+                # not hold up requests for other celebs
+                job = processor.start_celeb(
+                    celeb_id,
+                    celeb_info["name"],
+                    dirs["frames"],
+                    checkpoint_path=(
+                        None if args.no_checkpoint
+                        else checkpoint_path_for(output_dir, celeb_id)
+                    ),
+                )
+                if job is not None:
+                    scheduler.submit(job, weight=celeb_weights.get(celeb_id, 1.0))
+        finally:
+            scheduler.close()
+
+    collection = ThreadPoolExecutor(max_workers=1)
+    collected = collection.submit(collect_all)
+    try:
+        scheduler.run()
+    finally:
+        # On an error or Ctrl-C, stop downloading further celebs instead
+        # of waiting for all of them. After a normal run the collection
+        # has already finished, since the scheduler waits for close().
+        stop_collecting.set()
+        collection.shutdown(wait=False, cancel_futures=True)
+    collected.result()
 
     # Summary
     logger.info("=" * 60)
@@ -408,6 +964,29 @@ def main() -> None:
             dna.get("frames_analyzed", 0),
             dna.get("total_frames", 0),
         )
+    if processor.retries_used:
+        logger.info("Gemini retries used: %d", processor.retries_used)
+    limiter_stats = rate_limiter.stats()
+    logger.info(
+        "Rate limiter: %d calls, %.1fs waited in total (max %.1fs)",
+        limiter_stats["calls"], limiter_stats["wait_seconds"],
+        limiter_stats["max_wait_seconds"],
+    )
+    if rate_controller is not None:
+        summary = rate_controller.summary()
+        logger.info(
+            "Adaptive rate: %.1f-%.1f requests/min, final %.1f (%d changes)",
+            summary["min_rate"], summary["max_rate"],
+            summary["final_rate"], summary["changes"],
+        )
+    rate_limiter.close()
+    if cache is not None:
+        stats = cache.stats()
+        logger.info(
+            "Analysis cache: %d hits, %d misses, %d entries",
+            stats["hits"], stats["misses"], stats["entries"],
+        )
+        cache.close()
     logger.info("=" * 60)
 
 
@@ -0,0 +1,113 @@
+"""On-disk cache for YouTube search results.
+
+Stores one small JSON file per (query, max_results) pair so reruns can
+reuse earlier searches instead of querying YouTube again. Entries expire
+after a TTL, and the oldest entries are evicted once the cache holds
+more than max_entries files.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class SearchCache:
+    """TTL- and size-bounded file cache for search results."""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttl_seconds: float = 24 * 3600,
+        max_entries: int = 256,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache files.
+            ttl_seconds: Age after which an entry is considered stale.
+            max_entries: Maximum number of cached searches kept on disk.
+        """
+        self._cache_dir = cache_dir
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, query: str, max_results: int) -> str:
+        """Return the cache file path for a search."""
+        key = hashlib.sha1(f"{query}\n{max_results}".encode("utf-8")).hexdigest()
+        return os.path.join(self._cache_dir, f"{key}.json")
+
+    def get(self, query: str, max_results: int) -> list[dict] | None:
+        """Return cached search results if present and fresh.
+
+        Args:
+            query: Search query string.
+            max_results: Maximum number of results of the search.
+
+        Returns:
+            The cached video list, or None on a miss or stale entry.
+        """
+        path = self._entry_path(query, max_results)
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Ignoring unreadable search cache entry %s: %s", path, exc)
+            return None
+
+        age = time.time() - entry.get("created_at", 0)
+        if age > self._ttl:
+            logger.debug("Search cache entry for '%s' is stale (%.0fs old)", query, age)
+            return None
+
+        return entry.get("videos")
+
+    def put(self, query: str, max_results: int, videos: list[dict]) -> None:
+        """Store search results and evict the oldest entries if needed.
+
+        Args:
+            query: Search query string.
+            max_results: Maximum number of results of the search.
+            videos: Search results to cache.
+        """
+        path = self._entry_path(query, max_results)
+        entry = {
+            "query": query,
+            "max_results": max_results,
+            "created_at": time.time(),
+            "videos": videos,
+        }
+
+        # Write to a temp file first so readers never see a partial entry
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """Delete the oldest entries beyond max_entries."""
+        entries = [
+            os.path.join(self._cache_dir, name)
+            for name in os.listdir(self._cache_dir)
+            if name.endswith(".json")
+        ]
+        if len(entries) <= self._max_entries:
+            return
+
+        entries.sort(key=os.path.getmtime)
+        for path in entries[:len(entries) - self._max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            logger.debug("Evicted search cache entry %s", path)
@@ -0,0 +1,96 @@
+"""Persistent manifest of downloaded videos and extracted frames.
+
+Stores one JSON line per video in the celeb output directory, keyed by
+video_id, with the download path, the extraction parameters and the
+resulting frame list. The collector uses it to skip videos that were
+already collected by an earlier query or run, and to redo only the
+extraction when its parameters change.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class VideoManifest:
+    """Append-only JSONL manifest keyed by video_id.
+
+    Every update appends a full record; on load the last record for a
+    video_id wins. Safe to share between download worker threads.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Load the manifest, creating it lazily on first write.
+
+        Args:
+            path: Path to the manifest JSONL file.
+        """
+        self._path = path
+        self._entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """Read existing records from disk, skipping malformed lines."""
+        if not os.path.exists(self._path):
+            return
+
+        with open(self._path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                    self._entries[entry["video_id"]] = entry
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    logger.warning(
+                        "Skipping malformed manifest line %d in %s",
+                        line_number, self._path,
+                    )
+
+        logger.debug("Loaded %d manifest entries from %s", len(self._entries), self._path)
+
+    def get(self, video_id: str) -> dict | None:
+        """Return the latest record for a video, or None if unknown."""
+        with self._lock:
+            return self._entries.get(video_id)
+
+    def lookup(self, video_id: str, params: dict) -> dict | None:
+        """Return the record for a video if it can be reused as is.
+
+        A record is reusable when it was extracted with the same
+        parameters and all of its frames still exist on disk.
+
+        Args:
+            video_id: YouTube video ID.
+            params: Extraction parameters of the current run.
+
+        Returns:
+            The manifest record, or None if the video must be redone.
+        """
+        entry = self.get(video_id)
+        if entry is None or entry.get("params") != params:
+            return None
+        if not all(os.path.exists(p) for p in entry.get("frames", [])):
+            return None
+        return entry
+
+    def record(self, entry: dict) -> None:
+        """Store a video record and append it to the manifest file.
+
+        Args:
+            entry: Record with at least a 'video_id' key. An
+                'updated_at' timestamp is added.
+        """
+        entry = {**entry, "updated_at": time.time()}
+
+        with self._lock:
+            self._entries[entry["video_id"]] = entry
+            os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+            with open(self._path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
@@ -6,26 +6,139 @@ and extracts frames at configurable intervals using OpenCV.
 
 import logging
 import os
+import threading
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import cv2
+import numpy as np
 import yt_dlp
 
+from scrapers.search_cache import SearchCache
+from scrapers.video_manifest import VideoManifest
+
 logger = logging.getLogger(__name__)
 
 
+class _TokenBucket:
+    """Thread-safe token bucket shared by all download workers.
+
+    Tokens refill continuously at rate_per_second up to capacity. Each
+    acquire() takes one token, sleeping until one is available.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: int) -> None:
+        self._rate = rate_per_second
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, blocking until one is available.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        started = time.monotonic()
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity,
+                    self._tokens + (now - self._updated) * self._rate,
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return now - started
+
+                wait = (1 - self._tokens) / self._rate
+
+            time.sleep(wait)
+
+
 class YouTubeCollector:
     """Collects K-celeb makeup tutorial videos from YouTube.
 
     Handles searching, downloading, and frame extraction using yt-dlp
-    and OpenCV. Includes rate limiting between downloads to avoid
-    YouTube throttling.
+    and OpenCV. Downloads run on a bounded thread pool and share a
+    token-bucket throttle (one download per DOWNLOAD_DELAY_SECONDS on
+    average) to avoid YouTube throttling.
     """
 
     DOWNLOAD_DELAY_SECONDS = 5
+    DECODE_MODES = ("auto", "seek", "stream")
+    DECODE_PROBE_FRAMES = 30
+    SAMPLING_MODES = ("interval", "scene")
+    SCENE_ANALYSIS_STEP_SECONDS = 0.5
+    SCENE_MIN_GAP_SECONDS = 3.0
+    SCENE_MAX_GAP_SECONDS = 120.0
+    SCENE_THRESHOLD = 0.4
+    BEST_FRAME_CANDIDATES = 7
+    SPARSE_CLIP_SECONDS = 2.0
+    SPARSE_FORMAT = "bestvideo[height<=720][ext=mp4]/best[height<=720][ext=mp4]/best"
+    CLIP_EXTENSIONS = (".mp4", ".webm", ".mkv")
+    MANIFEST_FILENAME = "manifest.jsonl"
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        decode_mode: str = "auto",
+        sampling: str = "interval",
+        min_gap_seconds: float = SCENE_MIN_GAP_SECONDS,
+        max_gap_seconds: float = SCENE_MAX_GAP_SECONDS,
+        download_workers: int = 1,
+        interval_seconds: int = 30,
+        sparse: bool = False,
+        search_cache: SearchCache | None = None,
+        refresh_search: bool = False,
+        best_frame_window: float = 0.0,
+    ) -> None:
+        """Initialize the collector.
+
+        Args:
+            decode_mode: Frame decode strategy passed to extract_frames
+                by collect(). One of "auto", "seek" or "stream".
+            sampling: Frame sampling mode passed to extract_frames by
+                collect(). One of "interval" or "scene".
+            min_gap_seconds: Minimum gap between scene-sampled frames.
+            max_gap_seconds: Maximum gap between scene-sampled frames.
+            download_workers: Number of videos downloaded concurrently.
+            interval_seconds: Seconds between frames for interval sampling.
+            sparse: If True, download only short clips around each sample
+                timestamp instead of the full video. Requires interval
+                sampling.
+            search_cache: Optional SearchCache consulted before querying
+                YouTube in search_videos.
+            refresh_search: If True, always query YouTube and overwrite
+                the cached results.
+            best_frame_window: Seconds around each interval sample point
+                scored for sharpness and exposure; 0 disables it.
+
+        Raises:
+            ValueError: If sparse downloads are combined with scene sampling.
+        """
+        if sparse and sampling != "interval":
+            raise ValueError("Sparse downloads only support interval sampling")
+
+        self._interval_seconds = interval_seconds
+        self._sparse = sparse
+        self._search_cache = search_cache
+        self._refresh_search = refresh_search
+        self._best_frame_window = best_frame_window
+        self._decode_mode = decode_mode
+        self._sampling = sampling
+        self._min_gap_seconds = min_gap_seconds
+        self._max_gap_seconds = max_gap_seconds
+        self._download_workers = max(1, download_workers)
+        self._download_throttle = _TokenBucket(
+            rate_per_second=1.0 / self.DOWNLOAD_DELAY_SECONDS,
+            capacity=self._download_workers,
+        )
         self._ydl_search_opts: dict = {
             "quiet": True,
             "no_warnings": True,
@@ -39,16 +152,34 @@ class YouTubeCollector:
             "merge_output_format": "mp4",
         }
 
-    def search_videos(self, query: str, max_results: int = 5) -> list[dict]:
+    def search_videos(
+        self,
+        query: str,
+        max_results: int = 5,
+        refresh: bool = False,
+    ) -> list[dict]:
         """Search YouTube for videos matching the query.
 
+        Fresh results from the search cache are returned without a
+        network call, unless refresh is set.
+
         Args:
             query: Search query string.
             max_results: Maximum number of results to return.
+            refresh: If True, bypass the cache and re-query YouTube.
 
         Returns:
             List of dicts with keys: video_id, title, url, duration.
         """
+        if self._search_cache is not None and not refresh:
+            cached = self._search_cache.get(query, max_results)
+            if cached is not None:
+                logger.info(
+                    "Using cached search results for '%s' (%d videos)",
+                    query, len(cached),
+                )
+                return cached
+
         search_query = f"ytsearch{max_results}:{query}"
         opts = {**self._ydl_search_opts}
 
@@ -77,6 +208,10 @@ class YouTubeCollector:
             })
 
         logger.info("Found %d videos for '%s'", len(videos), query)
+
+        if self._search_cache is not None and videos:
+            self._search_cache.put(query, max_results, videos)
+
         return videos
 
     def download_video(self, video_url: str, output_dir: str) -> str:
@@ -125,25 +260,237 @@ class YouTubeCollector:
         logger.info("Downloaded: %s", filepath)
         return filepath
 
+    def fetch_duration(self, video_url: str) -> float:
+        """Fetch the duration of a video without downloading it.
+
+        Args:
+            video_url: Full YouTube video URL.
+
+        Returns:
+            Duration in seconds.
+
+        Raises:
+            RuntimeError: If the metadata cannot be fetched or has no duration.
+        """
+        opts = {"quiet": True, "no_warnings": True}
+
+        try:
+            with yt_dlp.YoutubeDL(opts) as ydl:
+                info = ydl.extract_info(video_url, download=False)
+        except yt_dlp.utils.DownloadError as exc:
+            raise RuntimeError(f"Failed to fetch metadata for {video_url}: {exc}") from exc
+
+        duration = (info or {}).get("duration") or 0
+        if duration <= 0:
+            raise RuntimeError(f"Unknown duration for {video_url}")
+
+        return float(duration)
+
+    def download_clips(
+        self,
+        video_url: str,
+        output_dir: str,
+        timestamps: list[float],
+        clip_seconds: float = SPARSE_CLIP_SECONDS,
+    ) -> list[tuple[float, str]]:
+        """Download short video-only clips starting at each timestamp.
+
+        Uses yt-dlp's download_ranges support, so only the requested
+        sections are fetched instead of the full video.
+
+        Args:
+            video_url: Full YouTube video URL.
+            output_dir: Directory to save the clips.
+            timestamps: Clip start times in seconds.
+            clip_seconds: Length of each clip in seconds.
+
+        Returns:
+            List of (start_seconds, filepath) tuples sorted by start time,
+            for the requested timestamps only. Clips left in output_dir
+            by earlier calls at other timestamps are ignored.
+
+        Raises:
+            RuntimeError: If the download fails or produces no clips.
+        """
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+        opts = {
+            **self._ydl_download_opts,
+            "format": self.SPARSE_FORMAT,
+            "outtmpl": os.path.join(output_dir, "%(id)s_clip_%(section_start)s.%(ext)s"),
+            "download_ranges": yt_dlp.utils.download_range_func(
+                None, [(t, t + clip_seconds) for t in timestamps],
+            ),
+        }
+
+        logger.info(
+            "Downloading %d clips of %.1fs: %s",
+            len(timestamps), clip_seconds, video_url,
+        )
+
+        try:
+            with yt_dlp.YoutubeDL(opts) as ydl:
+                info = ydl.extract_info(video_url, download=True)
+        except yt_dlp.utils.DownloadError as exc:
+            raise RuntimeError(f"Failed to download clips of {video_url}: {exc}") from exc
+
+        if info is None:
+            raise RuntimeError(f"No info returned for {video_url}")
+
+        prefix = f"{info.get('id', 'video')}_clip_"
+        requested = {round(t, 3) for t in timestamps}
+        clips: list[tuple[float, str]] = []
+
+        for filename in os.listdir(output_dir):
+            stem, ext = os.path.splitext(filename)
+            if not stem.startswith(prefix) or ext not in self.CLIP_EXTENSIONS:
+                continue
+            try:
+                start = float(stem[len(prefix):])
+            except ValueError:
+                continue
+            if round(start, 3) in requested:
+                clips.append((start, os.path.join(output_dir, filename)))
+
+        if not clips:
+            raise RuntimeError(f"No clips downloaded for {video_url}")
+
+        clips.sort()
+        total_bytes = sum(os.path.getsize(path) for _, path in clips)
+        logger.info(
+            "Downloaded %d clips (%.1f MB) for %s",
+            len(clips), total_bytes / 1e6, video_url,
+        )
+        return clips
+
+    def extract_clip_frames(
+        self,
+        clips: list[tuple[float, str]],
+        output_dir: str,
+        video_id: str,
+        best_frame_window: float = 0.0,
+    ) -> list[str]:
+        """Extract one frame from each downloaded clip.
+
+        Takes the first frame of the clip, or with best_frame_window set,
+        the sharpest, best exposed frame in that many seconds from the
+        clip start. Frames are named after their frame number in the
+        full video, so they match what extract_frames would produce for
+        the same timestamps.
+
+        Args:
+            clips: (start_seconds, filepath) tuples from download_clips.
+            output_dir: Directory to save extracted frame images.
+            video_id: YouTube video ID used in frame filenames.
+            best_frame_window: Seconds from the clip start to score.
+
+        Returns:
+            List of file paths for the extracted JPEG frames.
+        """
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+        frame_paths: list[str] = []
+
+        for start, clip_path in clips:
+            cap = cv2.VideoCapture(clip_path)
+            if not cap.isOpened():
+                logger.warning("Cannot open clip: %s", clip_path)
+                continue
+
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            if fps <= 0:
+                fps = 30.0
+
+            window_frames = int(fps * best_frame_window)
+            if window_frames > 1:
+                picked = next(self._iter_best_frames(
+                    cap, [window_frames // 2], "stream", window_frames,
+                ), None)
+            else:
+                success, frame = cap.read()
+                picked = (0, frame) if success else None
+            cap.release()
+
+            if picked is None:
+                logger.warning("No frame decoded from clip: %s", clip_path)
+                continue
+
+            offset, frame = picked
+            frame_number = int(round(start * fps)) + offset
+            frame_path = os.path.join(
+                output_dir, f"{video_id}_frame_{frame_number:06d}.jpg",
+            )
+            cv2.imwrite(frame_path, frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
+            frame_paths.append(frame_path)
+
+        logger.info(
+            "Extracted %d frames from %d clips of %s",
+            len(frame_paths), len(clips), video_id,
+        )
+        return frame_paths
+
     def extract_frames(
         self,
         video_path: str,
         output_dir: str,
         interval_seconds: int = 30,
+        decode_mode: str = "auto",
+        sampling: str = "interval",
+        min_gap_seconds: float = SCENE_MIN_GAP_SECONDS,
+        max_gap_seconds: float = SCENE_MAX_GAP_SECONDS,
+        scene_threshold: float = SCENE_THRESHOLD,
+        best_frame_window: float = 0.0,
     ) -> list[str]:
-        """Extract frames from a video at regular intervals.
+        """Extract frames from a video at regular intervals or on scene changes.
+
+        In "interval" sampling, frames can be reached either by seeking to
+        each sample point ("seek") or by streaming forward with
+        grab()/retrieve() and only converting the sampled frames
+        ("stream"). In "auto" mode the cheaper strategy is picked per
+        video from the sampling interval and the measured keyframe
+        spacing. With best_frame_window set, a window of frames around
+        each sample point is scored and only the sharpest, best exposed
+        frame is kept, see _iter_best_frames.
+
+        In "scene" sampling the video is streamed and a frame is only
+        kept when it differs visibly from the last kept frame, see
+        _iter_scene_frames. decode_mode, interval_seconds and
+        best_frame_window are ignored.
 
         Args:
             video_path: Path to the video file.
             output_dir: Directory to save extracted frame images.
             interval_seconds: Seconds between each extracted frame.
+            decode_mode: One of "auto", "seek" or "stream".
+            sampling: One of "interval" or "scene".
+            min_gap_seconds: Scene sampling only. Minimum time between
+                two kept frames.
+            max_gap_seconds: Scene sampling only. A frame is kept after
+                this long even without a scene change.
+            scene_threshold: Scene sampling only. Histogram distance
+                (0-1, Bhattacharyya) that counts as a scene change.
+            best_frame_window: Interval sampling only. Length in seconds
+                of the window scored around each sample point; 0 keeps
+                the frame exactly on the sample point.
 
         Returns:
             List of file paths for the extracted JPEG frames.
 
         Raises:
+            ValueError: If decode_mode or sampling is not supported.
             RuntimeError: If the video cannot be opened.
         """
+        if decode_mode not in self.DECODE_MODES:
+            raise ValueError(
+                f"Unknown decode_mode '{decode_mode}', "
+                f"expected one of {self.DECODE_MODES}"
+            )
+        if sampling not in self.SAMPLING_MODES:
+            raise ValueError(
+                f"Unknown sampling '{sampling}', "
+                f"expected one of {self.SAMPLING_MODES}"
+            )
+
         Path(output_dir).mkdir(parents=True, exist_ok=True)
 
         cap = cv2.VideoCapture(video_path)
@@ -155,24 +502,45 @@ class YouTubeCollector:
             fps = 30.0
 
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        frame_interval = int(fps * interval_seconds)
         video_name = Path(video_path).stem
 
-        logger.info(
-            "Extracting frames from %s (fps=%.1f, total=%d, interval=%ds)",
-            video_path, fps, total_frames, interval_seconds,
-        )
+        if sampling == "scene":
+            mode = "scene"
+            frames = self._iter_scene_frames(
+                cap, fps, min_gap_seconds, max_gap_seconds, scene_threshold,
+            )
+            logger.info(
+                "Extracting frames from %s (fps=%.1f, total=%d, scene "
+                "threshold=%.2f, gap=%.1f-%.1fs)",
+                video_path, fps, total_frames, scene_threshold,
+                min_gap_seconds, max_gap_seconds,
+            )
+        else:
+            frame_interval = max(1, int(fps * interval_seconds))
 
-        frame_paths: list[str] = []
-        frame_number = 0
+            # Always sample the first frame, even if the frame count is unknown
+            sample_numbers = list(range(0, max(total_frames, 1), frame_interval))
 
-        while True:
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-            success, frame = cap.read()
+            mode = decode_mode
+            if mode == "auto":
+                mode = self._choose_decode_mode(cap, frame_interval, total_frames)
 
-            if not success:
-                break
+            window_frames = int(fps * best_frame_window)
+            if window_frames > 1:
+                frames = self._iter_best_frames(
+                    cap, sample_numbers, mode, window_frames,
+                )
+            else:
+                frames = self._iter_sampled_frames(cap, sample_numbers, mode)
+            logger.info(
+                "Extracting frames from %s (fps=%.1f, total=%d, interval=%ds, mode=%s)",
+                video_path, fps, total_frames, interval_seconds, mode,
+            )
 
+        frame_paths: list[str] = []
+        started = time.perf_counter()
+
+        for frame_number, frame in frames:
             frame_filename = f"{video_name}_frame_{frame_number:06d}.jpg"
             frame_path = os.path.join(output_dir, frame_filename)
 
@@ -183,14 +551,433 @@ class YouTubeCollector:
                 "Extracted frame %d -> %s", frame_number, frame_filename,
             )
 
-            frame_number += frame_interval
+        cap.release()
 
-            if frame_number >= total_frames:
+        elapsed = time.perf_counter() - started
+        rate = len(frame_paths) / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            "Extracted %d frames from %s in %.1fs (%.2f frames/s, mode=%s)",
+            len(frame_paths), video_path, elapsed, rate, mode,
+        )
+        return frame_paths
+
+    def _choose_decode_mode(
+        self,
+        cap: cv2.VideoCapture,
+        frame_interval: int,
+        total_frames: int,
+    ) -> str:
+        """Pick "seek" or "stream" decoding for a single video.
+
+        A seek has to decode forward from the previous keyframe, so its
+        cost grows with the keyframe spacing. Streaming has to decode
+        every frame between two samples. This probes both costs on the
+        open capture (a short run of grab() calls and one seek into the
+        middle of the video) and streams whenever skipping
+        frame_interval frames is cheaper than a seek.
+
+        Args:
+            cap: Opened video capture, rewound to frame 0 on return.
+            frame_interval: Number of frames between two samples.
+            total_frames: Total frame count reported by the container.
+
+        Returns:
+            "seek" or "stream".
+        """
+        probe_frames = min(self.DECODE_PROBE_FRAMES, frame_interval)
+        if total_frames <= frame_interval or probe_frames <= 0:
+            # Only one sample point, nothing to choose between
+            return "seek"
+
+        started = time.perf_counter()
+        grabbed = 0
+        for _ in range(probe_frames):
+            if not cap.grab():
                 break
+            grabbed += 1
+        grab_cost = (time.perf_counter() - started) / max(grabbed, 1)
 
-        cap.release()
-        logger.info("Extracted %d frames from %s", len(frame_paths), video_path)
-        return frame_paths
+        started = time.perf_counter()
+        cap.set(cv2.CAP_PROP_POS_FRAMES, total_frames // 2)
+        cap.grab()
+        seek_cost = time.perf_counter() - started
+
+        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+        if grabbed == 0 or grab_cost <= 0:
+            return "seek"
+
+        # Seek cost expressed as an equivalent number of decoded frames,
+        # i.e. roughly how far back the previous keyframe sits.
+        keyframe_spacing = seek_cost / grab_cost
+        mode = "stream" if frame_interval <= keyframe_spacing else "seek"
+
+        logger.debug(
+            "Decode probe: grab=%.2fms seek=%.2fms keyframe_spacing~%.0f "
+            "frames, interval=%d frames -> %s",
+            grab_cost * 1000, seek_cost * 1000, keyframe_spacing,
+            frame_interval, mode,
+        )
+        return mode
+
+    def _iter_scene_frames(
+        self,
+        cap: cv2.VideoCapture,
+        fps: float,
+        min_gap_seconds: float,
+        max_gap_seconds: float,
+        threshold: float,
+    ) -> Iterator[tuple[int, np.ndarray]]:
+        """Yield (frame_number, frame) for frames that start a new scene.
+
+        Streams the capture and inspects one frame every
+        SCENE_ANALYSIS_STEP_SECONDS. Each inspected frame is scored
+        against the last kept frame using the Bhattacharyya distance
+        between their downscaled HSV histograms. A frame is
+        kept when the distance reaches threshold and at least
+        min_gap_seconds have passed, or when max_gap_seconds have passed
+        without a scene change. The first frame is always kept.
+
+        Args:
+            cap: Opened video capture positioned at frame 0.
+            fps: Frame rate of the video.
+            min_gap_seconds: Minimum time between two kept frames.
+            max_gap_seconds: Maximum time between two kept frames.
+            threshold: Histogram distance that counts as a scene change.
+
+        Yields:
+            Tuples of frame number and decoded BGR frame.
+        """
+        step = max(1, int(fps * self.SCENE_ANALYSIS_STEP_SECONDS))
+        min_gap = int(fps * min_gap_seconds)
+        max_gap = max(step, int(fps * max_gap_seconds))
+
+        last_hist: np.ndarray | None = None
+        last_kept = 0
+        frame_number = 0
+
+        while True:
+            if frame_number % step == 0:
+                success, frame = cap.read()
+                if not success:
+                    return
+
+                hist = self._scene_signature(frame)
+                gap = frame_number - last_kept
+
+                if last_hist is None:
+                    keep = True
+                elif gap < min_gap:
+                    keep = False
+                elif gap >= max_gap:
+                    keep = True
+                else:
+                    delta = cv2.compareHist(
+                        last_hist, hist, cv2.HISTCMP_BHATTACHARYYA,
+                    )
+                    keep = delta >= threshold
+
+                if keep:
+                    logger.debug(
+                        "Scene frame %d kept (gap=%.1fs)",
+                        frame_number, gap / fps,
+                    )
+                    last_hist = hist
+                    last_kept = frame_number
+                    yield frame_number, frame
+            elif not cap.grab():
+                return
+
+            frame_number += 1
+
+    @staticmethod
+    def _scene_signature(frame: np.ndarray) -> np.ndarray:
+        """Compute a normalized HSV histogram of a downscaled frame.
+
+        Args:
+            frame: BGR frame.
+
+        Returns:
+            Normalized 3D H x S x V histogram (16x8x8 bins) usable with
+            cv2.compareHist.
+        """
+        small = cv2.resize(frame, (160, 90), interpolation=cv2.INTER_AREA)
+        hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+        hist = cv2.calcHist(
+            [hsv], [0, 1, 2], None, [16, 8, 8], [0, 180, 0, 256, 0, 256],
+        )
+        cv2.normalize(hist, hist, alpha=1.0, norm_type=cv2.NORM_L1)
+        return hist
+
+    def _iter_best_frames(
+        self,
+        cap: cv2.VideoCapture,
+        frame_numbers: list[int],
+        decode_mode: str,
+        window_frames: int,
+    ) -> Iterator[tuple[int, np.ndarray]]:
+        """Yield the best-quality frame from a window around each sample point.
+
+        Decodes up to BEST_FRAME_CANDIDATES evenly spaced frames in a
+        window of window_frames centred on each requested frame number
+        and keeps the one with the highest _frame_quality score. Frames
+        in between are only grab()bed. In "seek" mode the capture seeks
+        to the start of each window; in "stream" mode it streams there.
+
+        Args:
+            cap: Opened video capture positioned at frame 0.
+            frame_numbers: Ascending sample frame numbers.
+            decode_mode: "seek" or "stream".
+            window_frames: Window length in frames.
+
+        Yields:
+            Tuples of the chosen frame number and its BGR frame.
+            Iteration stops at the first window without a readable frame.
+        """
+        half = window_frames // 2
+        step = max(1, window_frames // max(1, self.BEST_FRAME_CANDIDATES - 1))
+        position = 0
+
+        for center in frame_numbers:
+            # Windows never reach back behind the previous one
+            start = max(0, center - half, position)
+            end = center + half
+
+            if decode_mode == "seek" and start != position:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+                position = start
+            while position < start:
+                if not cap.grab():
+                    return
+                position += 1
+
+            best: tuple[float, int, np.ndarray] | None = None
+
+            while position <= end:
+                if (position - start) % step == 0:
+                    success, frame = cap.read()
+                    if not success:
+                        break
+                    score = self._frame_quality(frame)
+                    if best is None or score > best[0]:
+                        best = (score, position, frame)
+                elif not cap.grab():
+                    break
+                position += 1
+
+            if best is None:
+                return
+
+            logger.debug(
+                "Sample %d: picked frame %d (quality %.1f)",
+                center, best[1], best[0],
+            )
+            yield best[1], best[2]
+
+    @staticmethod
+    def _frame_quality(frame: np.ndarray) -> float:
+        """Score a frame by sharpness and exposure.
+
+        Sharpness is the variance of the Laplacian of a downscaled
+        grayscale copy (low for motion blur). It is weighted by the
+        fraction of pixels that are neither crushed to black nor blown
+        out to white.
+
+        Args:
+            frame: BGR frame.
+
+        Returns:
+            Quality score, higher is better.
+        """
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        height, width = gray.shape
+        if width > 320:
+            gray = cv2.resize(
+                gray, (320, int(height * 320 / width)), interpolation=cv2.INTER_AREA,
+            )
+
+        sharpness = cv2.Laplacian(gray, cv2.CV_64F).var()
+        well_exposed = np.count_nonzero((gray > 16) & (gray < 239)) / gray.size
+        return float(sharpness * well_exposed)
+
+    @staticmethod
+    def _iter_sampled_frames(
+        cap: cv2.VideoCapture,
+        frame_numbers: list[int],
+        decode_mode: str,
+    ) -> Iterator[tuple[int, np.ndarray]]:
+        """Yield (frame_number, frame) for each requested frame number.
+
+        In "seek" mode each frame is reached with CAP_PROP_POS_FRAMES.
+        In "stream" mode the capture is advanced with grab() and only the
+        requested frames are retrieve()d into BGR images.
+
+        Args:
+            cap: Opened video capture positioned at frame 0.
+            frame_numbers: Ascending frame numbers to decode.
+            decode_mode: "seek" or "stream".
+
+        Yields:
+            Tuples of frame number and decoded BGR frame. Iteration stops
+            at the first frame that cannot be read.
+        """
+        position = 0
+
+        for frame_number in frame_numbers:
+            if decode_mode == "seek":
+                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+            else:
+                while position < frame_number:
+                    if not cap.grab():
+                        return
+                    position += 1
+
+            success, frame = cap.read()
+            if not success:
+                return
+
+            position = frame_number + 1
+            yield frame_number, frame
+
+    def _extraction_params(self) -> dict:
+        """Return the settings that determine which frames are extracted.
+
+        Stored in the manifest; a change invalidates earlier extractions.
+        """
+        params: dict = {
+            "sparse": self._sparse,
+            "sampling": self._sampling,
+        }
+        if self._sampling == "scene":
+            params["min_gap_seconds"] = self._min_gap_seconds
+            params["max_gap_seconds"] = self._max_gap_seconds
+        else:
+            params["interval_seconds"] = self._interval_seconds
+            if self._best_frame_window > 0:
+                params["best_frame_window"] = self._best_frame_window
+        return params
+
+    def _process_video(
+        self,
+        video: dict,
+        output_dir: str,
+        manifest: VideoManifest,
+        position: int,
+        total: int,
+    ) -> dict | None:
+        """Download one video and extract its frames.
+
+        Runs on a download worker thread. Videos already in the manifest
+        with the same extraction parameters are returned as is; if only
+        the parameters changed, frames are re-extracted from the
+        existing download. Otherwise waits for a download token, then
+        extracts frames as soon as the download finishes. In sparse mode
+        only short clips around the sample timestamps are downloaded.
+
+        Args:
+            video: Search result dict from search_videos.
+            output_dir: Base output directory for downloads and frames.
+            manifest: Manifest of videos already collected in output_dir.
+            position: 1-based position of the video in the search results.
+            total: Number of videos in the search results.
+
+        Returns:
+            Dict with keys: video_id, title, frames (list of paths), or
+            None if the download or extraction failed.
+        """
+        video_id = video["video_id"]
+        params = self._extraction_params()
+
+        cached = manifest.lookup(video_id, params)
+        if cached is not None:
+            logger.info(
+                "Skipping video %d/%d: %s already collected (%d frames)",
+                position, total, video_id, len(cached["frames"]),
+            )
+            return {
+                "video_id": video_id,
+                "title": cached.get("title", video["title"]),
+                "frames": cached["frames"],
+            }
+
+        previous = manifest.get(video_id)
+        video_path = previous.get("video_path") if previous else None
+        if self._sparse or not (video_path and os.path.exists(video_path)):
+            video_path = None
+            waited = self._download_throttle.acquire()
+            if waited >= 0.1:
+                logger.info("Waited %.1f seconds for a download slot", waited)
+        else:
+            logger.info(
+                "Re-extracting %s with new parameters from %s",
+                video_id, video_path,
+            )
+
+        logger.info(
+            "Processing video %d/%d: %s (%s)",
+            position, total, video["title"], video_id,
+        )
+
+        frames_dir = os.path.join(output_dir, "frames")
+
+        try:
+            if self._sparse:
+                duration = video.get("duration") or self.fetch_duration(video["url"])
+                timestamps = [
+                    float(t) for t in range(0, int(duration), self._interval_seconds)
+                ] or [0.0]
+                clips = self.download_clips(
+                    video["url"], os.path.join(output_dir, "clips"), timestamps,
+                )
+                try:
+                    frames = self.extract_clip_frames(
+                        clips, frames_dir, video_id,
+                        best_frame_window=self._best_frame_window,
+                    )
+                finally:
+                    # Clips are only needed for this one extraction
+                    for _, clip_path in clips:
+                        if os.path.exists(clip_path):
+                            os.remove(clip_path)
+            else:
+                if video_path is None:
+                    video_path = self.download_video(
+                        video["url"], os.path.join(output_dir, "videos"),
+                    )
+                frames = self.extract_frames(
+                    video_path,
+                    frames_dir,
+                    interval_seconds=self._interval_seconds,
+                    decode_mode=self._decode_mode,
+                    sampling=self._sampling,
+                    min_gap_seconds=self._min_gap_seconds,
+                    max_gap_seconds=self._max_gap_seconds,
+                    best_frame_window=self._best_frame_window,
+                )
+        except RuntimeError as exc:
+            logger.error("Failed to process video %s: %s", video_id, exc)
+            return None
+
+        if previous is not None:
+            # Drop frames from the old extraction so they are not analyzed
+            for stale in set(previous.get("frames", [])) - set(frames):
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+        manifest.record({
+            "video_id": video_id,
+            "title": video["title"],
+            "url": video["url"],
+            "video_path": video_path,
+            "params": params,
+            "frames": frames,
+        })
+
+        return {
+            "video_id": video_id,
+            "title": video["title"],
+            "frames": frames,
+        }
 
     def collect(
         self,
@@ -200,6 +987,9 @@ class YouTubeCollector:
     ) -> list[dict]:
         """Run the full collection pipeline: search, download, extract frames.
 
+        Videos recorded in output_dir's manifest with the current
+        extraction parameters are not downloaded or extracted again.
+
         Args:
             search_query: YouTube search query.
             output_dir: Base output directory for downloads and frames.
@@ -208,44 +998,38 @@ class YouTubeCollector:
         Returns:
             List of dicts with keys: video_id, title, frames (list of paths).
         """
-        videos = self.search_videos(search_query, max_results=max_videos)
+        videos = self.search_videos(
+            search_query, max_results=max_videos, refresh=self._refresh_search,
+        )
         if not videos:
             logger.warning("No videos found for '%s', skipping", search_query)
             return []
 
-        results: list[dict] = []
-
-        for i, video in enumerate(videos):
-            video_id = video["video_id"]
-            video_url = video["url"]
-            video_dir = os.path.join(output_dir, "videos")
-            frames_dir = os.path.join(output_dir, "frames")
-
-            logger.info(
-                "Processing video %d/%d: %s (%s)",
-                i + 1, len(videos), video["title"], video_id,
-            )
-
-            try:
-                video_path = self.download_video(video_url, video_dir)
-                frames = self.extract_frames(video_path, frames_dir)
-            except RuntimeError as exc:
-                logger.error("Failed to process video %s: %s", video_id, exc)
-                continue
+        # Search results can repeat a video; process each one once
+        seen: set[str] = set()
+        videos = [
+            v for v in videos
+            if not (v["video_id"] in seen or seen.add(v["video_id"]))
+        ]
 
-            results.append({
-                "video_id": video_id,
-                "title": video["title"],
-                "frames": frames,
-            })
+        manifest = VideoManifest(os.path.join(output_dir, self.MANIFEST_FILENAME))
+        workers = min(self._download_workers, len(videos))
 
-            # Rate-limit between downloads
-            if i < len(videos) - 1:
-                logger.info(
-                    "Waiting %d seconds before next download...",
-                    self.DOWNLOAD_DELAY_SECONDS,
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="download",
+        ) as pool:
+            futures = [
+                pool.submit(
+                    self._process_video,
+                    video, output_dir, manifest, i + 1, len(videos),
                 )
-                time.sleep(self.DOWNLOAD_DELAY_SECONDS)
+                for i, video in enumerate(videos)
+            ]
+            # Keep search order regardless of completion order
+            results = [
+                result for result in (f.result() for f in futures)
+                if result is not None
+            ]
 
         logger.info(
             "Collection complete: %d/%d videos processed for '%s'",
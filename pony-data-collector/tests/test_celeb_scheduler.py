@@ -0,0 +1,93 @@
+"""Tests for concurrent analysis with the offline FakeGeminiModel."""
+
+import threading
+from collections import Counter
+
+import pytest
+from PIL import Image
+
+from analyzers.batch_processor import BatchProcessor, CelebJob
+from analyzers.celeb_scheduler import CelebScheduler
+from analyzers.gemini_analyzer import GeminiAnalyzer
+from analyzers.model_backends import FakeGeminiModel
+
+CELEBS = {"jennie": 7, "wonyoung": 12, "suzy": 3}
+
+
+def _write_frames(frames_dir, count: int, shade: int) -> None:
+    frames_dir.mkdir(parents=True)
+    for i in range(count):
+        color = (shade, (i * 37) % 256, (i * 91) % 256)
+        Image.new("RGB", (32, 32), color).save(frames_dir / f"frame_{i:06d}.jpg")
+
+
+def _processor(max_in_flight: int) -> BatchProcessor:
+    analyzer = GeminiAnalyzer(
+        api_key="unused",
+        model=FakeGeminiModel(seed=1, latency_seconds=0.01),
+    )
+    return BatchProcessor(
+        analyzer,
+        rate_limit_per_minute=600_000,
+        batch_size=3,
+        max_in_flight=max_in_flight,
+    )
+
+
+@pytest.fixture
+def recorded(monkeypatch) -> Counter:
+    """Count CelebJob.record calls per (celeb_id, frame file)."""
+    counts: Counter = Counter()
+    record = CelebJob.record
+
+    def counting_record(job, frame_path, analysis, weight):
+        counts[job.celeb_id, frame_path] += 1
+        record(job, frame_path, analysis, weight)
+
+    monkeypatch.setattr(CelebJob, "record", counting_record)
+    return counts
+
+
+def test_process_celeb_records_every_frame_once(tmp_path, recorded) -> None:
+    frames_dir = tmp_path / "frames"
+    _write_frames(frames_dir, 10, 0)
+
+    dna = _processor(max_in_flight=4).process_celeb("jennie", "Jennie", str(frames_dir))
+
+    assert dna["frames_analyzed"] == 10
+    assert sorted(recorded.values()) == [1] * 10
+
+
+@pytest.mark.parametrize("max_in_flight", [1, 4])
+def test_scheduler_finishes_every_celeb(tmp_path, recorded, max_in_flight) -> None:
+    processor = _processor(max_in_flight)
+    finished: dict[str, tuple[dict, bool]] = {}
+
+    def on_finished(celeb_id: str, dna: dict, complete: bool) -> None:
+        finished[celeb_id] = (dna, complete)
+
+    scheduler = CelebScheduler(processor, on_finished, max_in_flight=max_in_flight)
+    runner = threading.Thread(target=scheduler.run)
+    runner.start()
+
+    # Submitted while run is already waiting, as run_pipeline does
+    jobs = []
+    for shade, (celeb_id, count) in enumerate(CELEBS.items()):
+        frames_dir = tmp_path / celeb_id / "frames"
+        _write_frames(frames_dir, count, shade * 80)
+        job = processor.start_celeb(celeb_id, celeb_id.title(), str(frames_dir))
+        jobs.append(job)
+        scheduler.submit(job)
+    scheduler.close()
+
+    runner.join(timeout=30)
+    assert not runner.is_alive()
+
+    assert all(job.done and job.complete and job.in_flight == 0 for job in jobs)
+    assert set(finished) == set(CELEBS)
+    for celeb_id, count in CELEBS.items():
+        dna, complete = finished[celeb_id]
+        assert complete
+        assert dna["frames_analyzed"] == count
+    assert len(recorded) == sum(CELEBS.values())
+    assert set(recorded.values()) == {1}
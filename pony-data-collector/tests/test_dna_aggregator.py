@@ -0,0 +1,237 @@
+"""Equivalence of DnaAggregator with the original list-based DNA merge.
+
+The reference functions below are the merge BatchProcessor used before
+results were folded into a DnaAggregator (_average_metrics,
+_merge_patterns, _merge_subdict, _merge_adaptation_rules and
+_most_common), as module functions with the same results. The
+default aggregator must reproduce them exactly, including which value
+wins a tie and how means are rounded.
+"""
+
+import json
+import random
+from collections import Counter
+
+import pytest
+
+from analyzers.dna_aggregator import DnaAggregator
+from analyzers.frame_analysis import FrameAnalysis
+
+
+def _most_common(values: list[str], weights: list[int] | None = None) -> str:
+    if not values:
+        return ""
+    if weights is None:
+        return Counter(values).most_common(1)[0][0]
+    counter: Counter = Counter()
+    for value, weight in zip(values, weights):
+        counter[value] += weight
+    return counter.most_common(1)[0][0]
+
+
+def _merge_subdict(records, string_keys=None, list_keys=None, weights=None) -> dict:
+    if weights is None:
+        weights = [1] * len(records)
+
+    result: dict = {}
+
+    for key in (string_keys or []):
+        weighted = [
+            (getattr(r, key), w) for r, w in zip(records, weights)
+            if getattr(r, key)
+        ]
+        result[key] = _most_common(
+            [v for v, _ in weighted], [w for _, w in weighted],
+        ) if weighted else ""
+
+    for key in (list_keys or []):
+        counter: Counter = Counter()
+        for r, w in zip(records, weights):
+            for item in getattr(r, key):
+                counter[item] += w
+        if counter:
+            result[key] = [item for item, _ in counter.most_common(5)]
+        else:
+            result[key] = []
+
+    return result
+
+
+def _merge_patterns(analyses: list[FrameAnalysis], weights: list[int]) -> dict:
+    pattern_list = [a.makeup_analysis for a in analyses]
+
+    eye_pattern = _merge_subdict(
+        [p.eye_pattern for p in pattern_list],
+        string_keys=["shape", "liner_style", "shadow_placement", "lash_emphasis"],
+        list_keys=["shadow_tones"],
+        weights=weights,
+    )
+    lip_pattern = _merge_subdict(
+        [p.lip_pattern for p in pattern_list],
+        string_keys=["technique", "color_family", "finish", "inner_color_intensity"],
+        weights=weights,
+    )
+    base_pattern = _merge_subdict(
+        [p.base_pattern for p in pattern_list],
+        string_keys=["coverage", "finish", "contour_intensity", "blush_style"],
+        list_keys=["highlight_placement"],
+        weights=weights,
+    )
+
+    balance_weighted = [
+        (p.balance_rule, w)
+        for p, w in zip(pattern_list, weights)
+        if p.balance_rule
+    ]
+    balance_rule = _most_common(
+        [r for r, _ in balance_weighted],
+        [w for _, w in balance_weighted],
+    ) if balance_weighted else ""
+
+    return {
+        "eye_pattern": eye_pattern,
+        "lip_pattern": lip_pattern,
+        "base_pattern": base_pattern,
+        "balance_rule": balance_rule,
+    }
+
+
+def _average_metrics(analyses: list[FrameAnalysis], weights: list[int]) -> dict:
+    metrics_list = [a.five_metrics for a in analyses]
+    count = sum(weights)
+
+    def mean(values: list[float]) -> float:
+        return sum(v * w for v, w in zip(values, weights)) / count
+
+    def most_common(values: list[str]) -> str:
+        return _most_common(values, weights)
+
+    balance_descriptions = [m.harmony_index.optimal_balance for m in metrics_list]
+
+    return {
+        "visual_weight_score": round(mean([m.visual_weight_score for m in metrics_list])),
+        "canthal_tilt": {
+            "angle_degrees": round(
+                mean([m.canthal_tilt.angle_degrees for m in metrics_list]), 1,
+            ),
+            "classification": most_common(
+                [m.canthal_tilt.classification for m in metrics_list]
+            ),
+        },
+        "midface_ratio": {
+            "ratio_percent": round(
+                mean([m.midface_ratio.ratio_percent for m in metrics_list]), 1,
+            ),
+            "philtrum_relative": most_common(
+                [m.midface_ratio.philtrum_relative for m in metrics_list]
+            ),
+            "youth_score": round(mean([m.midface_ratio.youth_score for m in metrics_list])),
+        },
+        "luminosity_score": {
+            "current": round(mean([m.luminosity_score.current for m in metrics_list])),
+            "potential_with_kglow": round(
+                mean([m.luminosity_score.potential_with_kglow for m in metrics_list])
+            ),
+            "texture_grade": most_common(
+                [m.luminosity_score.texture_grade for m in metrics_list]
+            ),
+        },
+        "harmony_index": {
+            "overall": round(mean([m.harmony_index.overall for m in metrics_list])),
+            "symmetry_score": round(
+                mean([m.harmony_index.symmetry_score for m in metrics_list])
+            ),
+            "optimal_balance": _most_common(
+                [b for b in balance_descriptions if b],
+                [w for b, w in zip(balance_descriptions, weights) if b],
+            ) or "",
+        },
+    }
+
+
+def _merge_adaptation_rules(analyses: list[FrameAnalysis]) -> dict:
+    rules: dict[str, str] = {"L1_L2": "", "L3_L4": "", "L5_L6": ""}
+    for level in rules:
+        candidates = [
+            getattr(a.adaptation_rules, level)
+            for a in analyses
+            if getattr(a.adaptation_rules, level)
+        ]
+        if candidates:
+            rules[level] = max(candidates, key=len)
+    return rules
+
+
+def _random_analysis(rng: random.Random) -> FrameAnalysis:
+    """Build an analysis from small vocabularies, so ties are common."""
+
+    def word() -> str:
+        return rng.choice(["", "a", "b", "c"])
+
+    def words() -> list[str]:
+        return rng.sample(["x", "y", "z", "w"], rng.randint(0, 3))
+
+    def score() -> int:
+        return rng.randint(0, 4)
+
+    def angle() -> float:
+        # Halves and x.x5 values exercise rounding
+        return rng.choice([-2.25, -1.0, 0.05, 0.15, 1.5, 2.25, 3.35])
+
+    return FrameAnalysis.from_dict({
+        "makeup_analysis": {
+            "eye_pattern": {
+                "shape": word(), "liner_style": word(), "shadow_placement": word(),
+                "shadow_tones": words(), "lash_emphasis": word(),
+            },
+            "lip_pattern": {
+                "technique": word(), "color_family": word(), "finish": word(),
+                "inner_color_intensity": word(),
+            },
+            "base_pattern": {
+                "coverage": word(), "finish": word(), "highlight_placement": words(),
+                "contour_intensity": word(), "blush_style": word(),
+            },
+            "balance_rule": word(),
+        },
+        "five_metrics": {
+            "visual_weight_score": score(),
+            "canthal_tilt": {"angle_degrees": angle(), "classification": word()},
+            "midface_ratio": {
+                "ratio_percent": angle(), "philtrum_relative": word(),
+                "youth_score": score(),
+            },
+            "luminosity_score": {
+                "current": score(), "potential_with_kglow": score(),
+                "texture_grade": word(),
+            },
+            "harmony_index": {
+                "overall": score(), "symmetry_score": score(),
+                "optimal_balance": word(),
+            },
+        },
+        "adaptation_rules": {
+            "L1_L2": rng.choice(["", "ab", "cd", "efg"]),
+            "L3_L4": rng.choice(["", "ab", "cd", "efg"]),
+            "L5_L6": rng.choice(["", "ab", "cd", "efg"]),
+        },
+    })
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_matches_original_merge(seed: int) -> None:
+    rng = random.Random(seed)
+    analyses = [_random_analysis(rng) for _ in range(rng.randint(1, 12))]
+    weights = [rng.randint(1, 3) for _ in analyses]
+
+    aggregator = DnaAggregator()
+    for analysis, weight in zip(analyses, weights):
+        aggregator.add(analysis, weight)
+
+    expected = {
+        "makeup_analysis": _merge_patterns(analyses, weights),
+        "five_metrics": _average_metrics(analyses, weights),
+        "adaptation_rules": _merge_adaptation_rules(analyses),
+    }
+    # Compared as JSON so int vs float and list order count too
+    assert json.dumps(aggregator.snapshot()) == json.dumps(expected)
@@ -0,0 +1,37 @@
+"""Tests for FrameCheckpoint recovery after a crash mid-write."""
+
+from analyzers.frame_analysis import FrameAnalysis
+from analyzers.frame_checkpoint import FrameCheckpoint
+
+
+def _analysis(note: str) -> FrameAnalysis:
+    return FrameAnalysis.from_dict({
+        "makeup_analysis": {},
+        "five_metrics": {},
+        "adaptation_rules": {"L1_L2": note},
+    })
+
+
+def test_resumes_after_line_cut_inside_multibyte_character(tmp_path) -> None:
+    path = tmp_path / "celeb_checkpoint.jsonl"
+    checkpoint = FrameCheckpoint(str(path))
+    checkpoint.append("first", "a_frame_000000.jpg", _analysis("쿨톤 피부에는 로즈"))
+    checkpoint.append("second", "a_frame_000030.jpg", _analysis("웜톤 피부에는 코랄"))
+    checkpoint.close()
+
+    # Cut the last record in the middle of a three-byte character
+    data = path.read_bytes()
+    cut = data.rindex("코".encode("utf-8")) + 1
+    path.write_bytes(data[:cut])
+
+    checkpoint = FrameCheckpoint(str(path))
+    assert set(checkpoint.load()) == {"first"}
+
+    checkpoint.append("third", "a_frame_000060.jpg", _analysis("웜톤"))
+    checkpoint.close()
+
+    checkpoint = FrameCheckpoint(str(path))
+    completed = checkpoint.load()
+    checkpoint.close()
+    assert set(completed) == {"first", "third"}
+    assert completed["third"].adaptation_rules.L1_L2 == "웜톤"
@@ -0,0 +1,83 @@
+"""Tests for repair_json on truncated model output."""
+
+import json
+
+import pytest
+
+from analyzers.json_repair import repair_json
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        # Cut inside a string value keeps the partial string
+        ('{"a": 1, "b": "hel', {"a": 1, "b": "hel"}),
+        # Cut right after ":" or ","
+        ('{"a": 1, "b":', {"a": 1, "b": None}),
+        ('{"a": 1,', {"a": 1}),
+        # Dangling keys are dropped
+        ('{"a"', {}),
+        ('{"a": 1, "c', {"a": 1}),
+        ('{"a": 1, "c"', {"a": 1}),
+        # Partial literals and numbers are dropped with their key
+        ('{"a": 1, "b": tru', {"a": 1}),
+        ('{"a": 1, "b": Fal', {"a": 1}),
+        ('{"a": 1, "b": 1.', {"a": 1}),
+        ('{"a": 1, "b": -', {"a": 1}),
+        ('{"a": 1, "b": 2e', {"a": 1}),
+        # Array elements
+        ("[1, 2, tru", [1, 2]),
+        ("[1, 2.", [1]),
+        ('["x", "y', ["x", "y"]),
+        # Nested containers roll back only the innermost incomplete part
+        ('{"a": {"b": 1}, "c": nul', {"a": {"b": 1}}),
+        ('{"a": {"b": [1, 2', {"a": {"b": [1, 2]}}),
+        ('{"a": {"b": [1, 2.', {"a": {"b": [1]}}),
+        ('[{"x": 1}, {"y', [{"x": 1}, {}]),
+        # Non-ASCII letters outside a string are copied through
+        ('{"a": 1, "b": é', {"a": 1}),
+    ],
+)
+def test_truncated_output_parses(text: str, expected: object) -> None:
+    assert json.loads(repair_json(text)) == expected
+
+
+def test_every_truncation_of_a_response_parses() -> None:
+    response = json.dumps([
+        {
+            "score": 72,
+            "ratio": 31.5,
+            "flag": True,
+            "tones": ["rose", "warm brown"],
+            "note": "soft \"wing\" liner",
+            "nested": {"angle": -4.25, "label": None},
+        },
+        {"score": 64, "tones": [], "note": "ok"},
+    ])
+
+    for cut in range(1, len(response)):
+        json.loads(repair_json(response[:cut]))
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ('{"a": 1 "b": 2}', {"a": 1, "b": 2}),
+        ('{"a": "x"\n "b": [1 2] "c": null}', {"a": "x", "b": [1, 2], "c": None}),
+        ('[{"x": 1} {"y": true} "z"]', [{"x": 1}, {"y": True}, "z"]),
+    ],
+)
+def test_missing_commas_are_inserted(text: str, expected: object) -> None:
+    assert json.loads(repair_json(text)) == expected
+
+
+def test_unquoted_non_ascii_word_does_not_crash() -> None:
+    repaired = repair_json('{"a": 제니}')
+    assert "제니" in repaired
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(repaired)
+
+
+def test_complete_output_is_unchanged() -> None:
+    text = '{"a": [1, 2.5, true, null], "b": {"c": "d"}}'
+    assert repair_json(text) == text
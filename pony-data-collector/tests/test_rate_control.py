@@ -0,0 +1,36 @@
+"""Tests for AimdRateController's once-per-episode decrease."""
+
+import time
+
+from analyzers.rate_control import AimdRateController
+from analyzers.rate_limiter import RateLimiter
+
+
+def _controller(tmp_path) -> AimdRateController:
+    limiter = RateLimiter(str(tmp_path / "rate.sqlite"), "test", 40.0)
+    return AimdRateController(limiter, min_rate=5.0, max_rate=60.0)
+
+
+def test_errors_from_calls_sent_before_the_cut_are_ignored(tmp_path) -> None:
+    controller = _controller(tmp_path)
+    sent = time.monotonic()
+
+    controller.on_error("429", sent)
+    assert controller.rate == 20.0
+
+    # Slow calls in flight at the old rate fail long after the cut
+    controller.on_error("429", sent)
+    controller.on_error("429", sent)
+    assert controller.rate == 20.0
+
+    # A call sent at the new rate that still fails cuts again
+    controller.on_error("429", time.monotonic())
+    assert controller.rate == 10.0
+
+
+def test_error_without_start_time_always_cuts(tmp_path) -> None:
+    controller = _controller(tmp_path)
+
+    controller.on_error("429")
+    controller.on_error("429")
+    assert controller.rate == 10.0
@@ -0,0 +1,88 @@
+"""Tests for sparse downloads: clips around each sample timestamp."""
+
+import os
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+from scrapers import youtube_collector
+from scrapers.video_manifest import VideoManifest
+from scrapers.youtube_collector import YouTubeCollector
+
+FPS = 10.0
+
+
+def _write_clip(path: str, frames: int = 5) -> None:
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), FPS, (32, 32))
+    for i in range(frames):
+        writer.write(np.full((32, 32, 3), i * 40, dtype=np.uint8))
+    writer.release()
+
+
+class FakeYoutubeDL:
+    """Writes one clip per requested range, like yt-dlp's download_ranges."""
+
+    calls: list[dict] = []
+
+    def __init__(self, opts: dict) -> None:
+        self._opts = opts
+
+    def __enter__(self) -> "FakeYoutubeDL":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+    def extract_info(self, url: str, download: bool = False) -> dict:
+        FakeYoutubeDL.calls.append(self._opts)
+        for start, _ in self._opts["download_ranges"]:
+            _write_clip(self._opts["outtmpl"] % {
+                "id": "vid", "section_start": start, "ext": "mp4",
+            })
+        return {"id": "vid"}
+
+
+@pytest.fixture
+def fake_yt_dlp(monkeypatch) -> type[FakeYoutubeDL]:
+    FakeYoutubeDL.calls = []
+    monkeypatch.setattr(youtube_collector, "yt_dlp", SimpleNamespace(
+        YoutubeDL=FakeYoutubeDL,
+        utils=SimpleNamespace(
+            download_range_func=lambda chapters, ranges: ranges,
+            DownloadError=type("DownloadError", (Exception,), {}),
+        ),
+    ))
+    return FakeYoutubeDL
+
+
+def test_download_clips_returns_only_requested_timestamps(tmp_path, fake_yt_dlp) -> None:
+    clips_dir = tmp_path / "clips"
+    clips_dir.mkdir()
+    # Left behind by an earlier run with another interval
+    _write_clip(str(clips_dir / "vid_clip_45.0.mp4"))
+
+    clips = YouTubeCollector().download_clips("url", str(clips_dir), [30.0, 0.0])
+
+    assert fake_yt_dlp.calls[0]["download_ranges"] == [(30.0, 32.0), (0.0, 2.0)]
+    assert [start for start, _ in clips] == [0.0, 30.0]
+    assert [os.path.basename(path) for _, path in clips] == [
+        "vid_clip_0.0.mp4", "vid_clip_30.0.mp4",
+    ]
+
+
+def test_sparse_video_extracts_one_frame_per_clip_and_deletes_clips(
+    tmp_path, fake_yt_dlp,
+) -> None:
+    collector = YouTubeCollector(sparse=True, interval_seconds=30)
+    manifest = VideoManifest(str(tmp_path / "manifest.jsonl"))
+    video = {"video_id": "vid", "title": "t", "url": "url", "duration": 65}
+
+    result = collector._process_video(video, str(tmp_path), manifest, 1, 1)
+
+    names = sorted(os.path.basename(path) for path in result["frames"])
+    frame_numbers = [int(round(t * FPS)) for t in (0, 30, 60)]
+    assert names == [f"vid_frame_{n:06d}.jpg" for n in frame_numbers]
+    assert all(os.path.exists(path) for path in result["frames"])
+    assert os.listdir(tmp_path / "clips") == []